@@ -2,9 +2,14 @@
 
 # Check if the prefixed README exists
 if [ -f "SYS.02.02-README.org" ]; then
-    # Copy the contents of SYS.02.00-README.org to README.org
-    cp SYS.02.02-README.org README.org
-    echo "README.org has been generated from SYS.02.02-README.org."
+    # Copy SYS.02.02-README.org to README.org only if their contents differ,
+    # so README.org keeps its modification time when nothing changed
+    if cmp -s SYS.02.02-README.org README.org; then
+        echo "README.org is already up to date."
+    else
+        cp SYS.02.02-README.org README.org
+        echo "README.org has been generated from SYS.02.02-README.org."
+    fi
 else
     echo "SYS.02.02-README.org not found."
 fi
@@ -0,0 +1,4 @@
+import logging
+
+# Library modules only emit records; the CLI decides where they go
+logging.getLogger(__name__).addHandler(logging.NullHandler())
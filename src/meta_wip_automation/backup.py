@@ -0,0 +1,262 @@
+"""
+Incremental backup and restore of project READMEs.
+
+Snapshots are kept in a local content-addressed store:
+
+    <store>/objects/<2 hex>/<62 hex>   file contents, named by SHA-256
+    <store>/snapshots/<id>.json        manifest of one snapshot
+    <store>/snapshots/<key>.latest     ID of the newest snapshot of one root
+
+A manifest maps each README's path (relative to the snapshot root) to the
+hash of its contents. Contents already in the store are never written
+again, and files whose size and modification time match the previous
+snapshot of the same root are not even re-read. The previous snapshot is
+found through the root's .latest pointer rather than by reading every
+manifest, so an hourly snapshot of an unchanged tree costs a directory walk
+and one manifest read, however long the history.
+"""
+
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from meta_wip_automation.utils import find_readmes, paths_key, write_atomic
+
+OBJECTS_DIR = 'objects'
+SNAPSHOTS_DIR = 'snapshots'
+
+
+def _object_path(store: str, digest: str) -> str:
+    """Return the path an object with the given hash is stored at."""
+    return os.path.join(store, OBJECTS_DIR, digest[:2], digest[2:])
+
+
+def list_snapshots(store: str) -> list:
+    """
+    List the snapshots in a store, oldest first.
+
+    Args:
+        store: Path to the backup store
+
+    Returns:
+        list: Snapshot manifests (dicts with id, created, root and files)
+    """
+    snapshots_dir = os.path.join(store, SNAPSHOTS_DIR)
+    if not os.path.isdir(snapshots_dir):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(snapshots_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(snapshots_dir, name)) as file:
+                manifests.append(json.load(file))
+    return manifests
+
+
+def _manifest_names(store: str) -> list:
+    """Return the manifest file names in a store, newest first."""
+    try:
+        names = os.listdir(os.path.join(store, SNAPSHOTS_DIR))
+    except OSError:
+        return []
+    # Snapshot IDs are UTC timestamps, so name order is creation order
+    return sorted((name for name in names if name.endswith('.json')), reverse=True)
+
+
+def _latest_path(store: str, root: str) -> str:
+    """Return the file holding the ID of the newest snapshot of root."""
+    return os.path.join(store, SNAPSHOTS_DIR, f"{paths_key([root])}.latest")
+
+
+def _previous_snapshot(store: str, root: str) -> dict:
+    """
+    Return the newest snapshot of root, or None if root has none.
+
+    Reads the root's .latest pointer. Stores written before pointers existed
+    (or with a stale pointer) fall back to reading manifests newest first,
+    stopping at the first one of root, and get their pointer written.
+    """
+    latest_path = _latest_path(store, root)
+    try:
+        with open(latest_path) as file:
+            manifest = load_snapshot(store, file.read().strip())
+        if manifest['root'] == root:
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    snapshots_dir = os.path.join(store, SNAPSHOTS_DIR)
+    for name in _manifest_names(store):
+        with open(os.path.join(snapshots_dir, name)) as file:
+            manifest = json.load(file)
+        if manifest['root'] == root:
+            write_atomic(latest_path, manifest['id'].encode())
+            return manifest
+    return None
+
+
+def load_snapshot(store: str, snapshot_id: str) -> dict:
+    """
+    Load a snapshot manifest.
+
+    Args:
+        store: Path to the backup store
+        snapshot_id: Snapshot ID, or 'latest' for the most recent snapshot
+
+    Returns:
+        dict: The snapshot manifest
+
+    Raises:
+        ValueError: If no such snapshot exists.
+    """
+    if snapshot_id == 'latest':
+        names = _manifest_names(store)
+        if not names:
+            raise ValueError(f"No snapshots in {store}")
+        snapshot_id = names[0][:-len('.json')]
+    path = os.path.join(store, SNAPSHOTS_DIR, f"{snapshot_id}.json")
+    if not os.path.isfile(path):
+        raise ValueError(f"Snapshot not found: {snapshot_id}")
+    with open(path) as file:
+        return json.load(file)
+
+
+def create_snapshot(root: str, store: str) -> tuple:
+    """
+    Snapshot every README under root into the store.
+
+    Args:
+        root: Directory containing the project READMEs
+        store: Path to the backup store
+
+    Returns:
+        tuple: (manifest, created) where created is False if nothing changed
+               since the previous snapshot of root, in which case that
+               snapshot is returned instead of writing a new one
+
+    Raises:
+        ValueError: If root is not a directory.
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"Not a directory: {root}")
+    root = os.path.abspath(root)
+    previous = _previous_snapshot(store, root)
+    previous_files = previous['files'] if previous else {}
+
+    files = {}
+    for path in find_readmes([root]):
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        stat = os.stat(path)
+        entry = previous_files.get(relpath)
+        if (entry and entry['size'] == stat.st_size and
+                entry['mtime_ns'] == stat.st_mtime_ns):
+            files[relpath] = entry
+            continue
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = _object_path(store, digest)
+        if not os.path.exists(object_path):
+            write_atomic(object_path, data)
+        files[relpath] = {'hash': digest, 'size': stat.st_size,
+                          'mtime_ns': stat.st_mtime_ns}
+
+    if previous and ({p: e['hash'] for p, e in files.items()} ==
+                     {p: e['hash'] for p, e in previous_files.items()}):
+        return previous, False
+
+    created = datetime.now(timezone.utc)
+    manifest = {
+        'id': created.strftime('%Y%m%dT%H%M%S%fZ'),
+        'created': created.isoformat(),
+        'root': root,
+        'files': files
+    }
+    write_atomic(os.path.join(store, SNAPSHOTS_DIR, f"{manifest['id']}.json"),
+                 json.dumps(manifest, indent=1, sort_keys=True).encode())
+    write_atomic(_latest_path(store, root), manifest['id'].encode())
+    return manifest, True
+
+
+def _matches_project(relpath: str, project_id: str) -> bool:
+    """Check whether a README path belongs to the given project."""
+    parts = relpath.split('/')
+    return (project_id in parts[:-1] or
+            parts[-1].startswith(f"{project_id}-"))
+
+
+def restore_snapshot(store: str, snapshot_id: str, dest: str = None,
+                     project_id: str = None) -> list:
+    """
+    Restore READMEs from a snapshot.
+
+    Args:
+        store: Path to the backup store
+        snapshot_id: Snapshot ID, or 'latest'
+        dest: Directory to restore into; defaults to the snapshot's root
+        project_id: Restore only this project's READMEs (e.g. SYS.02.02)
+
+    Returns:
+        list: Relative paths of the restored files
+
+    Raises:
+        ValueError: If the snapshot does not exist, nothing matches
+                    project_id, or a stored object is missing or corrupt.
+    """
+    manifest = load_snapshot(store, snapshot_id)
+    dest = dest or manifest['root']
+    selected = sorted(p for p in manifest['files']
+                      if project_id is None or _matches_project(p, project_id))
+    if project_id and not selected:
+        raise ValueError(f"No files for project {project_id} in snapshot {manifest['id']}")
+
+    for relpath in selected:
+        digest = manifest['files'][relpath]['hash']
+        try:
+            with open(_object_path(store, digest), 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            raise ValueError(f"Missing object {digest} for {relpath}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt object {digest} for {relpath}")
+        write_atomic(os.path.join(dest, *relpath.split('/')), data)
+    return selected
+
+
+def _check_object(store: str, digest: str) -> str:
+    """Return a problem description for an object, or None if it is intact."""
+    hasher = hashlib.sha256()
+    try:
+        with open(_object_path(store, digest), 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                hasher.update(block)
+    except FileNotFoundError:
+        return 'missing'
+    if hasher.hexdigest() != digest:
+        return 'corrupt'
+    return None
+
+
+def verify_store(store: str, workers: int = None) -> list:
+    """
+    Check that every object referenced by a snapshot is present and intact.
+
+    Objects are hashed in parallel; hashlib releases the GIL while hashing,
+    so threads are enough.
+
+    Args:
+        store: Path to the backup store
+        workers: Number of hashing threads (defaults to the executor default)
+
+    Returns:
+        list: (hash, problem) tuples for each missing or corrupt object
+    """
+    digests = sorted({entry['hash'] for manifest in list_snapshots(store)
+                      for entry in manifest['files'].values()})
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        problems = executor.map(lambda d: _check_object(store, d), digests)
+        return [(digest, problem) for digest, problem in zip(digests, problems)
+                if problem]
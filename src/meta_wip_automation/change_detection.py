@@ -0,0 +1,362 @@
+"""
+Detection of added, modified and deleted READMEs between runs.
+
+For README trees inside a git working tree, the repository's index file
+(.git/index) is read directly. Git keeps the stat data (size, modification
+time, inode) and blob hash of every tracked file there, so a README whose
+stat data still matches its index entry is known to have the blob hash
+recorded in the index without reading it. Comparing those hashes with the
+ones from the previous run tells which READMEs really changed, even when a
+checkout, stash or rebase rewrote files with their old content.
+
+Trees outside git fall back to a plain stat scan, where a README counts as
+modified whenever its size or modification time changed.
+
+The index format is documented in git's Documentation/gitformat-index.txt;
+versions 2, 3 and 4 are supported. Nothing here runs git or touches the
+network, and an index that cannot be read also falls back to a stat scan.
+"""
+
+
+import hashlib
+import os
+import re
+import struct
+from typing import NamedTuple
+
+from meta_wip_automation.utils import find_readmes
+
+GIT = 'git'
+STAT = 'stat'
+
+INDEX_SIGNATURE = b'DIRC'
+INDEX_VERSIONS = (2, 3, 4)
+
+# ctime, mtime (seconds, nanoseconds), dev, ino, mode, uid, gid, size
+_ENTRY_STAT = struct.Struct('>10I')
+_EXTENDED_FLAG = 0x4000
+_STAGE_MASK = 0x3000
+_REGULAR_FILE = 0o100000
+_FILE_TYPE_MASK = 0o170000
+
+
+class IndexEntry(NamedTuple):
+    """Stat data and blob hash of a file tracked in the git index."""
+    mtime_s: int
+    mtime_ns: int  # Nanosecond part of the modification time
+    ino: int
+    size: int
+    blob: str
+
+
+class FileState(NamedTuple):
+    """What is known about a README's content after a scan."""
+    size: int
+    mtime_ns: int
+    blob: str  # Git blob hash, or None if only the stat data is known
+
+
+class ChangeSet(NamedTuple):
+    """Differences between the previous and the current scan of a tree."""
+    added: list
+    modified: list
+    deleted: list
+    states: dict  # README path -> FileState of every current README
+    source: str   # GIT if the git index was used, STAT otherwise
+
+
+def find_git_dir(path: str) -> tuple:
+    """
+    Find the git working tree containing a path.
+
+    Args:
+        path: A directory inside the working tree
+
+    Returns:
+        tuple: (worktree top, git directory), or None outside a working tree
+    """
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, '.git')
+        if os.path.isdir(dot_git):
+            return current, dot_git
+        if os.path.isfile(dot_git):
+            # Linked worktrees and submodules use a "gitdir: <path>" file
+            try:
+                with open(dot_git) as file:
+                    match = re.match(r'gitdir:\s*(.+)', file.read().strip())
+            except OSError:
+                return None
+            if not match:
+                return None
+            return current, os.path.join(current, match.group(1))
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _hash_name(git_dir: str) -> str:
+    """Return 'sha256' for repositories using SHA-256 object names, else 'sha1'."""
+    try:
+        with open(os.path.join(git_dir, 'config')) as file:
+            config = file.read()
+    except OSError:
+        return 'sha1'
+    if re.search(r'^\s*objectformat\s*=\s*sha256\s*$', config, re.IGNORECASE | re.MULTILINE):
+        return 'sha256'
+    return 'sha1'
+
+
+def _read_varint(data: bytes, pos: int) -> tuple:
+    """Decode a git offset varint, returning (value, next position)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+
+def read_git_index(index_path: str, hash_name: str = 'sha1') -> dict:
+    """
+    Read the entries of a git index file.
+
+    Only merged (stage 0) regular files are returned; extensions and the
+    trailing checksum are ignored.
+
+    Args:
+        index_path: Path to the index file, usually .git/index
+        hash_name: Object hash of the repository, 'sha1' or 'sha256'
+
+    Returns:
+        dict: Path relative to the worktree top ('/'-separated) -> IndexEntry
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a version 2, 3 or 4 git index.
+    """
+    with open(index_path, 'rb') as file:
+        data = file.read()
+    if len(data) < 12 or data[:4] != INDEX_SIGNATURE:
+        raise ValueError(f"Not a git index: {index_path}")
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in INDEX_VERSIONS:
+        raise ValueError(f"Unsupported git index version {version}: {index_path}")
+
+    hash_size = hashlib.new(hash_name).digest_size
+    fixed_size = _ENTRY_STAT.size + hash_size + 2
+    entries = {}
+    name = b''
+    pos = 12
+    try:
+        for _ in range(count):
+            start = pos
+            (_, _, mtime_s, mtime_ns, _, ino, mode, _, _,
+             size) = _ENTRY_STAT.unpack_from(data, pos)
+            pos += _ENTRY_STAT.size
+            blob = data[pos:pos + hash_size].hex()
+            pos += hash_size
+            (flags,) = struct.unpack_from('>H', data, pos)
+            pos += 2
+            header_size = fixed_size
+            if version >= 3 and flags & _EXTENDED_FLAG:
+                header_size += 2
+                pos += 2
+
+            if version == 4:
+                # The name is stored as a prefix of the previous name plus a suffix
+                strip, pos = _read_varint(data, pos)
+                end = data.index(b'\0', pos)
+                name = name[:len(name) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b'\0', pos)
+                name = data[pos:end]
+                # Entries are padded with 1-8 NUL bytes to a multiple of 8
+                pos = start + (header_size + len(name) + 8) // 8 * 8
+
+            if flags & _STAGE_MASK or mode & _FILE_TYPE_MASK != _REGULAR_FILE:
+                continue
+            entries[name.decode('utf-8', 'surrogateescape')] = IndexEntry(
+                mtime_s, mtime_ns, ino, size, blob)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Truncated git index: {index_path}") from e
+    return entries
+
+
+def blob_hash(path: str, hash_name: str = 'sha1') -> str:
+    """
+    Hash a file the way git hashes a blob ("blob <size>\\0" + content).
+
+    Args:
+        path: File to hash
+        hash_name: Object hash of the repository, 'sha1' or 'sha256'
+
+    Returns:
+        str: Hex object name
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, 'rb') as file:
+        content = file.read()
+    hasher = hashlib.new(hash_name, f"blob {len(content)}\0".encode())
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _matches_index(entry: IndexEntry, stat: os.stat_result, index_mtime_ns: int) -> bool:
+    """True if a file's stat data shows it is unchanged since git indexed it."""
+    # Stat fields are stored truncated to 32 bits
+    if (entry.size != stat.st_size & 0xffffffff
+            or entry.ino != stat.st_ino & 0xffffffff
+            or entry.mtime_s != stat.st_mtime_ns // 1_000_000_000 & 0xffffffff
+            or entry.mtime_ns != stat.st_mtime_ns % 1_000_000_000):
+        return False
+    # A file modified in the same instant the index was written may have
+    # changed after git looked at it ("racily clean"), so it is not trusted
+    return stat.st_mtime_ns < index_mtime_ns
+
+
+def _load_index(root: str) -> tuple:
+    """Return (worktree top, index entries, index mtime, hash name), or None."""
+    found = find_git_dir(root)
+    if found is None:
+        return None
+    top, git_dir = found
+    hash_name = _hash_name(git_dir)
+    index_path = os.path.join(git_dir, 'index')
+    try:
+        index_mtime_ns = os.stat(index_path).st_mtime_ns
+        entries = read_git_index(index_path, hash_name)
+    except (OSError, ValueError):
+        return None
+    return top, entries, index_mtime_ns, hash_name
+
+
+def detect_changes(root: str, previous: dict = None, use_git: bool = True) -> ChangeSet:
+    """
+    Find the READMEs under a root that changed since a previous scan.
+
+    A README's content is identified by its git blob hash when it is
+    tracked: taken from the index when its stat data matches the index
+    entry, carried over from the previous scan when its stat data is
+    unchanged, and otherwise computed from the file. Untracked READMEs, and
+    every README of a tree outside git, are compared by stat data alone.
+
+    Args:
+        root: Directory to scan for READMEs
+        previous: The states of the previous ChangeSet (None on the first scan)
+        use_git: Set to False to always do a stat scan
+
+    Returns:
+        ChangeSet: Added, modified and deleted README paths (in path order)
+                   and the state of every current README
+
+    Raises:
+        ValueError: If root is neither a directory nor a file, which would
+                    otherwise look like a tree whose READMEs were all deleted.
+    """
+    if not os.path.isdir(root) and not os.path.isfile(root):
+        raise ValueError(f"Not a directory or file: {root}")
+    previous = previous or {}
+    index = _load_index(root) if use_git else None
+    if index is not None:
+        top, entries, index_mtime_ns, hash_name = index
+
+    added, modified = [], []
+    states = {}
+    for path in find_readmes([root], skip_generated=True):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # Removed while scanning; reported as deleted if known
+        old = previous.get(path)
+        if old is not None:
+            old = FileState(*old)
+        same_stat = old is not None and (old.size, old.mtime_ns) == (stat.st_size,
+                                                                     stat.st_mtime_ns)
+        blob = None
+        if index is not None:
+            key = os.path.relpath(os.path.abspath(path), top).replace(os.sep, '/')
+            entry = entries.get(key)
+            if entry is not None:
+                if _matches_index(entry, stat, index_mtime_ns):
+                    blob = entry.blob
+                elif same_stat and old.blob:
+                    blob = old.blob
+                else:
+                    try:
+                        blob = blob_hash(path, hash_name)
+                    except OSError:
+                        blob = None
+        states[path] = FileState(stat.st_size, stat.st_mtime_ns, blob)
+
+        if old is None:
+            added.append(path)
+        elif blob and old.blob:
+            if blob != old.blob:
+                modified.append(path)
+        elif not same_stat:
+            modified.append(path)
+
+    deleted = sorted(path for path in previous if path not in states)
+    return ChangeSet(added, modified, deleted, states, GIT if index is not None else STAT)
+
+
+def refresh_index(paths: list, previous: dict, load, remove, indexed) -> tuple:
+    """
+    Bring an index of READMEs up to date with detect_changes.
+
+    The shared update loop of the search and similarity indexes: READMEs
+    reported as added or modified are loaded again, READMEs that failed to
+    load or are no longer found are removed, and the states to keep for the
+    next refresh are returned.
+
+    Args:
+        paths: README files and/or directories
+        previous: The states returned by the last refresh (empty on the first)
+        load: Called with each added or modified README path to (re-)add it
+              to the index. Raises OSError if the README cannot be read and
+              any other exception if it cannot be indexed; may return an
+              exception to report while keeping the README indexed.
+        remove: Called with each README path to drop from the index
+        indexed: Container of the README paths currently in the index
+
+    Returns:
+        tuple: (updated, removed, failures, states) where failures is a list
+               of (path, phase, exception) and states maps each of paths to
+               the states of its indexed READMEs. READMEs that failed are
+               left out of states, so they are loaded (and reported) again.
+    """
+    updated = 0
+    failures = []
+    states = {}
+    current = set()
+    for root in paths:
+        changes = detect_changes(root, previous.get(root))
+        for path in changes.added + changes.modified:
+            try:
+                error = load(path)
+            except OSError as e:
+                failures.append((path, 'read', e))
+                remove(path)
+                continue
+            except Exception as e:
+                failures.append((path, 'parse', e))
+                remove(path)
+                continue
+            if error is not None:
+                failures.append((path, 'parse', error))
+            updated += 1
+        states[root] = {path: state for path, state in changes.states.items()
+                        if path in indexed}
+        current.update(states[root])
+
+    stale = [path for path in indexed if path not in current]
+    for path in stale:
+        remove(path)
+    return updated, len(stale), failures, states
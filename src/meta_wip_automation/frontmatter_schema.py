@@ -0,0 +1,334 @@
+"""
+Frontmatter schema validation and encoding.
+
+extract_frontmatter accepts any "#+KEY: value" line and calculate_priority
+scores unknown values as 0, so a typo such as "STATUS: stcuk" would
+silently lower a project's priority. This module checks frontmatter against
+the allowed values instead; load_project reads every README through it, so
+what 'meta-wip validate' accepts is exactly what gets scored.
+
+The schema is compiled once at import time from the *_SCORES tables in
+project_sorter (the allowed values and their integer codes). The field
+descriptions in readme_parser's module docstring are only needed for error
+messages, so they are read the first time a message is built.
+Compiling turns every accepted spelling of a value (any case, and with
+'-', '_' or a space as separator) into a key of one dictionary per field,
+and every plainly written line such as '#+STATUS: active' into a key of one
+more dictionary, so validate_frontmatter can read, check, normalise and
+encode a README in a single pass over its lines with, for most lines, a
+single dictionary lookup.
+"""
+
+
+import re
+from datetime import datetime
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import NamedTuple
+
+from meta_wip_automation.project_sorter import FACTOR_DEFAULTS, FIELD_SCORES
+
+RECURRENCE_FIELDS = ('RECURRENCE_INTERVAL', 'LAST_COMPLETED')
+
+
+class FieldError(NamedTuple):
+    """A problem with one frontmatter line or field."""
+    line: int        # 1-based line number, or 0 for a missing field
+    field: str
+    value: str
+    message: str
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of validating one README's frontmatter."""
+    frontmatter: dict  # Fields with enumerated values in canonical form
+    codes: dict        # Integer score of every scored field, defaults included
+    errors: list       # FieldError tuples; empty if the frontmatter is valid
+
+
+def parse_documented_values(doc: str) -> dict:
+    """
+    Read the field enumerations from a docstring like readme_parser's.
+
+    Args:
+        doc: Docstring listing fields as '1. FIELD:' followed by
+             '- "value" : description' lines
+
+    Returns:
+        dict: Field name mapped to {value: description}; fields without
+              quoted values (such as the recurrence fields) are omitted
+    """
+    fields = {}
+    current = None
+    for line in doc.splitlines():
+        heading = re.match(r'\s*\d+\.\s+([A-Z_]+):?\s*$', line)
+        if heading:
+            current = heading.group(1)
+            continue
+        value = re.match(r'\s*-\s+"([^"]+)"\s*:\s*(.*?)\s*$', line)
+        if value and current:
+            fields.setdefault(current, {})[value.group(1)] = value.group(2)
+    return fields
+
+
+def _spellings(value: str) -> set:
+    """Accepted lower-case spellings of a canonical value."""
+    spellings = {value}
+    for separator in ('-', '_', ' '):
+        spellings.add(re.sub(r'[-_ ]', separator, value))
+    return spellings
+
+
+def compile_schema(field_scores: dict) -> dict:
+    """
+    Build the lookup tables used by validate_frontmatter.
+
+    Args:
+        field_scores: Field name mapped to its {value: score} table
+
+    Returns:
+        dict: Field name mapped to {accepted spelling: (canonical value, score)}
+    """
+    schema = {}
+    for field, scores in field_scores.items():
+        lookup = {}
+        for value, score in scores.items():
+            for spelling in _spellings(value):
+                lookup[spelling] = (value, score)
+        schema[field] = lookup
+    return schema
+
+
+def compile_lines(schema: dict) -> dict:
+    """
+    Build a lookup of whole frontmatter lines that need no further checks.
+
+    Most READMEs write scored fields exactly as '#+FIELD: value', so looking
+    up the raw line skips splitting, stripping and case folding it.
+
+    Args:
+        schema: As returned by compile_schema
+
+    Returns:
+        dict: '#+FIELD: spelling' (with FIELD in upper or lower case) mapped
+              to (field, canonical value, score)
+    """
+    lines = {}
+    for field, lookup in schema.items():
+        for key in (field, field.lower()):
+            for spelling, (value, score) in lookup.items():
+                lines[f"#+{key}: {spelling}"] = (field, value, score)
+    return lines
+
+
+SCHEMA = compile_schema(FIELD_SCORES)
+SCHEMA_LINES = compile_lines(SCHEMA)
+# Keywords checked by validate_frontmatter (upper-cased); any other org
+# keyword, such as '#+OPTIONS', may repeat or have no value, as in org itself
+SCHEMA_FIELDS = frozenset(SCHEMA) | set(RECURRENCE_FIELDS) | {'TITLE'}
+DEFAULT_CODES = {field: FIELD_SCORES[field][value]
+                 for field, value in FACTOR_DEFAULTS.items()}
+
+
+@lru_cache(maxsize=None)
+def documented_values() -> dict:
+    """
+    Return the field enumerations documented in readme_parser's docstring.
+
+    Returns:
+        dict: As returned by parse_documented_values
+    """
+    # Imported here because readme_parser reads frontmatter through this module
+    from meta_wip_automation import readme_parser
+    return parse_documented_values(readme_parser.__doc__)
+
+
+def parse_last_completed(value: str) -> datetime:
+    """
+    Parse a LAST_COMPLETED date.
+
+    Args:
+        value: A date in YYYY-MM-DD format
+
+    Returns:
+        datetime: Midnight at the start of that date
+
+    Raises:
+        ValueError: If value is not a YYYY-MM-DD date.
+    """
+    # Checked by hand because strptime is several times slower, and
+    # fromisoformat alone also accepts other ISO 8601 forms such as 20241001
+    if len(value) != 10 or value[4] != '-' or value[7] != '-':
+        raise ValueError(f"Invalid LAST_COMPLETED date: {value}")
+    return datetime.fromisoformat(value)
+
+
+def _unknown_value_message(field: str, value: str) -> str:
+    """Explain an unknown value, suggesting the closest allowed one."""
+    allowed = list(FIELD_SCORES[field])
+    described = documented_values().get(field, {})
+    options = ', '.join(f"{v} ({described[v]})" if v in described else v
+                        for v in allowed)
+    message = f"unknown value '{value}'; expected one of: {options}"
+    suggestion = get_close_matches(value.lower(), allowed, n=1)
+    if suggestion:
+        message += f". Did you mean '{suggestion[0]}'?"
+    return message
+
+
+def describe_errors(errors: list) -> str:
+    """
+    Join validation errors into one message, e.g. for a ValueError.
+
+    Args:
+        errors: FieldError tuples
+
+    Returns:
+        str: 'line N: FIELD: message' parts separated by '; '
+    """
+    return '; '.join(f"line {line}: {field}: {message}" if line else f"{field}: {message}"
+                     for line, field, _, message in errors)
+
+
+def normalise_fields(fields: dict) -> dict:
+    """
+    Put the scored values of already-parsed fields into canonical form.
+
+    For fields that do not come from '#+KEY: value' lines, such as the
+    property drawers org_tokenizer reads, so that they score the same way as
+    validated frontmatter.
+
+    Args:
+        fields: Field name mapped to value
+
+    Returns:
+        dict: A copy with scored values in their canonical spelling; empty
+              scored values are left out so that their default applies
+
+    Raises:
+        ValueError: If a scored field has an unknown value.
+    """
+    normalised = {}
+    for field, value in fields.items():
+        lookup = SCHEMA.get(field)
+        if lookup is None:
+            normalised[field] = value
+        elif value:
+            match = lookup.get(value) or lookup.get(' '.join(value.lower().split()))
+            if match is None:
+                raise ValueError(f"{field}: {_unknown_value_message(field, value)}")
+            normalised[field] = match[0]
+    return normalised
+
+
+def validate_frontmatter(content: str) -> ValidationResult:
+    """
+    Validate, normalise and encode a README's frontmatter in one pass.
+
+    Reads the same '#+KEY: value' lines as extract_frontmatter, stopping at
+    the first heading, but reports problems with the fields in SCHEMA_FIELDS
+    instead of guessing:
+
+    - keyword lines without a ':' separator
+    - fields given more than once
+    - unknown values of scored fields (with a suggested correction)
+    - a RECURRENCE_INTERVAL that is not a positive whole number
+    - a LAST_COMPLETED that is not a YYYY-MM-DD date
+    - only one of RECURRENCE_INTERVAL and LAST_COMPLETED being set
+    - a missing title
+
+    Values of scored fields are matched ignoring case, surrounding and
+    repeated whitespace, and '-'/'_'/' ' separators, and are returned in
+    their canonical spelling. Other keywords are returned as they are; when
+    one is repeated, the last value is kept.
+
+    Args:
+        content (str): The content of the README file.
+
+    Returns:
+        ValidationResult: Normalised frontmatter, integer codes and errors
+    """
+    frontmatter = {}
+    codes = DEFAULT_CODES.copy()
+    errors = []
+    seen = set()
+    schema_get = SCHEMA.get
+    lines_get = SCHEMA_LINES.get
+
+    # Only the lines before the first heading are split. Headings almost
+    # always start at the beginning of a line; an indented one is caught in
+    # the loop.
+    end = 0 if content[:1] == '*' else content.find('\n*')
+    header = content if end < 0 else content[:end]
+    for number, line in enumerate(header.split('\n'), 1):
+        compiled = lines_get(line)
+        if compiled is not None:
+            field, value, code = compiled
+            if field in seen:
+                errors.append(FieldError(number, field, value, "field given more than once"))
+                continue
+            seen.add(field)
+            frontmatter[field] = value
+            codes[field] = code
+            continue
+
+        if line[:2] != '#+':
+            line = line.strip()
+            if line[:2] != '#+':
+                if line[:1] == '*':
+                    break
+                continue
+
+        key, separator, value = line[2:].partition(':')
+        key = key.strip()
+        if not separator:
+            words = key.split()
+            if words and words[0].upper() in SCHEMA_FIELDS:
+                errors.append(FieldError(number, words[0], None,
+                                         "missing ':' after keyword"))
+            continue
+        value = value.strip()
+        field = key.upper()
+        if field not in SCHEMA_FIELDS:
+            frontmatter[key] = value
+            continue
+        if field in seen:
+            errors.append(FieldError(number, key, value, "field given more than once"))
+            continue
+        seen.add(field)
+
+        lookup = schema_get(field)
+        if lookup is not None:
+            if not value:  # Empty scored fields fall back to their default
+                continue
+            match = lookup.get(value) or lookup.get(' '.join(value.lower().split()))
+            if match is None:
+                errors.append(FieldError(number, field, value,
+                                         _unknown_value_message(field, value)))
+                continue
+            frontmatter[field], codes[field] = match
+        elif field == 'TITLE':
+            frontmatter['title'] = value  # Org keywords are case-insensitive
+        elif field == 'RECURRENCE_INTERVAL':
+            if not value.isdigit() or int(value) == 0:
+                errors.append(FieldError(number, field, value,
+                                         "expected a positive number of days"))
+                continue
+            frontmatter[field] = value
+        elif field == 'LAST_COMPLETED':
+            try:
+                parse_last_completed(value)
+            except ValueError:
+                errors.append(FieldError(number, field, value,
+                                         "expected a date in YYYY-MM-DD format"))
+                continue
+            frontmatter[field] = value
+
+    interval, completed = RECURRENCE_FIELDS
+    if (interval in seen) != (completed in seen):
+        present, missing = (interval, completed) if interval in seen else (completed, interval)
+        errors.append(FieldError(0, missing, None, f"required when {present} is set"))
+    if 'TITLE' not in seen:
+        errors.append(FieldError(0, 'title', None, "missing title"))
+
+    return ValidationResult(frontmatter, codes, errors)
@@ -0,0 +1,319 @@
+"""
+Generation of the SYS.02.00 index README from the ranked projects.
+
+The index README lists the top projects, followed by one section per STATUS,
+with projects in the order sort_projects gives them. Next to it, the
+capture directory holds a copy of every project README. A GENERATED_MARKER
+file in the capture directory makes project scans skip it, so neither the
+index README nor the copies are loaded as projects by other commands.
+
+The projects come from the shard cache (see sharding.update_records), so
+only READMEs that change_detection reports as added or modified are parsed.
+
+Other tools cache by modification time (the shard cache, the search and
+similarity indexes, file syncing), so rewriting unchanged files would make
+all of them redo their work. To avoid that:
+
+- each section is fingerprinted from the shard records of its projects;
+  sections whose fingerprint is unchanged since the last run reuse their
+  text, which is kept in the GENERATED_MARKER file, instead of being
+  rendered again
+- the index README is only written when its bytes differ from the file on
+  disk, and is written atomically; nothing in it depends on the current
+  time, so an unchanged ranking gives identical bytes
+- a project README is only copied when the copy's bytes differ
+
+The marker also lists the copies written, so that copies of projects that
+were removed (or renamed) are deleted on the next run. Files the generator
+did not write are never deleted.
+"""
+
+
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+from typing import NamedTuple
+
+from meta_wip_automation.project_sorter import (
+    FACTOR_DEFAULTS,
+    STATUS_SCORES,
+    sort_projects
+)
+from meta_wip_automation.utils import GENERATED_MARKER, README_SUFFIX, write_atomic
+
+MARKER_VERSION = 1
+
+DEFAULT_INDEX_ID = 'SYS.02.00'
+DEFAULT_INDEX_TITLE = 'Meta WIP Capture'
+
+TOP_SECTION = 'Top Priorities'
+OTHER_SECTION = 'Other'
+
+MARKER_NOTE = ("Generated by meta-wip index. READMEs in this directory are not "
+               "read as projects.")
+
+
+class IndexResult(NamedTuple):
+    """What generate_index did."""
+    index_path: str
+    written: bool   # False if the index README was already up to date
+    rendered: list  # Names of sections rendered this run
+    reused: list    # Names of sections whose text was reused
+    copied: list    # Paths of project README copies that were (re)written
+    removed: list   # Paths of copies deleted because their project is gone
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """
+    Atomically write a file unless it already holds exactly these bytes.
+
+    Args:
+        path: File to write
+        data: Complete new contents
+
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as file:
+                if file.read() == data:
+                    return False
+    except OSError:
+        pass  # Missing or unreadable: write it
+    write_atomic(path, data)
+    return True
+
+
+def copy_if_changed(source: str, dest: str) -> bool:
+    """
+    Atomically copy a file unless the destination already has the same bytes.
+
+    Copies keep the source's modification time, so a destination with the
+    same size and modification time is taken to be unchanged without
+    reading either file.
+
+    Args:
+        source: File to copy
+        dest: Destination path
+
+    Returns:
+        bool: True if the file was copied
+    """
+    try:
+        source_stat = os.stat(source)
+        dest_stat = os.stat(dest)
+        if source_stat.st_size == dest_stat.st_size:
+            if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+                return False
+            with open(source, 'rb') as a, open(dest, 'rb') as b:
+                if a.read() == b.read():
+                    return False
+    except OSError:
+        pass
+    with open(source, 'rb') as file:
+        data = file.read()
+    write_atomic(dest, data)
+    shutil.copystat(source, dest)
+    return True
+
+
+def copy_name(frontmatter: dict, path: str) -> str:
+    """
+    Return the file name of a project README's copy in the index directory.
+
+    Args:
+        frontmatter: The project's frontmatter
+        path: The project README
+
+    Returns:
+        str: The README's own name, or <PROJECT_ID>-README.org for a plain
+             README.org so it does not collide with other copies
+    """
+    name = os.path.basename(path)
+    if name == README_SUFFIX and frontmatter.get('PROJECT_ID'):
+        return f"{frontmatter['PROJECT_ID']}-{README_SUFFIX}"
+    return name
+
+
+def copy_names(records: dict, reserved: set = frozenset()) -> dict:
+    """
+    Return a unique file name for the copy of each project README.
+
+    READMEs whose copy_name is shared with another README, or is reserved,
+    get a short hash of their path added, so that every run gives each
+    README the same copy.
+
+    Args:
+        records: README path -> shard record (see sharding.project_record)
+        reserved: Names already used in the index directory
+
+    Returns:
+        dict: README path -> copy name
+    """
+    names = {path: copy_name(record['frontmatter'], path)
+             for path, record in records.items()}
+    counts = Counter(names.values())
+    for path, name in names.items():
+        if counts[name] > 1 or name in reserved:
+            digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]
+            names[path] = f"{name[:-len(README_SUFFIX)]}{digest}-{README_SUFFIX}"
+    return names
+
+
+def build_sections(records: dict, links: dict, top: int = 10) -> dict:
+    """
+    Group the ranked projects into the sections of the index README.
+
+    Args:
+        records: README path -> shard record (see sharding.project_record)
+        links: README path -> link from the index README to the project,
+               i.e. its copy's name or a path relative to the index directory
+        top: Number of projects in the top priorities section
+
+    Returns:
+        dict: Section name -> list of (link, record) of its projects, in
+              the order the sections appear
+    """
+    paths = list(records)
+    sections = {TOP_SECTION: []}
+    sections.update((status.capitalize(), []) for status in STATUS_SCORES)
+    for path in sort_projects(paths, [records[path]['score'] for path in paths]):
+        record = records[path]
+        member = (links[path], record)
+        status = record['frontmatter'].get('STATUS') or FACTOR_DEFAULTS['STATUS']
+        section = status.capitalize() if status in STATUS_SCORES else OTHER_SECTION
+        if status != 'done' and len(sections[TOP_SECTION]) < top:
+            sections[TOP_SECTION].append(member)
+        sections.setdefault(section, []).append(member)
+    return sections
+
+
+def section_fingerprint(name: str, members: list) -> str:
+    """
+    Fingerprint a section from the shard records of its projects.
+
+    Only the frontmatter and score of a record are used: its file state
+    changes when a README is merely touched, which does not change the text.
+
+    Args:
+        name: Section name
+        members: The section's (link, record) pairs, as returned by build_sections
+
+    Returns:
+        str: Hex digest
+    """
+    values = [name] + [[link, record['frontmatter'], record['score']]
+                       for link, record in members]
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()
+
+
+def render_section(name: str, members: list) -> str:
+    """
+    Render one section of the index README.
+
+    Args:
+        name: Section name
+        members: The section's (link, record) pairs, as returned by build_sections
+
+    Returns:
+        str: Org text of the section
+    """
+    lines = [f"* {name}"]
+    if not members:
+        lines.append("No projects.")
+    for i, (link, record) in enumerate(members, 1):
+        frontmatter = record['frontmatter']
+        urgency = frontmatter.get('URGENCY') or FACTOR_DEFAULTS['URGENCY']
+        lines.append(f"{i}. [[file:{link}][{frontmatter.get('title', 'Untitled')}]] "
+                     f"({frontmatter.get('PROJECT_ID', 'No ID')}) - "
+                     f"score {record['score']}, urgency {urgency}")
+    return '\n'.join(lines) + '\n'
+
+
+def _load_marker(marker_path: str) -> dict:
+    """Return what the last run recorded in the marker file."""
+    try:
+        with open(marker_path) as file:
+            marker = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(marker, dict) or marker.get('version') != MARKER_VERSION:
+        return {}
+    return marker
+
+
+def generate_index(records: dict, index_dir: str,
+                   index_id: str = DEFAULT_INDEX_ID, title: str = DEFAULT_INDEX_TITLE,
+                   top: int = 10, copies: bool = True) -> IndexResult:
+    """
+    Write the index README and project README copies into index_dir.
+
+    Args:
+        records: README path -> shard record (see sharding.project_record)
+        index_dir: The capture directory, e.g. SYS.02.00
+        index_id: PROJECT_ID of the index; the README is <index_id>-README.org
+        title: Title of the index README
+        top: Number of projects in the top priorities section
+        copies: Also copy each project README into index_dir
+
+    Returns:
+        IndexResult: What was written
+    """
+    index_name = f"{index_id}-{README_SUFFIX}"
+    index_path = os.path.join(index_dir, index_name)
+    marker_path = os.path.join(index_dir, GENERATED_MARKER)
+    last = _load_marker(marker_path)
+    cached = last.get('sections', {})
+
+    if copies:
+        links = copy_names(records, {index_name})
+    else:
+        links = {path: os.path.relpath(path, index_dir) for path in records}
+    sections = {}
+    rendered, reused = [], []
+    for name, members in build_sections(records, links, top).items():
+        fingerprint = section_fingerprint(name, members)
+        if cached.get(name, [None])[0] == fingerprint:
+            sections[name] = cached[name]
+            reused.append(name)
+        else:
+            sections[name] = [fingerprint, render_section(name, members)]
+            rendered.append(name)
+
+    # A README inside index_dir is not copied onto itself, nor ever deleted
+    dests = {}
+    if copies:
+        for path, name in links.items():
+            dest = os.path.join(index_dir, name)
+            if os.path.abspath(dest) != os.path.abspath(path):
+                dests[path] = dest
+    written_names = sorted(os.path.basename(dest) for dest in dests.values())
+
+    # Stale copies are deleted before the marker forgets them, so that an
+    # interrupted run leaves them listed for the next one
+    removed = []
+    for name in sorted(set(last.get('copies', [])) - set(written_names) - {index_name}):
+        path = os.path.join(index_dir, name)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed.append(path)
+
+    # The marker goes before the index README and copies, so that the
+    # directory is skipped by project scans from the moment it holds them
+    marker = {'note': MARKER_NOTE, 'version': MARKER_VERSION,
+              'copies': written_names, 'sections': sections}
+    write_if_changed(marker_path, json.dumps(marker, indent=1).encode())
+
+    header = (f"#+title: {title}\n#+PROJECT_ID: {index_id}\n\n"
+              f"# Generated by meta-wip index; edits will be overwritten.\n\n")
+    content = header + '\n'.join(text for _, text in sections.values())
+    written = write_if_changed(index_path, content.encode())
+
+    copied = [dest for path, dest in dests.items() if copy_if_changed(path, dest)]
+
+    return IndexResult(index_path, written, rendered, reused, copied, removed)
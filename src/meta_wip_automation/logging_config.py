@@ -0,0 +1,162 @@
+"""
+Structured logging for the Meta WIP automation tools.
+
+Log records are written as JSON lines carrying the file path, the phase of
+processing (read, parse, score, ...) and the exception type, so that runs
+over large README trees can be analysed with standard tools such as jq.
+
+Records pass through a queue to a background listener thread, which does
+the formatting and I/O; the code emitting them only pays for the level check
+and a queue put. Per-file failures are collected in a FailureSummary and
+reported once at the end of a run instead of being interleaved with output.
+
+Usage:
+    listener = setup_logging('DEBUG', 'meta-wip.log')
+    try:
+        ...
+    finally:
+        stop_logging(listener)
+"""
+
+
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = 'meta_wip_automation'
+
+# Extra record attributes copied into every JSON line when present
+STRUCTURED_FIELDS = ('path', 'phase', 'exc_type', 'exc_message')
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as a single JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            # Records logged without going through the queue handler
+            record.exc_type = record.exc_info[0].__name__
+            record.exc_message = str(record.exc_info[1])
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    Queue handler that keeps the exception type and message.
+
+    The standard QueueHandler formats the whole record (including any
+    traceback) before enqueueing it. This one only merges the message
+    arguments and records the exception's type and text, leaving the
+    formatting to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_type = record.exc_info[0].__name__
+            record.exc_message = str(record.exc_info[1])
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+
+def setup_logging(level: str = 'INFO', log_file: str = None) -> QueueListener:
+    """
+    Send the package's log records as JSON lines to a file or stderr.
+
+    Args:
+        level: Minimum level name to record (e.g. 'DEBUG', 'WARNING')
+        log_file: File to append records to; stderr if not given
+
+    Returns:
+        QueueListener: The running listener; pass it to stop_logging
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level.upper())
+
+    target = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stderr)
+    target.setFormatter(JsonLinesFormatter())
+
+    record_queue = queue.SimpleQueue()
+    logger.addHandler(StructuredQueueHandler(record_queue))
+    listener = QueueListener(record_queue, target)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: QueueListener) -> None:
+    """
+    Flush pending records and undo the changes made by setup_logging.
+
+    Args:
+        listener: The listener returned by setup_logging
+    """
+    listener.stop()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.NOTSET)
+    for handler in list(logger.handlers):
+        if isinstance(handler, StructuredQueueHandler):
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.close()
+
+
+class FailureSummary:
+    """
+    Collect per-file failures for a single report at the end of a run.
+
+    Each failure is also logged as a warning with its path, phase and
+    exception type.
+    """
+
+    def __init__(self, logger: logging.Logger = None):
+        self.logger = logger or logging.getLogger(LOGGER_NAME)
+        self.failures = []
+
+    def __len__(self) -> int:
+        return len(self.failures)
+
+    def add(self, path: str, phase: str, error: Exception) -> None:
+        """
+        Record a failure.
+
+        Args:
+            path: File that could not be processed
+            phase: Processing phase that failed (e.g. 'read', 'parse')
+            error: The exception raised
+        """
+        self.failures.append((path, phase, error))
+        self.logger.warning("Error processing %s", path, exc_info=error,
+                            extra={'path': path, 'phase': phase})
+
+    def report(self, stream=None) -> None:
+        """
+        Print the collected failures, if any.
+
+        Args:
+            stream: Where to print; defaults to the current sys.stderr
+        """
+        if not self.failures:
+            return
+        stream = stream or sys.stderr
+        print(f"\n{len(self.failures)} file(s) could not be processed:", file=stream)
+        for path, phase, error in self.failures:
+            print(f"   Error processing {path} ({phase}): "
+                  f"{type(error).__name__}: {error}", file=stream)
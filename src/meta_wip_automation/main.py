@@ -1,9 +1,622 @@
 import argparse
+import logging
+import math
+import os
 import sys
+from datetime import date, datetime, timedelta
 from typing import List
-from meta_wip_automation.project_sorter import sort_projects
-from meta_wip_automation.readme_parser import parse_readme, extract_frontmatter
-from datetime import datetime
+from meta_wip_automation.backup import (
+    create_snapshot,
+    list_snapshots,
+    restore_snapshot,
+    verify_store
+)
+from meta_wip_automation.frontmatter_schema import validate_frontmatter
+from meta_wip_automation.index_generator import (
+    DEFAULT_INDEX_ID,
+    DEFAULT_INDEX_TITLE,
+    generate_index
+)
+from meta_wip_automation.logging_config import (
+    FailureSummary,
+    setup_logging,
+    stop_logging
+)
+from meta_wip_automation.org_tokenizer import load_subtasks
+from meta_wip_automation.project_sorter import calculate_priority, sort_projects
+from meta_wip_automation.rank_diff import (
+    build_ranking,
+    describe_cause,
+    diff_rankings,
+    load_ranking,
+    ranking_path,
+    save_ranking
+)
+from meta_wip_automation.readme_parser import load_project, parse_readme
+from meta_wip_automation.recurrence_forecast import EVENT_KINDS, build_forecast
+from meta_wip_automation.search_index import SearchIndex, index_path
+from meta_wip_automation.similarity import SimilarityIndex
+from meta_wip_automation.similarity import index_path as similarity_index_path
+from meta_wip_automation.sharding import (
+    load_roots,
+    merge_rankings,
+    parse_root_spec,
+    rank_shards,
+    shard_cache_path,
+    update_records
+)
+from meta_wip_automation.utils import find_readmes, get_cache_dir, get_data_dir
+from meta_wip_automation.weight_simulation import load_profiles, simulate
+
+logger = logging.getLogger(__name__)
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command-line count that must be at least 1.
+
+    Args:
+        value: The argument as given
+
+    Returns:
+        int: The parsed value
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a whole number of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
+def load_projects(paths: List[str], failures: FailureSummary) -> tuple:
+    """
+    Load every README found under the given paths, collecting failures.
+
+    Args:
+        paths: README files and/or directories to search
+        failures: Summary that files which cannot be loaded are added to
+
+    Returns:
+        tuple: (projects, file_paths) where projects is a list of
+               (frontmatter, last_completed, recurrence_interval) tuples and
+               file_paths holds the README each project was read from
+    """
+    projects = []
+    file_paths = []
+    debug = logger.isEnabledFor(logging.DEBUG)  # Checked once, not per file
+    for file_path in find_readmes(paths, skip_generated=True):
+        try:
+            project = load_project(file_path)
+        except OSError as e:
+            failures.add(file_path, 'read', e)
+            continue
+        except Exception as e:
+            failures.add(file_path, 'parse', e)
+            continue
+        if debug:
+            logger.debug("Parsed %s", file_path,
+                         extra={'path': file_path, 'phase': 'parse'})
+        projects.append(project)
+        file_paths.append(file_path)
+    return projects, file_paths
+
+
+def check_paths(paths: List[str], directories: bool = False) -> bool:
+    """
+    Report input paths that do not exist, or are not directories.
+
+    Commands that keep a cache per input path check them first, since a
+    missing path would otherwise just look like an empty tree.
+
+    Args:
+        paths: Paths given on the command line
+        directories: Only accept directories
+
+    Returns:
+        bool: True if every path can be used
+    """
+    usable = True
+    for path in paths:
+        if not os.path.isdir(path) and (directories or not os.path.isfile(path)):
+            kind = "a directory" if directories else "a directory or file"
+            print(f"Error: Not {kind}: {path}", file=sys.stderr)
+            usable = False
+    return usable
+
+
+def load_records(paths: List[str], failures: FailureSummary) -> tuple:
+    """
+    Bring the shard cache of each path up to date and collect its records.
+
+    Each path is cached under the name 'rank PATH' would give it, so the
+    commands that read projects this way share the work with 'rank'.
+
+    Args:
+        paths: README files and/or directories
+        failures: Summary that files which cannot be loaded are added to
+
+    Returns:
+        tuple: (records, parsed) where records maps each loaded README path
+               to its cached record (see sharding.project_record), in path
+               order within each of paths, and parsed lists the READMEs
+               among them that had to be parsed this run
+    """
+    records = {}
+    parsed = []
+    for root in paths:
+        cache_path = shard_cache_path(get_cache_dir(), parse_root_spec(root)[0], root)
+        files, _, root_failures, root_parsed = update_records(root, cache_path)
+        for path, phase, error in root_failures:
+            failures.add(path, phase, error)
+        # READMEs that failed to parse are reported as failures instead
+        parsed.extend(path for path in root_parsed if path in files)
+        for path in sorted(files):
+            records[path] = files[path]
+    return records, parsed
+
+
+def run_sort(args, failures: FailureSummary) -> int:
+    """
+    Print the projects in priority order.
+
+    Args:
+        args: Parsed command-line arguments
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: 1 if a --diff path does not exist, otherwise None
+    """
+    if args.diff:
+        if not check_paths(args.sort):
+            return 1
+        # Only READMEs changed since the last run are parsed
+        records, _ = load_records(args.sort, failures)
+        if records:
+            print_rank_diff(args, records)
+        return None
+
+    # Process each README file
+    projects, _ = load_projects(args.sort, failures)
+
+    if projects: # Only sort and display results if we have valid README files
+        sorted_projects = sort_projects(projects)
+        print("\nProjects in priority order:")
+        print("-" * 40)
+        for i, (frontmatter, _, _) in enumerate(sorted_projects, 1):
+            print(f"{i}. {frontmatter.get('title', 'Untitled')} ({frontmatter.get('PROJECT_ID', 'No ID')})")
+            print(f"   Status: {frontmatter.get('STATUS', 'unknown')}")
+            print(f"   Urgency: {frontmatter.get('URGENCY', 'unknown')}")
+            print()
+
+
+def print_rank_diff(args, records: dict) -> None:
+    """
+    Print how the ranking changed since the last diff, then save it.
+
+    Args:
+        args: Parsed command-line arguments
+        records: README path mapped to the project's cached record
+    """
+    ranking = build_ranking(records)
+    path = ranking_path(get_cache_dir(), args.sort)
+    previous = load_ranking(path)
+    save_ranking(path, ranking)
+
+    if previous is None:
+        print(f"\nNo previous ranking; saved {len(ranking.ids)} projects for the next diff")
+        return
+    changes = diff_rankings(previous, ranking, args.top, args.moved)
+    if not changes:
+        print(f"\nNo changes since {previous.date}")
+        return
+
+    labels = {'entered': f"entered top {args.top}", 'left': f"left top {args.top}",
+              'moved': 'moved', 'score': 'score changed'}
+    print(f"\nChanges since {previous.date}:")
+    print("-" * 40)
+    for change in changes:
+        old_rank = f"#{change.old_rank}" if change.old_rank else 'new'
+        new_rank = f"#{change.new_rank}" if change.new_rank else 'gone'
+        print(f"{change.title} ({change.project_id}): {old_rank} -> {new_rank}, "
+              f"score {change.old_score} -> {change.new_score} "
+              f"[{', '.join(labels[kind] for kind in change.kinds)}]")
+        for column, old_code, new_code in change.causes:
+            print(f"   {describe_cause(column, old_code, new_code)}")
+
+
+def run_simulate(args, failures: FailureSummary) -> int:
+    """
+    Run the weight what-if simulation and print a report per profile.
+
+    Args:
+        args: Parsed arguments of the simulate subcommand
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: Exit status
+    """
+    try:
+        profiles = load_profiles(args.profiles)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error loading profiles: {e}", file=sys.stderr)
+        return 1
+
+    projects, _ = load_projects(args.paths, failures)
+    if not projects:
+        return 1
+
+    def fmt(value):
+        return 'n/a' if math.isnan(value) else f"{value:.3f}"
+
+    for result in simulate(projects, profiles, args.movers):
+        print(f"\nProfile: {result.name}")
+        print(f"   Spearman: {fmt(result.spearman)}   Kendall: {fmt(result.kendall)}")
+        if not result.movers:
+            print("   No rank changes")
+        for index, old_rank, new_rank in result.movers:
+            frontmatter = projects[index][0]
+            print(f"   {frontmatter.get('title', 'Untitled')} "
+                  f"({frontmatter.get('PROJECT_ID', 'No ID')}): "
+                  f"{old_rank} -> {new_rank} ({old_rank - new_rank:+d})")
+    return 0
+
+
+def run_rank(args, failures: FailureSummary) -> int:
+    """
+    Rank projects across several roots and print the global top N.
+
+    Args:
+        args: Parsed arguments of the rank subcommand
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: Exit status
+    """
+    roots = {}
+    try:
+        if args.config:
+            roots.update(load_roots(args.config))
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error loading config: {e}", file=sys.stderr)
+        return 1
+    for spec in args.roots:
+        name, root = parse_root_spec(spec)
+        if name in roots and os.path.abspath(roots[name]) != os.path.abspath(root):
+            print(f"Error: shard name '{name}' is used for both {roots[name]} and {root}; "
+                  f"name them with NAME=PATH", file=sys.stderr)
+            return 1
+        roots[name] = root
+    if not roots:
+        print("No roots given; pass ROOT arguments or --config", file=sys.stderr)
+        return 1
+    if not check_paths(list(roots.values()), directories=True):
+        return 1
+
+    results = rank_shards(roots, get_cache_dir(), args.workers)
+    for result in results.values():
+        for path, phase, error in result.failures:
+            failures.add(path, phase, error)
+
+    top = merge_rankings([result.entries for result in results.values()], args.top)
+    print(f"\nTop {len(top)} projects across {len(roots)} roots:")
+    print("-" * 40)
+    for i, entry in enumerate(top, 1):
+        print(f"{i}. {entry.title} ({entry.project_id}) [{entry.shard}]")
+        print(f"   Score: {entry.score}")
+    print()
+    for name, result in results.items():
+        state = 'cached' if result.reused else 're-scored'
+        print(f"{name}: {len(result.entries)} projects ({state})")
+    return 0
+
+
+def run_due(args, failures: FailureSummary) -> int:
+    """
+    List recurring projects that become due soon or due in a date range.
+
+    Args:
+        args: Parsed arguments of the due subcommand
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: Exit status
+    """
+    start = date.today()
+    if args.on:
+        first = last = args.on
+    elif args.today:
+        first = last = start
+    else:
+        days = args.days or 7
+        first, last = start, start + timedelta(days=days - 1)
+    start = min(start, first)
+
+    projects, _ = load_projects(args.paths, failures)
+    forecast = build_forecast(projects, start, (last - start).days + 1)
+
+    if forecast.overdue and first <= date.today():
+        print("\nOverdue:")
+        for due_date, project_id, title in forecast.overdue:
+            print(f"   {title} ({project_id}): due {due_date.isoformat()}")
+
+    events = forecast.between(first, last, args.kind)
+    if not events:
+        print(f"\nNothing {args.kind or 'due'} from {first.isoformat()} to {last.isoformat()}")
+    current_day = None
+    for event in events:
+        if event.date != current_day:
+            current_day = event.date
+            print(f"\n{current_day.isoformat()} ({current_day.strftime('%a')})")
+        projected = ' (projected)' if event.projected else ''
+        print(f"   {event.kind}: {event.title} ({event.project_id}){projected}")
+    return 0
+
+
+def run_validate(args, failures: FailureSummary) -> int:
+    """
+    Check README frontmatter against the schema and print any problems.
+
+    Args:
+        args: Parsed arguments of the validate subcommand
+        failures: Summary of files that could not be read
+
+    Returns:
+        int: 0 if every README is valid, otherwise 1
+    """
+    checked = 0
+    invalid = 0
+    for file_path in find_readmes(args.paths, skip_generated=True):
+        try:
+            content = parse_readme(file_path)
+        except OSError as e:
+            failures.add(file_path, 'read', e)
+            continue
+        checked += 1
+        errors = validate_frontmatter(content).errors
+        if errors:
+            invalid += 1
+        for line, field, _, message in errors:
+            location = f"{file_path}:{line}" if line else file_path
+            print(f"{location}: {field}: {message}")
+    print(f"\n{checked - invalid} of {checked} README(s) valid")
+    return 1 if invalid or failures else 0
+
+
+def run_find(args, failures: FailureSummary) -> int:
+    """
+    Search project titles, IDs and tags with the trigram index.
+
+    Args:
+        args: Parsed arguments of the find subcommand
+        failures: Summary of files that could not be indexed
+
+    Returns:
+        int: 0 if anything matched, otherwise 1
+    """
+    if not check_paths(args.paths):
+        return 1
+    path = index_path(get_cache_dir(), args.paths)
+    index = SearchIndex.load(path)
+    if not (args.no_refresh and len(index)):
+        updated, removed, index_failures = index.update(args.paths)
+        for file_path, phase, error in index_failures:
+            failures.add(file_path, phase, error)
+        if updated or removed:
+            index.save(path)
+
+    hits = index.search(args.query, args.limit, args.by_priority)
+    if not hits:
+        print(f"No projects match '{args.query}'")
+        return 1
+    for i, hit in enumerate(hits, 1):
+        print(f"{i}. {hit.title} ({hit.project_id or 'No ID'})  "
+              f"match {hit.similarity:.0%}, priority {hit.priority}")
+        print(f"   {hit.path}")
+    return 0
+
+
+def load_similarity_index(paths: list, failures: FailureSummary) -> SimilarityIndex:
+    """
+    Load the cached similarity index of a set of paths and bring it up to date.
+
+    Args:
+        paths: README files and/or directories
+        failures: Summary of files that could not be indexed
+
+    Returns:
+        SimilarityIndex: The up-to-date index
+    """
+    path = similarity_index_path(get_cache_dir(), paths)
+    index = SimilarityIndex.load(path)
+    updated, removed, index_failures = index.update(paths)
+    for file_path, phase, error in index_failures:
+        failures.add(file_path, phase, error)
+    if updated or removed:
+        index.save(path)
+    return index
+
+
+def run_similar(args, failures: FailureSummary) -> int:
+    """
+    Print the projects most similar to one project.
+
+    Args:
+        args: Parsed arguments of the similar subcommand
+        failures: Summary of files that could not be indexed
+
+    Returns:
+        int: Exit status
+    """
+    if not check_paths(args.paths):
+        return 1
+    index = load_similarity_index(args.paths, failures)
+    path = index.find(args.project)
+    if path is None:
+        print(f"Project not found: {args.project}", file=sys.stderr)
+        return 1
+    doc = index.docs[index.numbers[path]]
+    neighbours = index.neighbours(path, args.limit, args.min_similarity)
+    print(f"\nProjects similar to {doc['title']} ({doc['project_id'] or 'No ID'}):")
+    print("-" * 40)
+    if not neighbours:
+        print("No similar projects found")
+    for i, neighbour in enumerate(neighbours, 1):
+        print(f"{i}. {neighbour.title} ({neighbour.project_id or 'No ID'})  "
+              f"similarity {neighbour.similarity:.2f}")
+        print(f"   Shared: {', '.join(neighbour.shared)}")
+    return 0
+
+
+def run_clusters(args, failures: FailureSummary) -> int:
+    """
+    Print groups of related projects.
+
+    Args:
+        args: Parsed arguments of the clusters subcommand
+        failures: Summary of files that could not be indexed
+
+    Returns:
+        int: Exit status
+    """
+    if not check_paths(args.paths):
+        return 1
+    index = load_similarity_index(args.paths, failures)
+    clusters = index.clusters(args.threshold)
+    if not clusters:
+        print(f"No projects with similarity of at least {args.threshold}")
+        return 0
+    for i, cluster in enumerate(clusters, 1):
+        print(f"\nCluster {i} ({len(cluster)} projects): "
+              f"{', '.join(index.common_terms(cluster))}")
+        for path in cluster:
+            doc = index.docs[index.numbers[path]]
+            print(f"   {doc['title']} ({doc['project_id'] or 'No ID'})")
+    return 0
+
+
+def run_subtasks(args, failures: FailureSummary) -> int:
+    """
+    Print the TODO subtasks of the READMEs in priority order.
+
+    Args:
+        args: Parsed arguments of the subtasks subcommand
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: Exit status
+    """
+    projects = []
+    sources = {}
+    for file_path in find_readmes(args.paths, skip_generated=True):
+        try:
+            subtasks = load_subtasks(file_path, args.all)
+        except OSError as e:
+            failures.add(file_path, 'read', e)
+            continue
+        except Exception as e:
+            failures.add(file_path, 'parse', e)
+            continue
+        for subtask, project in subtasks:
+            projects.append(project)
+            sources[id(project)] = (file_path, subtask)
+
+    if not projects:
+        print("No subtasks found")
+        return 0
+    print("\nSubtasks in priority order:")
+    print("-" * 40)
+    for i, project in enumerate(sort_projects(projects)[:args.top], 1):
+        file_path, subtask = sources[id(project)]
+        fields = project[0]
+        print(f"{i}. {subtask.keyword} {subtask.title} ({fields.get('PROJECT_ID', 'No ID')})")
+        print(f"   Score: {calculate_priority(*project)}   "
+              f"Status: {fields.get('STATUS', 'unknown')}   "
+              f"Urgency: {fields.get('URGENCY', 'unknown')}")
+        print(f"   {file_path}:{subtask.line}")
+    return 0
+
+
+def run_index(args, failures: FailureSummary) -> int:
+    """
+    Regenerate the index README and project README copies.
+
+    Args:
+        args: Parsed arguments of the index subcommand
+        failures: Summary of files that could not be loaded
+
+    Returns:
+        int: Exit status
+    """
+    if not check_paths(args.paths):
+        return 1
+    # Projects come from the shard cache, so only changed READMEs are parsed
+    index_dir = os.path.abspath(args.index_dir)
+    records, parsed = load_records(args.paths, failures)
+    # The index directory's own READMEs are output, not projects. Its marker
+    # file keeps project scans out of it, except before the first run
+    records = {path: record for path, record in records.items()
+               if os.path.dirname(os.path.abspath(path)) != index_dir}
+    if not records:
+        print("No projects to index", file=sys.stderr)
+        return 1
+
+    result = generate_index(records, args.index_dir, args.index_id, args.title,
+                            args.top, not args.no_copies)
+    state = 'written' if result.written else 'unchanged'
+    parsed = sum(1 for path in parsed if path in records)
+    print(f"{result.index_path}: {state} ({len(result.rendered)} sections rendered, "
+          f"{len(result.reused)} reused; {parsed} of {len(records)} READMEs parsed)")
+    if not args.no_copies:
+        print(f"Copied {len(result.copied)} of {len(records)} project READMEs")
+        for path in result.copied:
+            print(f"   {path}")
+    if result.removed:
+        print(f"Removed {len(result.removed)} stale copies")
+        for path in result.removed:
+            print(f"   {path}")
+    return 0
+
+
+def run_backup(args) -> int:
+    """
+    Run one of the backup subcommands (snapshot, list, restore, verify).
+
+    Args:
+        args: Parsed arguments of the backup subcommand
+
+    Returns:
+        int: Exit status
+    """
+    store = args.store
+    try:
+        if args.backup_command == 'snapshot':
+            manifest, created = create_snapshot(args.root, store)
+            if created:
+                print(f"Created snapshot {manifest['id']} ({len(manifest['files'])} files)")
+            else:
+                print(f"No changes since snapshot {manifest['id']}")
+        elif args.backup_command == 'list':
+            for manifest in list_snapshots(store):
+                print(f"{manifest['id']}  {len(manifest['files']):>5} files  {manifest['root']}")
+        elif args.backup_command == 'restore':
+            restored = restore_snapshot(store, args.snapshot, args.dest, args.project)
+            print(f"Restored {len(restored)} files")
+        elif args.backup_command == 'verify':
+            problems = verify_store(store, args.workers)
+            for digest, problem in problems:
+                print(f"{problem} object: {digest}", file=sys.stderr)
+            if problems:
+                return 1
+            print("All objects verified")
+    except ValueError as e:
+        print(f"Backup error: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 
 def main():
@@ -15,18 +628,46 @@ def main():
     based on those arguments.
 
     Command-line Arguments:
-    --sort : Flag to initiate the project sorting process
+    --sort      : Flag to initiate the project sorting process
+    --diff      : With --sort, only show changes since the last --diff run
+    --log-level : Record JSON-lines log entries at this level or above
+    --log-file  : Write log entries to this file instead of stderr
+
+    Subcommands:
+    simulate : Compare rankings under alternative weight profiles
+    backup   : Snapshot, list, restore and verify README backups
+    rank     : Rank projects across several roots
+    due      : Forecast recurring projects becoming due
+    validate : Check frontmatter fields and values
+    find     : Fuzzy search of project titles, IDs and tags
+    similar  : Projects most similar to one project
+    clusters : Groups of related projects
+    subtasks : Rank the TODO subtasks inside READMEs
+    index    : Regenerate the SYS.02.00 index README and README copies
 
     Usage:
-    python3 main.py --sort  : Sort the projects
-    python3 main.py --help  : Display help message
+    python3 main.py --sort FILE...                       : Sort the projects
+    python3 main.py --sort PATH... --diff                : Changes only
+    python3 main.py simulate --profiles P.toml PATH...   : What-if weights
+    python3 main.py backup snapshot ROOT                 : Back up READMEs
+    python3 main.py backup restore latest --project ID   : Restore a project
+    python3 main.py rank --top 10 SYS.02=DIR WRK=DIR     : Global top 10
+    python3 main.py due --week PATH...                   : Due this week
+    python3 main.py validate PATH...                     : Check frontmatter
+    python3 main.py find "autmate wip" PATH...           : Fuzzy search
+    python3 main.py similar SYS.02.02 PATH...            : Related projects
+    python3 main.py clusters --threshold 0.3 PATH...     : Project groups
+    python3 main.py subtasks --top 10 PATH...            : Top subtasks
+    python3 main.py index --index-dir SYS.02.00 PATH...  : Update the index
+    python3 main.py --help                               : Display help message
 
     Returns:
     None
 
     Raises:
     SystemExit: If no arguments are provided, exists with status code 1
-                after displaying the help message.
+                after displaying the help message. Subcommands exit with
+                their own status.
     """
     # Set up argument parser
     parser = argparse.ArgumentParser(
@@ -37,51 +678,199 @@ def main():
     # Add arguments
     parser.add_argument('--sort', nargs='+', metavar='FILE',
                         help="Sort the projects based on predefined criteria")
+    parser.add_argument('--diff', action='store_true',
+                        help="With --sort, only show projects that entered or left "
+                             "the top N, moved or changed score since the last --diff")
+    parser.add_argument('--top', type=positive_int, default=10, metavar='N',
+                        help="Size of the top of the ranking watched by --diff "
+                             "(default: %(default)s)")
+    parser.add_argument('--moved', type=int, default=3, metavar='K',
+                        help="With --diff, report moves of more than K places "
+                             "(default: %(default)s)")
+    parser.add_argument('--log-level', metavar='LEVEL', type=str.upper,
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Record JSON-lines log entries at LEVEL or above "
+                             "(default: INFO when --log-file is given)")
+    parser.add_argument('--log-file', metavar='FILE',
+                        help="Append log entries to FILE instead of stderr")
+
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    simulate_parser = subparsers.add_parser(
+        'simulate', help="Compare rankings under alternative weight profiles")
+    simulate_parser.add_argument('--profiles', required=True, metavar='TOML',
+                                 help="TOML file of weight/boost profiles")
+    simulate_parser.add_argument('--movers', type=int, default=5, metavar='N',
+                                 help="Number of biggest rank changes to list per profile")
+    simulate_parser.add_argument('paths', nargs='+', metavar='PATH',
+                                 help="README files or directories to search for them")
+
+    backup_parser = subparsers.add_parser(
+        'backup', help="Snapshot, list, restore and verify README backups")
+    backup_parser.add_argument('--store', metavar='DIR',
+                               default=os.path.join(get_data_dir(), 'backups'),
+                               help="Backup store directory (default: %(default)s)")
+    backup_commands = backup_parser.add_subparsers(dest='backup_command',
+                                                   metavar='ACTION', required=True)
+    snapshot_parser = backup_commands.add_parser(
+        'snapshot', help="Snapshot every README under ROOT")
+    snapshot_parser.add_argument('root', metavar='ROOT',
+                                 help="Directory tree to back up")
+    backup_commands.add_parser('list', help="List snapshots")
+    restore_parser = backup_commands.add_parser(
+        'restore', help="Restore READMEs from a snapshot")
+    restore_parser.add_argument('snapshot', metavar='SNAPSHOT',
+                                help="Snapshot ID, or 'latest'")
+    restore_parser.add_argument('--project', metavar='ID',
+                                help="Restore only this project's READMEs")
+    restore_parser.add_argument('--dest', metavar='DIR',
+                                help="Restore into DIR instead of the original root")
+    verify_parser = backup_commands.add_parser(
+        'verify', help="Check every stored object against its hash")
+    verify_parser.add_argument('--workers', type=int, metavar='N',
+                               help="Number of hashing threads")
+
+    rank_parser = subparsers.add_parser(
+        'rank', help="Rank projects across several roots")
+    rank_parser.add_argument('roots', nargs='*', metavar='ROOT',
+                             help="NAME=DIR, or DIR to name the shard after the directory")
+    rank_parser.add_argument('--config', metavar='TOML',
+                             help="TOML file with a [roots] table of NAME = DIR")
+    rank_parser.add_argument('--top', type=positive_int, default=10, metavar='N',
+                             help="Number of projects to show (default: %(default)s)")
+    rank_parser.add_argument('--workers', type=positive_int, metavar='N',
+                             help="Maximum processes for re-scoring shards")
+
+    due_parser = subparsers.add_parser(
+        'due', help="Forecast recurring projects becoming due")
+    due_range = due_parser.add_mutually_exclusive_group()
+    due_range.add_argument('--today', action='store_true', help="Only today")
+    due_range.add_argument('--week', action='store_true',
+                           help="Today and the next six days (default)")
+    due_range.add_argument('--days', type=positive_int, metavar='N',
+                           help="Today and the next N-1 days")
+    due_range.add_argument('--on', metavar='YYYY-MM-DD',
+                           type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+                           help="A single date")
+    due_parser.add_argument('--kind', choices=EVENT_KINDS,
+                            help="Only show projects becoming due-soon (75%% of "
+                                 "the interval) or due")
+    due_parser.add_argument('paths', nargs='+', metavar='PATH',
+                            help="README files or directories to search for them")
+
+    validate_parser = subparsers.add_parser(
+        'validate', help="Check frontmatter fields and values")
+    validate_parser.add_argument('paths', nargs='+', metavar='PATH',
+                                 help="README files or directories to search for them")
+
+    find_parser = subparsers.add_parser(
+        'find', help="Fuzzy search of project titles, IDs and tags")
+    find_parser.add_argument('query', metavar='QUERY', help="Words to search for")
+    find_parser.add_argument('paths', nargs='*', default=['.'], metavar='PATH',
+                             help="README files or directories to search "
+                                  "(default: current directory)")
+    find_parser.add_argument('--limit', type=int, default=10, metavar='N',
+                             help="Maximum number of results (default: %(default)s)")
+    find_parser.add_argument('--by-priority', action='store_true',
+                             help="Order matches by priority score instead of similarity")
+    find_parser.add_argument('--no-refresh', action='store_true',
+                             help="Search the saved index without checking for "
+                                  "changed READMEs")
+
+    similar_parser = subparsers.add_parser(
+        'similar', help="Projects most similar to one project")
+    similar_parser.add_argument('project', metavar='PROJECT',
+                                help="PROJECT_ID or README path of the project")
+    similar_parser.add_argument('paths', nargs='*', default=['.'], metavar='PATH',
+                                help="README files or directories to compare with "
+                                     "(default: current directory)")
+    similar_parser.add_argument('--limit', type=int, default=5, metavar='N',
+                                help="Maximum number of projects (default: %(default)s)")
+    similar_parser.add_argument('--min-similarity', type=float, default=0.0, metavar='S',
+                                help="Leave out projects less similar than S, from 0 to 1 "
+                                     "(default: %(default)s)")
+
+    clusters_parser = subparsers.add_parser(
+        'clusters', help="Groups of related projects")
+    clusters_parser.add_argument('paths', nargs='*', default=['.'], metavar='PATH',
+                                 help="README files or directories to group "
+                                      "(default: current directory)")
+    clusters_parser.add_argument('--threshold', type=float, default=0.3, metavar='S',
+                                 help="Minimum similarity of related projects, from 0 to 1 "
+                                      "(default: %(default)s)")
+
+    subtasks_parser = subparsers.add_parser(
+        'subtasks', help="Rank the TODO subtasks inside READMEs")
+    subtasks_parser.add_argument('paths', nargs='*', default=['.'], metavar='PATH',
+                                 help="README files or directories "
+                                      "(default: current directory)")
+    subtasks_parser.add_argument('--top', type=positive_int, default=None, metavar='N',
+                                 help="Only show the N highest-priority subtasks")
+    subtasks_parser.add_argument('--all', action='store_true',
+                                 help="Include subtasks with a done keyword")
+
+    index_parser = subparsers.add_parser(
+        'index', help="Regenerate the SYS.02.00 index README and README copies")
+    index_parser.add_argument('paths', nargs='+', metavar='PATH',
+                              help="README files or directories of the projects")
+    index_parser.add_argument('--index-dir', required=True, metavar='DIR',
+                              help="Capture directory to write to, e.g. SYS.02.00")
+    index_parser.add_argument('--index-id', default=DEFAULT_INDEX_ID, metavar='ID',
+                              help="PROJECT_ID of the index README (default: %(default)s)")
+    index_parser.add_argument('--title', default=DEFAULT_INDEX_TITLE,
+                              help="Title of the index README (default: %(default)s)")
+    index_parser.add_argument('--top', type=positive_int, default=10, metavar='N',
+                              help="Projects in the top priorities section "
+                                   "(default: %(default)s)")
+    index_parser.add_argument('--no-copies', action='store_true',
+                              help="Link to the project READMEs instead of copying them")
 
     # Parse arguments
     args = parser.parse_args()
 
-    if args.sort:
-        # Process each README file
-        projects = []
-        for file_path in args.sort:
-            try:
-                content = parse_readme(file_path)
-                frontmatter = extract_frontmatter(content)
-
-                # Check if frontmatter is valid
-                if not frontmatter or 'title' not in frontmatter:
-                    raise ValueError("Invalid or missing frontmatter")
-
-                # Handle recurence if specified
-                last_completed = None
-                recurrence_interval = None
-                if 'RECURRENCE_INTERVAL' in frontmatter and 'LAST_COMPLETED' in frontmatter:
-                    recurrence_interval = int(frontmatter['RECURRENCE_INTERVAL'])
-                    last_completed = datetime.strptime(frontmatter['LAST_COMPLETED'], '%Y-%m-%d')
-
-                projects.append((frontmatter, last_completed, recurrence_interval))
-            except FileNotFoundError as e:
-                print(f"Error processing {file_path}: {str(e)}", file=sys.stderr)
-                continue
-            except Exception as e:
-                print(f"Error processing {file_path}: Invalid frontmatter format", file=sys.stderr)
-                continue
-
-        if projects: # Only sort and display results if we have valid README files
-            sorted_projects = sort_projects(projects)
-            print("\nProjects in priority order:")
-            print("-" * 40)
-            for i, (frontmatter, _, _) in enumerate(sorted_projects, 1):
-                print(f"{i}. {frontmatter.get('title', 'Untitled')} ({frontmatter.get('PROJECT_ID', 'No ID')})")
-                print(f"   Status: {frontmatter.get('STATUS', 'unknown')}")
-                print(f"   Urgency: {frontmatter.get('URGENCY', 'unknown')}")
-                print()
-    elif len(sys.argv) == 1:
+    if len(sys.argv) == 1:
         # If no arguments are provided, print help message and exit
         parser.print_help(sys.stderr)
         sys.exit(1)
 
+    listener = None
+    if args.log_level or args.log_file:
+        listener = setup_logging(args.log_level or 'INFO', args.log_file)
+    failures = FailureSummary()
+
+    status = None
+    try:
+        if args.command == 'simulate':
+            status = run_simulate(args, failures)
+        elif args.command == 'backup':
+            status = run_backup(args)
+        elif args.command == 'rank':
+            status = run_rank(args, failures)
+        elif args.command == 'due':
+            status = run_due(args, failures)
+        elif args.command == 'validate':
+            status = run_validate(args, failures)
+        elif args.command == 'find':
+            status = run_find(args, failures)
+        elif args.command == 'similar':
+            status = run_similar(args, failures)
+        elif args.command == 'clusters':
+            status = run_clusters(args, failures)
+        elif args.command == 'subtasks':
+            status = run_subtasks(args, failures)
+        elif args.command == 'index':
+            status = run_index(args, failures)
+        elif args.sort:
+            status = run_sort(args, failures)
+    finally:
+        # Report file failures once, after the normal output
+        failures.report()
+        if listener:
+            stop_logging(listener)
+
+    if status is not None:
+        sys.exit(status)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,290 @@
+"""
+Streaming tokenizer for the org-mode structure of project READMEs.
+
+extract_frontmatter stops at the first heading, so the subtasks further
+down a README never reach the scorer. This module reads a README once, line
+by line, and yields tokens for the parts that matter to prioritisation:
+
+    Keyword  : '#+KEY: value' lines (frontmatter, and #+TODO: keyword sets)
+    Heading  : '* TODO [#A] Title :tag:' lines, with TODO keyword and tags
+    Property : ':KEY: value' lines of a :PROPERTIES: drawer
+
+Everything else (body text, lists, tables) is skipped, and lines inside
+'#+begin_...'/'#+end_...' blocks are never taken for headings or keywords.
+No tree of the document is built: iter_subtasks keeps only the properties
+of the current heading's ancestors, so memory does not grow with the size
+of the README and time is linear in its length.
+
+Subtasks are headings with a TODO keyword. Each subtask gets the file's
+frontmatter, overridden by the properties of its ancestor headings and
+then its own, so a subtask can have its own EFFORT, URGENCY and so on:
+
+    * TODO Write the migration script
+      :PROPERTIES:
+      :EFFORT: resist
+      :URGENCY: now
+      :END:
+
+A TODO keyword that is also a STATUS value (e.g. WAITING with
+'#+TODO: ACTIVE WAITING | DONE') sets the subtask's STATUS, and subtasks
+with a done keyword get STATUS done. Keywords declared with #+TODO: apply
+to the headings after the declaration.
+"""
+
+
+import re
+from typing import NamedTuple
+
+from meta_wip_automation.frontmatter_schema import normalise_fields
+from meta_wip_automation.project_sorter import FIELD_SCORES, STATUS_SCORES
+from meta_wip_automation.readme_parser import build_project
+
+DEFAULT_TODO = ('TODO',)
+DEFAULT_DONE = ('DONE',)
+
+# In-buffer settings that declare TODO keywords
+TODO_SETTINGS = ('TODO', 'SEQ_TODO', 'TYP_TODO')
+
+# Property names that are matched case-insensitively, like org does
+_FIELD_NAMES = {name.upper(): name for name in
+                tuple(FIELD_SCORES) + ('RECURRENCE_INTERVAL', 'LAST_COMPLETED')}
+
+_HEADING = re.compile(r'(\*+)\s+(.*?)\s*$')
+_PRIORITY = re.compile(r'\[#([A-Z0-9])\]\s*')
+_TAGS = re.compile(r'\s+(:[\w@#%:]+:)$')
+_PLANNING = re.compile(r'(SCHEDULED|DEADLINE|CLOSED):')
+
+
+class Keyword(NamedTuple):
+    """A '#+KEY: value' line."""
+    line: int
+    key: str
+    value: str
+
+
+class Heading(NamedTuple):
+    """A heading line."""
+    line: int
+    level: int
+    keyword: str    # TODO keyword, or None
+    done: bool      # True if the keyword is a done keyword
+    priority: str   # Priority cookie letter, or None
+    title: str
+    tags: list
+
+
+class Property(NamedTuple):
+    """A line of a property drawer, belonging to the last heading (or the file)."""
+    line: int
+    key: str
+    value: str
+
+
+class Subtask(NamedTuple):
+    """A heading with a TODO keyword and the fields it is scored with."""
+    line: int
+    level: int
+    keyword: str
+    done: bool
+    title: str
+    tags: list
+    fields: dict  # Frontmatter merged with inherited and own properties
+
+
+def parse_todo_keywords(value: str) -> tuple:
+    """
+    Parse the value of a #+TODO: line.
+
+    Args:
+        value: E.g. 'TODO NEXT(n) | DONE(d!) CANCELLED'
+
+    Returns:
+        tuple: (todo keywords, done keywords); without '|', the last keyword
+               is the only done keyword
+    """
+    words = [re.sub(r'\(.*\)$', '', word) for word in value.split()]
+    if '|' in words:
+        bar = words.index('|')
+        return tuple(words[:bar]), tuple(w for w in words[bar + 1:] if w != '|')
+    if len(words) < 2:
+        return tuple(words), ()
+    return tuple(words[:-1]), (words[-1],)
+
+
+def tokenize(lines):
+    """
+    Turn README lines into Keyword, Heading and Property tokens.
+
+    Args:
+        lines: Iterable of lines, e.g. an open file
+
+    Yields:
+        Keyword, Heading and Property tuples in document order
+    """
+    todo = set(DEFAULT_TODO)
+    done = set(DEFAULT_DONE)
+    declared = False        # The first #+TODO: line replaces the defaults
+    block_end = None        # '#+end_<name>' while inside a block
+    in_drawer = False
+    drawer_allowed = True   # A property drawer may follow the heading (or file start)
+
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+
+        if block_end is not None:
+            if stripped.lower().startswith(block_end):
+                block_end = None
+            continue
+
+        if in_drawer:
+            if stripped.upper() == ':END:':
+                in_drawer = False
+            elif stripped.startswith(':'):
+                key, _, value = stripped[1:].partition(':')
+                yield Property(number, key.rstrip('+'), value.strip())
+            continue
+
+        if line.startswith('*'):
+            match = _HEADING.match(line)
+            if match:
+                level = len(match.group(1))
+                text = match.group(2)
+                keyword = None
+                first, _, rest = text.partition(' ')
+                if first in todo or first in done:
+                    keyword, text = first, rest.lstrip()
+                priority = None
+                cookie = _PRIORITY.match(text)
+                if cookie:
+                    priority, text = cookie.group(1), text[cookie.end():]
+                tags = []
+                tag_match = _TAGS.search(text)
+                if tag_match:
+                    tags = [tag for tag in tag_match.group(1).split(':') if tag]
+                    text = text[:tag_match.start()]
+                yield Heading(number, level, keyword, keyword in done, priority,
+                              text.strip(), tags)
+                drawer_allowed = True
+                continue
+
+        if not stripped:
+            continue
+
+        if stripped.startswith('#+'):
+            key, separator, value = stripped[2:].partition(':')
+            lower = key.lower()
+            if lower.startswith('begin_'):
+                name = lower[len('begin_'):].split()
+                block_end = '#+end_' + (name[0] if name else '')
+                drawer_allowed = False
+                continue
+            if separator:
+                key = key.strip()
+                value = value.strip()
+                if key.upper() in TODO_SETTINGS:
+                    new_todo, new_done = parse_todo_keywords(value)
+                    if not declared:
+                        todo, done = set(), set()
+                        declared = True
+                    todo.update(new_todo)
+                    done.update(new_done)
+                yield Keyword(number, key, value)
+            continue
+
+        if drawer_allowed and stripped.upper() == ':PROPERTIES:':
+            in_drawer = True
+            drawer_allowed = False
+            continue
+        if drawer_allowed and _PLANNING.match(stripped):
+            continue  # SCHEDULED/DEADLINE lines may come before the drawer
+        drawer_allowed = False
+
+
+def iter_subtasks(lines, frontmatter: dict = None):
+    """
+    Extract the subtasks of a README in one pass.
+
+    Args:
+        lines: Iterable of README lines, e.g. an open file
+        frontmatter: File-level fields; if None, the '#+KEY: value' lines
+                     before the first heading are used, as extract_frontmatter
+                     would read them
+
+    Yields:
+        Subtask tuples in document order
+    """
+    collect_frontmatter = frontmatter is None
+    base = {} if collect_frontmatter else dict(frontmatter)
+    ancestors = []   # (level, properties) of the current heading's ancestors
+    current = None   # Heading whose properties are being read
+    properties = {}  # Properties of the current heading (or the file)
+
+    def finish():
+        """Record the current heading's properties and build its subtask."""
+        ancestors.append((current.level, properties))
+        if current.keyword is None:
+            return None
+        fields = dict(base)
+        for _, inherited in ancestors:
+            fields.update(inherited)
+        status = current.keyword.lower()
+        if current.done:
+            fields['STATUS'] = 'done'
+        elif status in STATUS_SCORES and 'STATUS' not in properties:
+            fields['STATUS'] = status
+        fields['title'] = current.title
+        return Subtask(current.line, current.level, current.keyword, current.done,
+                       current.title, current.tags, fields)
+
+    for token in tokenize(lines):
+        if isinstance(token, Property):
+            properties[_FIELD_NAMES.get(token.key.upper(), token.key)] = token.value
+        elif isinstance(token, Heading):
+            if current is None:
+                base.update(properties)  # A drawer before the first heading
+            else:
+                subtask = finish()
+                if subtask:
+                    yield subtask
+            while ancestors and ancestors[-1][0] >= token.level:
+                ancestors.pop()
+            current = token
+            properties = {}
+        elif collect_frontmatter and current is None:
+            # Keywords are case-insensitive, as in validate_frontmatter
+            base[_FIELD_NAMES.get(token.key.upper(), token.key)] = token.value
+
+    if current is not None:
+        subtask = finish()
+        if subtask:
+            yield subtask
+
+
+def load_subtasks(file_path: str, include_done: bool = False) -> list:
+    """
+    Read a README's subtasks as project tuples for the project sorter.
+
+    Args:
+        file_path: Path to the README file
+        include_done: Also return subtasks with a done keyword
+
+    Returns:
+        list: (subtask, project) pairs, where project is the tuple
+              (fields, last_completed, recurrence_interval)
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        ValueError: If a subtask has an unknown value of a scored field or
+                    malformed recurrence fields.
+    """
+    subtasks = []
+    with open(file_path) as file:
+        for subtask in iter_subtasks(file):
+            if subtask.done and not include_done:
+                continue
+            try:
+                project = build_project(normalise_fields(subtask.fields))
+            except ValueError as e:
+                raise ValueError(f"line {subtask.line}: {e}") from e
+            subtasks.append((subtask, project))
+    return subtasks
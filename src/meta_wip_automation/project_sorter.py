@@ -59,6 +59,26 @@ URGENCY_SCORES = {
     'ignore': 0
 }
 
+# Frontmatter field scored by each score mapping, and the value assumed when
+# the field is missing
+FIELD_SCORES = {
+    'ACCOUNTABILITY': ACCOUNTABILITY_SCORES,
+    'STATUS': STATUS_SCORES,
+    'TIME_DISTORTION': TIME_DISTORTION_SCORES,
+    'EFFORT': EFFORT_SCORES,
+    'INTEREST': INTEREST_SCORES,
+    'URGENCY': URGENCY_SCORES
+}
+
+FACTOR_DEFAULTS = {
+    'ACCOUNTABILITY': 'off-radar',
+    'STATUS': 'active',
+    'TIME_DISTORTION': 'linear',
+    'EFFORT': 'push',
+    'INTEREST': 'sparking',
+    'URGENCY': 'later'
+}
+
 def get_recurrence_score(last_completed: datetime, recurrence_interval: int) -> int:
     """
     Calculate recurrence score based on last completion time and interval.
@@ -77,6 +97,91 @@ def get_recurrence_score(last_completed: datetime, recurrence_interval: int) ->
         return 2  # Due soon
     return 0  # Recently completed
 
+# Weight applied to each factor score in the priority formula. The order of
+# FACTORS is the column order used wherever factor scores are encoded as rows
+# (see weight_simulation.py).
+FACTORS = (
+    'ACCOUNTABILITY',
+    'STATUS',
+    'TIME_DISTORTION',
+    'EFFORT',
+    'INTEREST',
+    'RECURRENCE',
+    'URGENCY'
+)
+
+PRIORITY_WEIGHTS = {
+    'ACCOUNTABILITY': 5,   # Accountability weight: 5
+    'STATUS': 4,           # Status weight: 4
+    'TIME_DISTORTION': 3,  # Time distortion weight: 3
+    'EFFORT': 3,           # Effort weight: 3
+    'INTEREST': 2,         # Interest weight: 2
+    'RECURRENCE': 2,       # Recurrence weight: 2
+    'URGENCY': 1           # Urgency weight: 1
+}
+
+# Bonus points added when certain combinations of factors occur together
+INTERACTION_BOOSTS = {
+    'STUCK_ACCOUNTABLE': 5,    # Stuck + high accountability
+    'QUICK_WIN': 3,            # Quick win (blink) that is hard to start
+    'AVOIDED_ACCOUNTABLE': 4   # Avoiding + imminent/looming accountability
+}
+
+def get_factor_scores(frontmatter: dict, last_completed: datetime = None,
+                      recurrence_interval: int = None) -> dict:
+    """
+    Map a project's frontmatter onto the numeric score of each factor.
+
+    Args:
+        frontmatter: Dictionary of project frontmatter
+        last_completed: Optional datetime of last completion
+        recurrence_interval: Optional interval for recurring tasks
+
+    Returns:
+        dict: Score for every name in FACTORS (unknown values score 0)
+    """
+    # Get base scores with defaults for missing values
+    scores = {
+        'ACCOUNTABILITY': ACCOUNTABILITY_SCORES.get(
+            frontmatter.get('ACCOUNTABILITY', 'off-radar'), 0),
+        'STATUS': STATUS_SCORES.get(
+            frontmatter.get('STATUS', 'active'), 0),
+        'TIME_DISTORTION': TIME_DISTORTION_SCORES.get(
+            frontmatter.get('TIME_DISTORTION', 'linear'), 0),
+        'EFFORT': EFFORT_SCORES.get(
+            frontmatter.get('EFFORT', 'push'), 0),
+        'INTEREST': INTEREST_SCORES.get(
+            frontmatter.get('INTEREST', 'sparking'), 0),
+        'RECURRENCE': 0,
+        'URGENCY': URGENCY_SCORES.get(
+            frontmatter.get('URGENCY', 'later'), 0)
+    }
+
+    # Calculate recurrence score if applicable
+    if last_completed and recurrence_interval:
+        scores['RECURRENCE'] = get_recurrence_score(last_completed, recurrence_interval)
+
+    return scores
+
+def get_interaction_flags(scores: dict) -> dict:
+    """
+    Determine which interaction boosts apply to a set of factor scores.
+
+    Args:
+        scores: Factor scores as returned by get_factor_scores
+
+    Returns:
+        dict: True/False for every name in INTERACTION_BOOSTS
+    """
+    return {
+        'STUCK_ACCOUNTABLE': (scores['ACCOUNTABILITY'] >= 2 and
+                              scores['STATUS'] == 3),
+        'QUICK_WIN': (scores['TIME_DISTORTION'] == 3 and  # Quick win (blink)
+                      scores['EFFORT'] >= 2),             # Hard to start
+        'AVOIDED_ACCOUNTABLE': (scores['INTEREST'] == 3 and       # Avoiding
+                                scores['ACCOUNTABILITY'] >= 2)    # Imminent/Looming
+    }
+
 def calculate_priority(frontmatter: dict, last_completed: datetime = None,
                      recurrence_interval: int = None) -> float:
     """
@@ -94,60 +199,38 @@ def calculate_priority(frontmatter: dict, last_completed: datetime = None,
     if frontmatter.get('STATUS') == 'done':
         return 0
 
-    # Get base scores with defaults for missing values
-    accountability_score = ACCOUNTABILITY_SCORES.get(
-        frontmatter.get('ACCOUNTABILITY', 'off-radar'), 0)
-    status_score = STATUS_SCORES.get(
-        frontmatter.get('STATUS', 'active'), 0)
-    time_distortion_score = TIME_DISTORTION_SCORES.get(
-        frontmatter.get('TIME_DISTORTION', 'linear'), 0)
-    effort_score = EFFORT_SCORES.get(
-        frontmatter.get('EFFORT', 'push'), 0)
-    interest_score = INTEREST_SCORES.get(
-        frontmatter.get('INTEREST', 'sparking'), 0)
-    urgency_score = URGENCY_SCORES.get(
-        frontmatter.get('URGENCY', 'later'), 0)
-
-    # Calculate recurrence score if applicable
-    recurrence_score = 0
-    if last_completed and recurrence_interval:
-        recurrence_score = get_recurrence_score(last_completed, recurrence_interval)
+    scores = get_factor_scores(frontmatter, last_completed, recurrence_interval)
 
     # Calculate base priority score using correct weights
-    priority_score = (
-        (5 * accountability_score) +    # Accountability weight: 5
-        (4 * status_score) +           # Status weight: 4
-        (3 * time_distortion_score) +  # Time distortion weight: 3
-        (3 * effort_score) +           # Effort weight: 3
-        (2 * interest_score) +         # Interest weight: 2
-        (2 * recurrence_score) +       # Recurrence weight: 2
-        (1 * urgency_score)            # Urgency weight: 1
-    )
+    priority_score = sum(PRIORITY_WEIGHTS[factor] * scores[factor]
+                         for factor in FACTORS)
 
     # Apply interaction effect boosts
-    if accountability_score >= 2 and status_score == 3:  # Stuck + High Accountability
-        priority_score += 5
-
-    if (time_distortion_score == 3 and  # Quick win (blink)
-        effort_score >= 2):             # Hard to start (impossible/resist)
-        priority_score += 3
-
-    if (interest_score == 3 and         # Avoiding
-        accountability_score >= 2):     # Imminent/Looming accountability
-        priority_score += 4
+    for boost, applies in get_interaction_flags(scores).items():
+        if applies:
+            priority_score += INTERACTION_BOOSTS[boost]
 
     return priority_score
 
-def sort_projects(projects: list) -> list:
+def sort_projects(projects: list, scores: list = None) -> list:
     """
     Sort a list of projects based on their priority scores.
 
+    Projects with equal scores keep their input order.
+
     Args:
-        projects: List of tuples (frontmatter, last_completed, recurrence_interval)
+        projects: List of tuples (frontmatter, last_completed, recurrence_interval),
+                  or any items if scores is given
+        scores: Optional priority score of each project, e.g. from a cache;
+                calculated with calculate_priority if not given
 
     Returns:
         list: Sorted projects in descending priority order
     """
+    if scores is not None:
+        order = sorted(range(len(projects)), key=scores.__getitem__, reverse=True)
+        return [projects[i] for i in order]
+
     def get_project_score(project):
         frontmatter, last_completed, recurrence_interval = project
         return calculate_priority(frontmatter, last_completed, recurrence_interval)
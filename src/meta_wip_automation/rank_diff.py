@@ -0,0 +1,234 @@
+"""
+Differences between the current ranking and the previous run's.
+
+The ranking is saved after each diff as parallel arrays of project IDs,
+README paths, titles, scores and factor codes. The factor codes of a project are a short
+string with one digit per factor score and interaction boost (in the column
+order of weight_simulation.COLUMNS), which is enough to say which factor
+caused a change without keeping the frontmatter.
+
+Comparing two rankings is a hash join on README path, which stays unique
+even when two READMEs share a PROJECT_ID: one dictionary built from the
+previous arrays and a single pass over each side, so the diff is
+linear in the number of projects and cheap enough for a shell prompt hook.
+"""
+
+
+import json
+import os
+from datetime import date
+from typing import NamedTuple
+
+from meta_wip_automation.project_sorter import (
+    FACTORS,
+    FIELD_SCORES,
+    INTERACTION_BOOSTS,
+    PRIORITY_WEIGHTS,
+    get_factor_scores,
+    get_interaction_flags,
+    sort_projects
+)
+from meta_wip_automation.sharding import record_project
+from meta_wip_automation.utils import paths_key, write_atomic
+from meta_wip_automation.weight_simulation import BOOSTS, COLUMNS
+
+RANKINGS_DIR = 'rankings'
+
+# Names of the recurrence scores returned by get_recurrence_score
+RECURRENCE_STATES = {0: 'recent', 2: 'due soon', 3: 'overdue'}
+
+ENTERED = 'entered'
+LEFT = 'left'
+MOVED = 'moved'
+SCORE = 'score'
+
+
+class Ranking(NamedTuple):
+    """A ranking as parallel arrays, highest score first."""
+    ids: list
+    paths: list    # README of each project, the key projects are joined on
+    titles: list
+    scores: list
+    factors: list  # One digit string per project, see factor_codes
+    date: str = None
+
+
+class RankChange(NamedTuple):
+    """How one project's place in the ranking changed."""
+    project_id: str
+    path: str
+    title: str
+    old_rank: int     # 1-based, None if the project is new
+    new_rank: int     # 1-based, None if the project is gone
+    old_score: float
+    new_score: float
+    kinds: list       # Any of ENTERED, LEFT, MOVED, SCORE
+    causes: list      # (column, old code, new code) for changed factors
+
+
+def factor_codes(frontmatter: dict, last_completed=None,
+                 recurrence_interval: int = None) -> str:
+    """
+    Encode a project's factor scores and boost flags as a digit string.
+
+    Args:
+        frontmatter: Dictionary of project frontmatter
+        last_completed: Optional datetime of last completion
+        recurrence_interval: Optional interval for recurring tasks
+
+    Returns:
+        str: One digit per name in COLUMNS
+    """
+    scores = get_factor_scores(frontmatter, last_completed, recurrence_interval)
+    flags = get_interaction_flags(scores)
+    return (''.join(str(scores[factor]) for factor in FACTORS) +
+            ''.join('1' if flags[boost] else '0' for boost in BOOSTS))
+
+
+def build_ranking(records: dict) -> Ranking:
+    """
+    Rank projects and encode the result as a Ranking.
+
+    Args:
+        records: README path mapped to the project's cached record (see
+                 sharding.project_record), in input order; the path is also
+                 used as the ID of projects without a PROJECT_ID
+
+    Returns:
+        Ranking: The current ranking
+    """
+    paths = sort_projects(list(records), [record['score'] for record in records.values()])
+    ids, titles, scores, factors = [], [], [], []
+    for path in paths:
+        record = records[path]
+        frontmatter = record['frontmatter']
+        ids.append(frontmatter.get('PROJECT_ID') or path)
+        titles.append(frontmatter.get('title', 'Untitled'))
+        scores.append(record['score'])
+        factors.append(factor_codes(*record_project(record)))
+    return Ranking(ids, paths, titles, scores, factors, date.today().isoformat())
+
+
+def ranking_path(cache_dir: str, paths: list) -> str:
+    """
+    Return the file the ranking of a set of input paths is saved to.
+
+    Args:
+        cache_dir: Cache directory
+        paths: The README files and directories that were ranked
+
+    Returns:
+        str: Path of the saved ranking
+    """
+    return os.path.join(cache_dir, RANKINGS_DIR, f"{paths_key(paths)}.json")
+
+
+def load_ranking(path: str) -> Ranking:
+    """
+    Load a saved ranking.
+
+    Args:
+        path: File written by save_ranking
+
+    Returns:
+        Ranking: The saved ranking, or None if there is none, it is
+                 unreadable or it was saved without README paths
+    """
+    try:
+        with open(path) as file:
+            data = json.load(file)
+        return Ranking(data['ids'], data['paths'], data['titles'], data['scores'],
+                       data['factors'], data.get('date'))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_ranking(path: str, ranking: Ranking) -> None:
+    """
+    Save a ranking.
+
+    Args:
+        path: Destination file
+        ranking: Ranking to save
+    """
+    write_atomic(path, json.dumps(ranking._asdict(), separators=(',', ':')))
+
+
+def diff_rankings(old: Ranking, new: Ranking, top: int = 10, moved: int = 3) -> list:
+    """
+    List the projects whose place in the ranking changed noticeably.
+
+    A project is reported if it entered or left the top N, moved more than
+    the given number of places, or its score changed.
+
+    Args:
+        old: Previous ranking
+        new: Current ranking
+        top: Size of the top of the ranking to watch
+        moved: Report rank changes of more than this many places
+
+    Returns:
+        list: RankChange tuples in current rank order, followed by projects
+              from the previous top N that are no longer ranked at all
+    """
+    old_index = {path: j for j, path in enumerate(old.paths)}
+    changes = []
+    seen = set()
+
+    for i, (project_id, path) in enumerate(zip(new.ids, new.paths)):
+        j = old_index.get(path)
+        if j is None:
+            kinds = [ENTERED] if i < top else []
+            if kinds:
+                changes.append(RankChange(project_id, path, new.titles[i], None, i + 1,
+                                          None, new.scores[i], kinds, []))
+            continue
+        seen.add(j)
+        kinds = []
+        if i < top <= j:
+            kinds.append(ENTERED)
+        elif j < top <= i:
+            kinds.append(LEFT)
+        if abs(i - j) > moved:
+            kinds.append(MOVED)
+        if new.scores[i] != old.scores[j]:
+            kinds.append(SCORE)
+        if kinds:
+            causes = [(column, int(a), int(b)) for column, a, b
+                      in zip(COLUMNS, old.factors[j], new.factors[i]) if a != b]
+            changes.append(RankChange(project_id, path, new.titles[i], j + 1, i + 1,
+                                      old.scores[j], new.scores[i], kinds, causes))
+
+    for j, (project_id, path) in enumerate(zip(old.ids, old.paths)):
+        if j < top and j not in seen:
+            changes.append(RankChange(project_id, path, old.titles[j], j + 1, None,
+                                      old.scores[j], None, [LEFT], []))
+    return changes
+
+
+def describe_cause(column: str, old_code: int, new_code: int) -> str:
+    """
+    Describe a factor change and its effect on the score.
+
+    Args:
+        column: Factor or interaction boost name (from COLUMNS)
+        old_code: Previous factor score or boost flag
+        new_code: Current factor score or boost flag
+
+    Returns:
+        str: E.g. "STATUS active -> stuck (+8)"
+    """
+    if column in INTERACTION_BOOSTS:
+        state = 'on' if new_code else 'off'
+        change = INTERACTION_BOOSTS[column] * (new_code - old_code)
+        return f"{column} boost {state} ({change:+d})"
+
+    if column == 'RECURRENCE':
+        names = RECURRENCE_STATES
+    else:
+        names = {code: value for value, code in FIELD_SCORES[column].items()}
+    transition = f"{column} {names.get(old_code, old_code)} -> {names.get(new_code, new_code)}"
+    if column == 'STATUS' and names.get(new_code) == 'done':
+        return f"{transition} (excluded from prioritization)"
+    change = PRIORITY_WEIGHTS[column] * (new_code - old_code)
+    return f"{transition} ({change:+d})"
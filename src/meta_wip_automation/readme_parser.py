@@ -10,6 +10,8 @@ with a focus on being useful to autistics and/or ADHDers.
 Functions:
     parse_readme(file_path: str) -> str
     extract_frontmatter(content: str) -> dict
+    load_project(file_path: str) -> tuple
+    build_project(frontmatter: dict) -> tuple
 
 Frontmatter Fields and Values:
     The following fields use customized priority levels:
@@ -77,6 +79,12 @@ please refer to the recurrence_guide.md in the docs directory.
 import re
 from collections import defaultdict
 
+from meta_wip_automation.frontmatter_schema import (
+    describe_errors,
+    parse_last_completed,
+    validate_frontmatter
+)
+
 def parse_readme(file_path: str) -> str:
     """
     Parse a README file and return its contents as a string.
@@ -109,17 +117,74 @@ def extract_frontmatter(content: str) -> dict:
 
     Returns:
         dict: A dictionary containing the extracted fields and their values.
+
+    Raises:
+        ValueError: If a '#+KEY' line has no ':' separator.
     """
     frontmatter = defaultdict(str)
     lines = content.strip().split('\n')
     for line in lines:
         line = line.strip() # Remove leading/trailing whitespace
         if line.startswith('#+'): # Locate frontmatter using org-mode properties
-            key, value = line[2:].split(':', 1)
+            key, separator, value = line[2:].partition(':')
+            if not separator:
+                raise ValueError(f"Missing ':' after keyword: {line}")
             frontmatter[key.strip()] = value.strip()
         elif line.startswith('*'): # Stop when we reach the main content
             break
     return dict(frontmatter)
 
 
+def load_project(file_path: str) -> tuple:
+    """
+    Read a README and build the project tuple used by the project sorter.
+
+    The frontmatter is read with the compiled schema, so values are returned
+    in their canonical spelling (e.g. "Off Radar" becomes "off-radar") and
+    score exactly as 'meta-wip validate' reports them.
+
+    Args:
+        file_path (str): The path to the README file.
+
+    Returns:
+        tuple: (frontmatter, last_completed, recurrence_interval), where the
+               recurrence values are None for non-recurring projects.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        ValueError: If the frontmatter does not validate, e.g. it has no
+                    title, an unknown value or malformed recurrence fields.
+    """
+    content = parse_readme(file_path)
+    result = validate_frontmatter(content)
+    if result.errors:
+        raise ValueError(describe_errors(result.errors))
+
+    return build_project(result.frontmatter)
+
+
+def build_project(frontmatter: dict) -> tuple:
+    """
+    Build the project tuple used by the project sorter from frontmatter.
+
+    Args:
+        frontmatter (dict): Frontmatter fields, e.g. from extract_frontmatter.
+
+    Returns:
+        tuple: (frontmatter, last_completed, recurrence_interval), where the
+               recurrence values are None for non-recurring projects.
+
+    Raises:
+        ValueError: If the recurrence fields are malformed.
+    """
+    # Handle recurrence if specified
+    last_completed = None
+    recurrence_interval = None
+    if 'RECURRENCE_INTERVAL' in frontmatter and 'LAST_COMPLETED' in frontmatter:
+        recurrence_interval = int(frontmatter['RECURRENCE_INTERVAL'])
+        last_completed = parse_last_completed(frontmatter['LAST_COMPLETED'])
+
+    return frontmatter, last_completed, recurrence_interval
+
+
 # Additional helper functions can be added here as needed
@@ -0,0 +1,164 @@
+"""
+Forecast of upcoming recurrence due dates.
+
+get_recurrence_score only says whether a recurring project is overdue, due
+soon or recently completed right now. This module projects when each
+recurring project will cross those thresholds, from LAST_COMPLETED and
+RECURRENCE_INTERVAL, and keeps the crossings in a date-bucketed index so
+questions like "what is due this week?" or "what becomes due soon on
+Friday?" are answered by looking up only the matching dates.
+
+Two kinds of event are forecast for each cycle, matching the thresholds in
+get_recurrence_score:
+
+    due-soon : 75% of the interval has passed (recurrence score becomes 2)
+    due      : the full interval has passed (recurrence score becomes 3)
+
+Cycles after the next one are projected on the assumption that the project
+is completed on its due date. A project that is already overdue cannot be
+projected further, so it is listed separately instead.
+"""
+
+
+import math
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import NamedTuple
+
+DUE_SOON = 'due-soon'
+DUE = 'due'
+EVENT_KINDS = (DUE_SOON, DUE)
+
+# Fraction of the interval after which a project is due soon
+DUE_SOON_FRACTION = 0.75
+
+
+class ForecastEvent(NamedTuple):
+    """A recurring project crossing a recurrence threshold on a date."""
+    date: date
+    kind: str
+    project_id: str
+    title: str
+    projected: bool  # True for cycles after the next one
+
+
+class OverdueProject(NamedTuple):
+    """A recurring project already past its due date."""
+    due_date: date
+    project_id: str
+    title: str
+
+
+class ForecastIndex:
+    """
+    Forecast events bucketed by date.
+
+    Lookups of a single date are a dictionary access; range lookups binary
+    search a sorted list of the dates that have events, so both cost time
+    proportional to the number of events returned.
+    """
+
+    def __init__(self, start: date, end: date, events: list, overdue: list):
+        self.start = start
+        self.end = end
+        self.overdue = sorted(overdue)
+        self._buckets = {}
+        for event in sorted(events, key=lambda e: (e.date, EVENT_KINDS.index(e.kind),
+                                                   e.project_id)):
+            self._buckets.setdefault(event.date, []).append(event)
+        self._dates = sorted(self._buckets)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def on(self, day: date, kind: str = None) -> list:
+        """
+        Return the events on one date.
+
+        Args:
+            day: Date to look up
+            kind: Only return events of this kind (DUE_SOON or DUE)
+
+        Returns:
+            list: ForecastEvent tuples
+        """
+        events = self._buckets.get(day, [])
+        return [e for e in events if e.kind == kind] if kind else list(events)
+
+    def between(self, first: date, last: date, kind: str = None) -> list:
+        """
+        Return the events from first to last, inclusive, in date order.
+
+        Args:
+            first: First date of the range
+            last: Last date of the range
+            kind: Only return events of this kind (DUE_SOON or DUE)
+
+        Returns:
+            list: ForecastEvent tuples
+        """
+        lo = bisect_left(self._dates, first)
+        hi = bisect_right(self._dates, last)
+        return [event for day in self._dates[lo:hi] for event in self.on(day, kind)]
+
+
+def cycle_offsets(recurrence_interval: int) -> list:
+    """
+    Days after a completion on which each threshold is crossed.
+
+    Args:
+        recurrence_interval: Number of days between recurrences
+
+    Returns:
+        list: (days, kind) pairs; due-soon is omitted when it falls on the
+              due date itself (very short intervals)
+    """
+    due_soon = math.ceil(recurrence_interval * DUE_SOON_FRACTION)
+    if due_soon >= recurrence_interval:
+        return [(recurrence_interval, DUE)]
+    return [(due_soon, DUE_SOON), (recurrence_interval, DUE)]
+
+
+def build_forecast(projects: list, start: date = None, horizon_days: int = 7) -> ForecastIndex:
+    """
+    Forecast threshold crossings of recurring projects over a horizon.
+
+    Args:
+        projects: List of tuples (frontmatter, last_completed, recurrence_interval);
+                  non-recurring and done projects are ignored
+        start: First day of the forecast (defaults to today)
+        horizon_days: Number of days to forecast, including start
+
+    Returns:
+        ForecastIndex: Events from start to start + horizon_days - 1
+    """
+    start = start or date.today()
+    end = start + timedelta(days=horizon_days - 1)
+    events = []
+    overdue = []
+    for frontmatter, last_completed, recurrence_interval in projects:
+        if not (last_completed and recurrence_interval and recurrence_interval > 0):
+            continue
+        if frontmatter.get('STATUS') == 'done':
+            continue
+        project_id = frontmatter.get('PROJECT_ID', 'No ID')
+        title = frontmatter.get('title', 'Untitled')
+        completed = last_completed.date() if hasattr(last_completed, 'date') else last_completed
+
+        first_due = completed + timedelta(days=recurrence_interval)
+        if first_due < start:
+            overdue.append(OverdueProject(first_due, project_id, title))
+            continue
+
+        offsets = cycle_offsets(recurrence_interval)
+        cycle = 0
+        cycle_start = completed
+        while cycle_start < end:
+            for days, kind in offsets:
+                day = cycle_start + timedelta(days=days)
+                if start <= day <= end:
+                    events.append(ForecastEvent(day, kind, project_id, title, cycle > 0))
+            cycle += 1
+            cycle_start += timedelta(days=recurrence_interval)
+
+    return ForecastIndex(start, end, events, overdue)
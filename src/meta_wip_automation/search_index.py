@@ -0,0 +1,400 @@
+"""
+Fuzzy project search with a trigram index.
+
+Each README's title, PROJECT_ID and TAGS are split into lower-case words,
+and every word into overlapping three-character sequences (trigrams), padded
+so that word starts and ends count too ("wip" -> "  w", " wi", "wip",
+"ip "). The index maps each trigram to the projects containing it, so a
+query only touches the postings of its own trigrams, and a misspelt query
+like "autmate wip" still shares most of its trigrams with "Automate Meta WIP
+Category".
+
+The index is persisted in the cache directory and updated incrementally:
+only READMEs that change_detection reports as added or modified are re-read,
+and their old trigrams are removed from the postings before the new ones are
+added.
+
+The saved file is one line of JSON (the documents, and where the README
+states and the postings of every trigram are stored), followed by the README
+states as JSON and the postings as packed 32-bit document numbers. Loading
+reads only the first line. The states are read by the first update, and the
+postings of a trigram the first time a query or an update needs them, so a
+search reads the postings of its own trigrams and nothing else.
+"""
+
+
+import json
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import NamedTuple
+
+from meta_wip_automation.change_detection import refresh_index
+from meta_wip_automation.frontmatter_schema import (
+    describe_errors,
+    parse_last_completed,
+    validate_frontmatter
+)
+from meta_wip_automation.project_sorter import FIELD_SCORES, calculate_priority
+from meta_wip_automation.readme_parser import parse_readme
+from meta_wip_automation.utils import paths_key, write_atomic
+
+SEARCH_DIR = 'search'
+INDEX_VERSION = 3
+
+# Postings are saved little-endian whatever the platform
+POSTING_TYPE = 'I'
+_POSTING_SIZE = array(POSTING_TYPE).itemsize
+_SWAP_BYTES = sys.byteorder == 'big'
+
+# Per-document attributes, saved as one list each
+DOC_COLUMNS = ('path', 'title', 'project_id', 'tags', 'fields', 'size')
+
+# Frontmatter kept per project so matches can be ordered by priority
+PRIORITY_FIELDS = tuple(FIELD_SCORES) + ('RECURRENCE_INTERVAL', 'LAST_COMPLETED')
+
+# Minimum fraction of the query's trigrams a project must contain
+MIN_COVERAGE = 0.3
+
+
+class SearchHit(NamedTuple):
+    """A project matching a search query."""
+    similarity: float  # Fraction of the query's trigrams found in the project
+    project_id: str
+    title: str
+    path: str
+    priority: float
+
+
+def trigrams(text: str) -> set:
+    """
+    Return the padded trigrams of every word in text.
+
+    Args:
+        text: Text to index or search for
+
+    Returns:
+        set: Three-character strings
+    """
+    grams = set()
+    for word in re.findall(r'[a-z0-9]+', text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def document_priority(fields: dict) -> float:
+    """
+    Calculate the priority of an indexed project from its stored fields.
+
+    Args:
+        fields: The PRIORITY_FIELDS stored for the project, or None if its
+                frontmatter did not validate
+
+    Returns:
+        float: Priority score, or 0 if the frontmatter did not validate
+    """
+    if fields is None:
+        return 0
+    last_completed = None
+    recurrence_interval = None
+    if 'RECURRENCE_INTERVAL' in fields and 'LAST_COMPLETED' in fields:
+        recurrence_interval = int(fields['RECURRENCE_INTERVAL'])
+        last_completed = parse_last_completed(fields['LAST_COMPLETED'])
+    return calculate_priority(fields, last_completed, recurrence_interval)
+
+
+class SearchIndex:
+    """
+    Trigram index over project titles, IDs and tags.
+
+    Documents are numbered and kept as columns, one list per attribute,
+    which load several times faster than one dictionary per document;
+    postings map each trigram to the set of document numbers containing it.
+    Numbers of removed documents are reused. Postings and README states of a
+    loaded index stay in its file until they are needed.
+    """
+
+    def __init__(self):
+        self.paths = []        # Document number -> README path, or None if free
+        self.titles = []
+        self.project_ids = []
+        self.tags = []
+        self.fields = []       # PRIORITY_FIELDS of each document, None if invalid
+        self.sizes = []        # Number of trigrams of each document
+        self.free = []         # Document numbers available for reuse
+        self.numbers = {}      # README path -> document number
+        self.postings = {}     # Trigram -> set of document numbers, once read
+        self._states = {}      # Input path -> README states from change_detection
+        self._file = None      # File the unread postings and states are in
+        self._stored = {}      # Trigram -> (file offset, count) of unread postings
+        self._stored_states = None  # (file offset, length) of unread states
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        """
+        Load a saved index, or return an empty one if there is none.
+
+        Args:
+            path: File written by save
+
+        Returns:
+            SearchIndex: The loaded index
+        """
+        index = cls()
+        try:
+            with open(path, 'rb') as file:
+                header = file.readline()
+            data = json.loads(header)
+        except (OSError, ValueError):
+            return index
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return index
+        (index.paths, index.titles, index.project_ids, index.tags, index.fields,
+         index.sizes) = (data['columns'][column] for column in DOC_COLUMNS)
+        index.numbers = {path: n for n, path in enumerate(index.paths) if path is not None}
+        index.free = [n for n, path in enumerate(index.paths) if path is None]
+        start = len(header)
+        index._file = path
+        index._stored = {gram: (start + offset, count)
+                         for gram, (offset, count) in data['postings'].items()}
+        offset, length = data['states']
+        index._stored_states = (start + offset, length)
+        return index
+
+    @property
+    def states(self) -> dict:
+        """README states of the last update, per input path."""
+        if self._stored_states is not None:
+            offset, length = self._stored_states
+            with open(self._file, 'rb') as file:
+                file.seek(offset)
+                self._states = json.loads(file.read(length))
+            self._stored_states = None
+        return self._states
+
+    def _saved_postings(self, grams) -> dict:
+        """Read the unread postings of the given trigrams as arrays."""
+        wanted = sorted((self._stored[gram], gram) for gram in grams if gram in self._stored)
+        postings = {}
+        if not wanted:
+            return postings
+        with open(self._file, 'rb') as file:
+            for (offset, count), gram in wanted:
+                file.seek(offset)
+                numbers = array(POSTING_TYPE)
+                numbers.frombytes(file.read(count * _POSTING_SIZE))
+                if _SWAP_BYTES:
+                    numbers.byteswap()
+                postings[gram] = numbers
+        return postings
+
+    def _read_postings(self, grams) -> None:
+        """
+        Read the saved postings of the given trigrams into self.postings.
+
+        Args:
+            grams: Trigrams whose postings are about to change
+        """
+        if not self._stored:
+            return
+        for gram, numbers in self._saved_postings(grams).items():
+            del self._stored[gram]
+            self.postings[gram] = set(numbers)
+
+    def save(self, path: str) -> None:
+        """
+        Save the index.
+
+        Args:
+            path: Destination file
+        """
+        # Postings and states that were never read are copied over as they are
+        body = bytearray()
+        stored = {}
+        states = None
+        if self._stored or self._stored_states is not None:
+            with open(self._file, 'rb') as file:
+                for gram, (offset, count) in self._stored.items():
+                    file.seek(offset)
+                    stored[gram] = (len(body), count)
+                    body += file.read(count * _POSTING_SIZE)
+                if self._stored_states is not None:
+                    offset, length = self._stored_states
+                    file.seek(offset)
+                    states = file.read(length)
+        for gram, numbers in self.postings.items():
+            numbers = array(POSTING_TYPE, sorted(numbers))
+            if _SWAP_BYTES:
+                numbers.byteswap()
+            stored[gram] = (len(body), len(numbers))
+            body += numbers.tobytes()
+        if states is None:
+            states = json.dumps(self._states, separators=(',', ':')).encode()
+        states_at = (len(body), len(states))
+        body += states
+
+        columns = dict(zip(DOC_COLUMNS, (self.paths, self.titles, self.project_ids,
+                                         self.tags, self.fields, self.sizes)))
+        header = json.dumps({'version': INDEX_VERSION, 'columns': columns,
+                             'states': states_at, 'postings': stored},
+                            separators=(',', ':')).encode() + b'\n'
+
+        write_atomic(path, header + body)
+        self._file = path
+        self._stored = {gram: (len(header) + offset, count)
+                        for gram, (offset, count) in stored.items()
+                        if gram not in self.postings}
+        if self._stored_states is not None:
+            self._stored_states = (len(header) + states_at[0], states_at[1])
+
+    def _trigrams(self, number: int) -> set:
+        """Trigrams of a document's title, PROJECT_ID and tags."""
+        return trigrams(f"{self.titles[number]} {self.project_ids[number]} "
+                        f"{self.tags[number]}")
+
+    def remove(self, path: str) -> None:
+        """
+        Remove a README from the index.
+
+        Args:
+            path: README path
+        """
+        number = self.numbers.pop(path, None)
+        if number is None:
+            return
+        grams = self._trigrams(number)
+        self._read_postings(grams)
+        for gram in grams:
+            numbers = self.postings.get(gram)
+            if numbers is not None:
+                numbers.discard(number)
+                if not numbers:
+                    del self.postings[gram]
+        for column in (self.paths, self.titles, self.project_ids, self.tags,
+                       self.fields, self.sizes):
+            column[number] = None
+        self.free.append(number)
+
+    def add(self, path: str, frontmatter: dict, valid: bool = True) -> None:
+        """
+        Add or replace a README in the index.
+
+        Args:
+            path: README path
+            frontmatter: The README's frontmatter
+            valid: False if the frontmatter did not validate; the README can
+                   still be found, but has priority 0
+        """
+        self.remove(path)
+        if self.free:
+            number = self.free.pop()
+        else:
+            number = len(self.paths)
+            for column in (self.paths, self.titles, self.project_ids, self.tags,
+                           self.fields, self.sizes):
+                column.append(None)
+        self.paths[number] = path
+        self.titles[number] = frontmatter.get('title', 'Untitled')
+        self.project_ids[number] = frontmatter.get('PROJECT_ID', '')
+        self.tags[number] = frontmatter.get('TAGS', '')
+        self.fields[number] = ({f: frontmatter[f] for f in PRIORITY_FIELDS if f in frontmatter}
+                               if valid else None)
+        grams = self._trigrams(number)
+        self.sizes[number] = len(grams)
+        self.numbers[path] = number
+        self._read_postings(grams)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(number)
+
+    def update(self, paths: list) -> tuple:
+        """
+        Bring the index up to date with the READMEs under the given paths.
+
+        Only READMEs that change_detection reports as added or modified are
+        read again.
+
+        Args:
+            paths: README files and/or directories
+
+        Returns:
+            tuple: (updated, removed, failures) where failures is a list of
+                   (path, phase, exception) for READMEs that could not be read
+        """
+        def load(path):
+            # Invalid frontmatter is reported, but the project stays findable
+            result = validate_frontmatter(parse_readme(path))
+            self.add(path, result.frontmatter, not result.errors)
+            if result.errors:
+                return ValueError(describe_errors(result.errors))
+            return None
+
+        updated, removed, failures, self._states = refresh_index(
+            paths, self.states, load, self.remove, self.numbers)
+        return updated, removed, failures
+
+    def search(self, query: str, limit: int = 10, by_priority: bool = False) -> list:
+        """
+        Find the projects that best match a query.
+
+        Args:
+            query: Words to look for in titles, IDs and tags
+            limit: Maximum number of hits
+            by_priority: Order matches by priority score instead of similarity
+
+        Returns:
+            list: SearchHit tuples, best first
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        # Saved postings are counted straight from the file's arrays
+        saved = self._saved_postings(grams)
+        shared = Counter()
+        for gram in grams:
+            shared.update(saved.get(gram) or self.postings.get(gram, ()))
+
+        candidates = []
+        sizes = self.sizes
+        for number, count in shared.items():
+            coverage = count / len(grams)
+            if coverage < MIN_COVERAGE:
+                continue
+            # Prefer shorter documents among equally good matches
+            jaccard = count / (len(grams) + sizes[number] - count)
+            candidates.append((coverage, jaccard, number))
+
+        if by_priority:
+            hits = [(document_priority(self.fields[number]), coverage, jaccard, number)
+                    for coverage, jaccard, number in candidates]
+            hits.sort(key=lambda hit: hit[:3], reverse=True)
+            return [self._hit(number, coverage, priority)
+                    for priority, coverage, _, number in hits[:limit]]
+
+        candidates.sort(key=lambda hit: hit[:2], reverse=True)
+        return [self._hit(number, coverage, document_priority(self.fields[number]))
+                for coverage, _, number in candidates[:limit]]
+
+    def _hit(self, number: int, coverage: float, priority: float) -> SearchHit:
+        """Build the SearchHit of a document."""
+        return SearchHit(coverage, self.project_ids[number], self.titles[number],
+                         self.paths[number], priority)
+
+
+def index_path(cache_dir: str, paths: list) -> str:
+    """
+    Return the file the search index of a set of input paths is saved to.
+
+    Args:
+        cache_dir: Cache directory
+        paths: The README files and directories that are indexed
+
+    Returns:
+        str: Path of the saved index
+    """
+    return os.path.join(cache_dir, SEARCH_DIR, f"{paths_key(paths)}.json")
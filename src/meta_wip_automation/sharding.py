@@ -0,0 +1,289 @@
+"""
+Ranking across several independent README trees.
+
+Each configured root (e.g. SYS.02, WRK.01, HOME.03) is a shard that is
+indexed and ranked on its own, in parallel when several shards need work.
+The global top N is a heap-based k-way merge of the per-shard rankings, so
+it only looks at as many entries as it returns.
+
+Each shard's READMEs are cached with their parsed frontmatter and score.
+On the next run change_detection finds the READMEs that were added,
+modified or deleted (from the git index when the root is in a git working
+tree, otherwise from a stat scan), and only those are parsed and scored
+again. When nothing changed, the cached ranking is reused as it is, so one
+busy category does not force the others to be re-scored. Recurrence scores
+depend on the current date, so recurring projects are also re-scored on
+the first run of each day. 'meta-wip index' and 'meta-wip --sort --diff'
+read their projects from the same cached records.
+
+Roots can be listed in a TOML file:
+
+    [roots]
+    "SYS.02" = "~/projects/SYS.02"
+    "WRK.01" = "~/work/WRK.01"
+"""
+
+
+import hashlib
+import heapq
+import json
+import os
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import NamedTuple
+
+from meta_wip_automation.change_detection import detect_changes
+from meta_wip_automation.frontmatter_schema import parse_last_completed
+from meta_wip_automation.project_sorter import calculate_priority, sort_projects
+from meta_wip_automation.readme_parser import load_project
+from meta_wip_automation.utils import write_atomic
+
+SHARDS_DIR = 'shards'
+CACHE_VERSION = 3
+
+
+class RankedEntry(NamedTuple):
+    """One project in a shard ranking."""
+    score: float
+    project_id: str
+    title: str
+    path: str
+    shard: str
+
+
+class ShardResult(NamedTuple):
+    """Ranking of one shard and how it was obtained."""
+    entries: list   # RankedEntry, highest score first
+    reused: bool    # True if the cached ranking was used unchanged
+    failures: list  # (path, phase, exception) for files that could not be loaded
+    parsed: list    # README paths that were (re-)parsed this run
+
+
+def load_roots(config_path: str) -> dict:
+    """
+    Read the shard roots from a TOML config file.
+
+    Args:
+        config_path: Path to a TOML file with a [roots] table
+
+    Returns:
+        dict: Shard name mapped to its (user-expanded) root directory
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid TOML or has no [roots] table.
+    """
+    with open(config_path, 'rb') as file:
+        try:
+            data = tomllib.load(file)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid config file {config_path}: {e}") from e
+    roots = data.get('roots')
+    if not isinstance(roots, dict) or not roots:
+        raise ValueError(f"No [roots] table in {config_path}")
+    return {name: os.path.expanduser(path) for name, path in roots.items()}
+
+
+def parse_root_spec(spec: str) -> tuple:
+    """
+    Parse a NAME=PATH root argument; a bare PATH is named after its directory.
+
+    Args:
+        spec: Root specification from the command line
+
+    Returns:
+        tuple: (name, path)
+    """
+    name, sep, path = spec.partition('=')
+    if not sep:
+        path = spec
+        name = os.path.basename(os.path.normpath(spec))
+    return name, os.path.expanduser(path)
+
+
+def shard_cache_path(cache_dir: str, name: str, root: str) -> str:
+    """
+    Return the cache file of a shard.
+
+    Args:
+        cache_dir: Cache directory
+        name: Shard name
+        root: Shard root directory
+
+    Returns:
+        str: Path of the shard's cached README records
+    """
+    root_hash = hashlib.sha256(os.path.abspath(root).encode()).hexdigest()[:12]
+    safe_name = ''.join(c if c.isalnum() or c in '.-_' else '_' for c in name)
+    return os.path.join(cache_dir, SHARDS_DIR, f"{safe_name}-{root_hash}.json")
+
+
+def _load_cached(cache_path: str) -> dict:
+    """Return the cached shard, or an empty one if there is none."""
+    try:
+        with open(cache_path) as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return {'files': {}}
+    if cached.get('version') != CACHE_VERSION:
+        return {'files': {}}
+    return cached
+
+
+def _save_cached(cache_path: str, cached: dict) -> None:
+    """Write a shard to the cache."""
+    # json.dumps rather than json.dump: only the one-shot encoder is in C,
+    # which makes saving a large shard many times faster
+    write_atomic(cache_path, json.dumps(cached, separators=(',', ':')))
+
+
+def project_record(frontmatter: dict, last_completed=None,
+                   recurrence_interval: int = None) -> dict:
+    """
+    Build the cached record of a project, including its score.
+
+    Args:
+        frontmatter: Dictionary of project frontmatter
+        last_completed: Optional datetime of last completion
+        recurrence_interval: Optional interval for recurring tasks
+
+    Returns:
+        dict: A record as kept by update_records (without its file state)
+    """
+    return {
+        'frontmatter': frontmatter,
+        'last_completed': last_completed and last_completed.strftime('%Y-%m-%d'),
+        'recurrence_interval': recurrence_interval,
+        'score': calculate_priority(frontmatter, last_completed, recurrence_interval)
+    }
+
+
+def record_project(record: dict) -> tuple:
+    """
+    Rebuild a project tuple from a cached README record.
+
+    Args:
+        record: A record returned by update_records
+
+    Returns:
+        tuple: (frontmatter, last_completed, recurrence_interval)
+    """
+    last_completed = record['last_completed']
+    if last_completed is not None:
+        last_completed = parse_last_completed(last_completed)
+    return record['frontmatter'], last_completed, record['recurrence_interval']
+
+
+def update_records(root: str, cache_path: str) -> tuple:
+    """
+    Bring the cached README records of a root up to date.
+
+    Only READMEs reported as added or modified by detect_changes are parsed
+    and scored; on a new day, recurring projects are re-scored as well.
+
+    Args:
+        root: Root directory
+        cache_path: Cache file of the root
+
+    Returns:
+        tuple: (files, changed, failures, parsed) where files maps each
+               loaded README path to its record (see project_record), changed is False if the cache was used as it is,
+               and failures lists (path, phase, exception) for READMEs that
+               could not be loaded
+    """
+    cached = _load_cached(cache_path)
+    files = cached['files']
+    today = date.today().isoformat()
+    changes = detect_changes(root, {path: record['state'] for path, record in files.items()})
+    parsed = changes.added + changes.modified
+    new_day = cached.get('date') != today
+
+    for path in changes.deleted:
+        del files[path]
+    failures = []
+    for path in parsed:
+        files.pop(path, None)
+        try:
+            project = load_project(path)
+        except OSError as e:
+            failures.append((path, 'read', e))
+            continue
+        except Exception as e:
+            failures.append((path, 'parse', e))
+            continue
+        files[path] = project_record(*project)
+    if new_day:
+        for record in files.values():
+            if record['recurrence_interval'] is not None:
+                record['score'] = calculate_priority(*record_project(record))
+    for path, record in files.items():
+        record['state'] = changes.states[path]
+
+    changed = bool(parsed or changes.deleted or new_day)
+    if changed:
+        # Files that failed are left out, so they are parsed (and reported) again next run
+        _save_cached(cache_path, {'version': CACHE_VERSION, 'date': today,
+                                  'source': changes.source, 'files': files})
+    return files, changed, failures, parsed
+
+
+def update_shard(name: str, root: str, cache_path: str) -> ShardResult:
+    """
+    Bring a shard's cached ranking up to date.
+
+    Args:
+        name: Shard name
+        root: Shard root directory
+        cache_path: Cache file of the shard
+
+    Returns:
+        ShardResult: The shard's ranking
+    """
+    files, changed, failures, parsed = update_records(root, cache_path)
+    # Paths are sorted so that equal scores always rank in the same order
+    entries = [RankedEntry(files[path]['score'],
+                           files[path]['frontmatter'].get('PROJECT_ID', 'No ID'),
+                           files[path]['frontmatter'].get('title', 'Untitled'),
+                           path, name)
+               for path in sorted(files)]
+    entries = sort_projects(entries, [entry.score for entry in entries])
+    return ShardResult(entries, not changed, failures, parsed)
+
+
+def rank_shards(roots: dict, cache_dir: str, workers: int = None) -> dict:
+    """
+    Rank every shard, re-parsing only READMEs that changed since the last run.
+
+    Args:
+        roots: Shard name mapped to root directory
+        cache_dir: Directory for cached shard rankings
+        workers: Maximum worker processes for updating shards; 1 updates
+                 them in this process
+
+    Returns:
+        dict: Shard name mapped to ShardResult, in the order of roots
+    """
+    jobs = {name: (name, root, shard_cache_path(cache_dir, name, root))
+            for name, root in roots.items()}
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(update_shard, *job) for name, job in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+    return {name: update_shard(*job) for name, job in jobs.items()}
+
+
+def merge_rankings(rankings: list, top: int = None) -> list:
+    """
+    Merge per-shard rankings into a single ranking with a k-way heap merge.
+
+    Args:
+        rankings: Lists of RankedEntry, each sorted by descending score
+        top: Number of entries to return; all entries if None
+
+    Returns:
+        list: The highest-scoring entries across all shards
+    """
+    merged = heapq.merge(*rankings, key=lambda entry: entry.score, reverse=True)
+    return list(islice(merged, top))
@@ -0,0 +1,442 @@
+"""
+Similarity of projects from their README bodies and tags.
+
+Each README is turned into a sparse TF-IDF vector: the words of its body
+(everything except the '#+KEY:' lines) and its TAGS, weighted by how often
+they occur in the README and how rare they are across all READMEs. Two
+projects are similar when their vectors point the same way (cosine
+similarity), which groups projects working in the same area even when their
+frontmatter differs.
+
+Vectors are plain dictionaries of term -> weight. Only the MAX_TERMS most
+frequent terms of each README are kept, so memory grows linearly with the
+number of READMEs however long they are. An inverted index from terms to
+READMEs limits each nearest-neighbour query to projects sharing at least
+one term; clusters are the connected groups of projects whose similarity
+reaches a threshold, and context_batches splits projects into groups of
+related ones, e.g. to give an LLM a few related projects at a time.
+
+The index is persisted in the cache directory and updated incrementally
+with change_detection, so only added or modified READMEs are read again.
+Everything runs locally; there is nothing to download.
+"""
+
+
+import json
+import math
+import os
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+from typing import NamedTuple
+
+from meta_wip_automation.change_detection import refresh_index
+from meta_wip_automation.readme_parser import extract_frontmatter, parse_readme
+from meta_wip_automation.utils import paths_key, write_atomic
+
+SIMILARITY_DIR = 'similarity'
+INDEX_VERSION = 1
+
+# Terms kept per README; bounds the size of the index
+MAX_TERMS = 100
+
+# A tag counts as this many occurrences of a word
+TAG_WEIGHT = 3
+
+# Terms in more than SHORT_POSTINGS READMEs and more than MAX_DF of all
+# READMEs are ignored: they say little about which projects are related and
+# following their postings would make every query touch most of the index
+SHORT_POSTINGS = 50
+MAX_DF = 0.5
+
+STOPWORDS = frozenset("""
+    about after all also and any are because been before being both but can
+    could did does each etc for from had has have how into its more most not
+    only other our over per should some such than that the their them then
+    there these they this those under use used using very via was were what
+    when where which while who why will with would you your
+""".split())
+
+
+class Neighbour(NamedTuple):
+    """A project similar to another."""
+    similarity: float  # Cosine similarity, from 0 to 1
+    path: str
+    project_id: str
+    title: str
+    shared: list       # Terms contributing most to the similarity
+
+
+def readme_terms(content: str, tags: str = '', max_terms: int = MAX_TERMS) -> dict:
+    """
+    Count the terms of a README's body and tags.
+
+    Tags are kept whole and prefixed with 'tag:' so they never collide with
+    body words.
+
+    Args:
+        content: The content of the README file
+        tags: The README's comma-separated TAGS
+        max_terms: Number of most frequent terms to keep
+
+    Returns:
+        dict: Term -> count, for at most max_terms terms
+    """
+    counts = Counter()
+    body = []
+    for line in content.splitlines():
+        if not line.lstrip().startswith('#+'):
+            body.append(line)
+    counts.update(word for word in re.findall(r'[a-z][a-z0-9_]+', '\n'.join(body).lower())
+                  if len(word) > 2 and word not in STOPWORDS)
+
+    for tag in tags.split(','):
+        tag = '_'.join(tag.lower().split())
+        if tag:
+            counts[f'tag:{tag}'] += TAG_WEIGHT
+    # Ties are broken alphabetically so the kept terms do not depend on word order
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:max_terms])
+
+
+class SimilarityIndex:
+    """
+    TF-IDF vectors of READMEs with an inverted index for similarity queries.
+
+    Documents are numbered; postings map each term to the set of document
+    numbers containing it. Numbers of removed documents are reused.
+    """
+
+    def __init__(self):
+        self.docs = []        # Document number -> dict, or None if free
+        self.free = []        # Document numbers available for reuse
+        self.numbers = {}     # README path -> document number
+        self.postings = {}    # Term -> set of document numbers
+        self.states = {}      # Input path -> README states from change_detection
+        self._vectors = None  # Document number -> normalised vector, while valid
+        self._weighted = None  # Term -> [(document number, weight)], while valid
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarityIndex':
+        """
+        Load a saved index, or return an empty one if there is none.
+
+        Args:
+            path: File written by save
+
+        Returns:
+            SimilarityIndex: The loaded index
+        """
+        index = cls()
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') != INDEX_VERSION:
+            return index
+        index.docs = data['docs']
+        index.states = data['states']
+        for number, doc in enumerate(index.docs):
+            if doc is None:
+                index.free.append(number)
+                continue
+            index.numbers[doc['path']] = number
+            for term in doc['terms']:
+                index.postings.setdefault(term, set()).add(number)
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Save the index.
+
+        Postings are not saved; load rebuilds them from the documents.
+
+        Args:
+            path: Destination file
+        """
+        write_atomic(path, json.dumps({'version': INDEX_VERSION, 'docs': self.docs,
+                                       'states': self.states}, separators=(',', ':')))
+
+    def remove(self, path: str) -> None:
+        """
+        Remove a README from the index.
+
+        Args:
+            path: README path
+        """
+        number = self.numbers.pop(path, None)
+        if number is None:
+            return
+        for term in self.docs[number]['terms']:
+            numbers = self.postings[term]
+            numbers.discard(number)
+            if not numbers:
+                del self.postings[term]
+        self.docs[number] = None
+        self.free.append(number)
+        self._vectors = None
+
+    def add(self, path: str, content: str) -> None:
+        """
+        Add or replace a README in the index.
+
+        Args:
+            path: README path
+            content: The content of the README file
+
+        Raises:
+            ValueError: If a '#+' line has no ':' separator.
+        """
+        frontmatter = extract_frontmatter(content)
+        terms = readme_terms(content, frontmatter.get('TAGS', ''))
+        self.remove(path)
+        doc = {
+            'path': path,
+            'title': frontmatter.get('title', 'Untitled'),
+            'project_id': frontmatter.get('PROJECT_ID', ''),
+            'terms': terms
+        }
+        if self.free:
+            number = self.free.pop()
+            self.docs[number] = doc
+        else:
+            number = len(self.docs)
+            self.docs.append(doc)
+        self.numbers[path] = number
+        for term in terms:
+            self.postings.setdefault(term, set()).add(number)
+        self._vectors = None
+
+    def update(self, paths: list) -> tuple:
+        """
+        Bring the index up to date with the READMEs under the given paths.
+
+        Only READMEs that change_detection reports as added or modified are
+        read again.
+
+        Args:
+            paths: README files and/or directories
+
+        Returns:
+            tuple: (updated, removed, failures) where failures is a list of
+                   (path, phase, exception) for READMEs that could not be read
+        """
+        updated, removed, failures, self.states = refresh_index(
+            paths, self.states, lambda path: self.add(path, parse_readme(path)),
+            self.remove, self.numbers)
+        return updated, removed, failures
+
+    def find(self, project: str) -> str:
+        """
+        Look up a project by PROJECT_ID (ignoring case) or README path.
+
+        Args:
+            project: PROJECT_ID or README path
+
+        Returns:
+            str: Path of the project's README, or None if it is not indexed
+        """
+        if project in self.numbers:
+            return project
+        wanted = os.path.abspath(project)
+        for path in self.numbers:
+            if os.path.abspath(path) == wanted:
+                return path
+        for path, number in self.numbers.items():
+            if self.docs[number]['project_id'].lower() == project.lower():
+                return path
+        return None
+
+    def _weights(self) -> tuple:
+        """
+        Return the normalised vectors and weighted postings of all documents.
+
+        Both are computed together on first use after a change, since every
+        weight depends on the number of documents containing its term.
+
+        Returns:
+            tuple: (document number -> {term: weight},
+                    term -> [(document number, weight)] sorted by number)
+        """
+        if self._vectors is None:
+            total = len(self.numbers)
+            limit = max(SHORT_POSTINGS, MAX_DF * total)
+            idf = {term: math.log((1 + total) / (1 + len(numbers))) + 1
+                   for term, numbers in self.postings.items() if len(numbers) <= limit}
+            vectors = {}
+            weighted = {term: [] for term in idf}
+            for number in sorted(self.numbers.values()):
+                vector = {term: (1 + math.log(count)) * idf[term]
+                          for term, count in self.docs[number]['terms'].items() if term in idf}
+                norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+                for term in vector:
+                    vector[term] /= norm
+                    weighted[term].append((number, vector[term]))
+                vectors[number] = vector
+            self._vectors = vectors
+            self._weighted = weighted
+        return self._vectors, self._weighted
+
+    def _similarities(self, number: int, min_similarity: float, later_only: bool = False) -> list:
+        """
+        Return (similarity, document number) of other documents at or above a threshold.
+
+        With later_only, only documents with a higher number are compared, so
+        that a pass over all documents sees each pair once.
+        """
+        vectors, weighted = self._weights()
+        # Dot products are accumulated along the postings of the document's
+        # terms, so documents sharing no term are never looked at
+        totals = {}
+        get = totals.get
+        for term, w in vectors[number].items():
+            postings = weighted[term]
+            start = bisect_right(postings, number, key=itemgetter(0)) if later_only else 0
+            for other, other_w in islice(postings, start, None):
+                totals[other] = get(other, 0.0) + w * other_w
+        totals.pop(number, None)
+        return [(similarity, other) for other, similarity in totals.items()
+                if similarity >= min_similarity]
+
+    def neighbours(self, path: str, k: int = 5, min_similarity: float = 0.0) -> list:
+        """
+        Find the projects most similar to an indexed README.
+
+        Args:
+            path: README path
+            k: Maximum number of neighbours
+            min_similarity: Leave out projects less similar than this
+
+        Returns:
+            list: Neighbour tuples, most similar first
+
+        Raises:
+            KeyError: If the README is not indexed.
+        """
+        number = self.numbers[path]
+        vectors, _ = self._weights()
+        vector = vectors[number]
+        scored = self._similarities(number, max(min_similarity, 1e-9))
+        scored.sort(key=lambda item: (-item[0], self.docs[item[1]]['path']))
+        neighbours = []
+        for similarity, other in scored[:k]:
+            doc = self.docs[other]
+            other_vector = vectors[other]
+            contributions = sorted(((w * other_vector[term], term) for term, w in vector.items()
+                                    if term in other_vector), reverse=True)
+            neighbours.append(Neighbour(round(similarity, 4), doc['path'], doc['project_id'],
+                                        doc['title'], [term for _, term in contributions[:5]]))
+        return neighbours
+
+    def clusters(self, threshold: float = 0.3) -> list:
+        """
+        Group projects whose similarity reaches a threshold.
+
+        Projects are linked when their similarity is at least the threshold,
+        and a cluster is a connected group of linked projects (found with a
+        union-find), so two projects can share a cluster through a third.
+
+        Args:
+            threshold: Minimum cosine similarity of linked projects
+
+        Returns:
+            list: Clusters of two or more README paths, largest first; paths
+                  in each cluster are sorted
+        """
+        parent = {number: number for number in self.numbers.values()}
+
+        def root(number):
+            while parent[number] != number:
+                parent[number] = parent[parent[number]]
+                number = parent[number]
+            return number
+
+        for number in self.numbers.values():
+            for _, other in self._similarities(number, threshold, later_only=True):
+                a, b = root(number), root(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        groups = {}
+        for path, number in self.numbers.items():
+            groups.setdefault(root(number), []).append(path)
+        clusters = [sorted(group) for group in groups.values() if len(group) > 1]
+        clusters.sort(key=lambda group: (-len(group), group[0]))
+        return clusters
+
+    def common_terms(self, paths: list, limit: int = 5) -> list:
+        """
+        Return the terms with the most weight across a group of READMEs.
+
+        Args:
+            paths: Indexed README paths
+            limit: Maximum number of terms
+
+        Returns:
+            list: Terms, heaviest first
+        """
+        vectors, _ = self._weights()
+        totals = Counter()
+        for path in paths:
+            totals.update(vectors[self.numbers[path]])
+        return [term for term, _ in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+                [:limit]]
+
+
+def context_batches(index: SimilarityIndex, paths: list, batch_size: int = 5) -> list:
+    """
+    Split projects into batches of related projects.
+
+    Projects are taken in the given order (e.g. priority order); each batch
+    starts with the first project not yet batched and is filled with its most
+    similar unbatched neighbours. Projects without similar ones fill up the
+    last batches in order.
+
+    Args:
+        index: Index containing the READMEs
+        paths: README paths to batch, in order of importance
+        batch_size: Maximum number of projects per batch
+
+    Returns:
+        list: Lists of README paths; every indexed path appears exactly once
+    """
+    wanted = [path for path in paths if path in index.numbers]
+    remaining = set(wanted)
+    batches = []
+    loners = []
+    for path in wanted:
+        if path not in remaining:
+            continue
+        remaining.discard(path)
+        batch = [path]
+        for neighbour in index.neighbours(path, k=len(index)):
+            if len(batch) == batch_size:
+                break
+            if neighbour.path in remaining:
+                remaining.discard(neighbour.path)
+                batch.append(neighbour.path)
+        if len(batch) > 1:
+            batches.append(batch)
+        else:
+            loners.append(path)
+    batches.extend(loners[i:i + batch_size] for i in range(0, len(loners), batch_size))
+    return batches
+
+
+def index_path(cache_dir: str, paths: list) -> str:
+    """
+    Return the file the similarity index of a set of input paths is saved to.
+
+    Args:
+        cache_dir: Cache directory
+        paths: The README files and directories that are indexed
+
+    Returns:
+        str: Path of the saved index
+    """
+    return os.path.join(cache_dir, SIMILARITY_DIR, f"{paths_key(paths)}.json")
@@ -0,0 +1,149 @@
+"""
+Shared helpers for the Meta WIP automation modules.
+"""
+
+
+import hashlib
+import os
+
+# Project READMEs are named README.org or <PROJECT_ID>-README.org
+README_SUFFIX = 'README.org'
+
+# Written by 'meta-wip index' into the capture directory: the READMEs there
+# are generated output and copies, not projects
+GENERATED_MARKER = '.meta-wip-generated'
+
+
+def get_cache_dir() -> str:
+    """
+    Return the directory for caches that can be rebuilt at any time.
+
+    Uses $META_WIP_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/meta-wip
+    (defaulting to ~/.cache/meta-wip).
+
+    Returns:
+        str: Path to the cache directory (not created here)
+    """
+    if os.environ.get('META_WIP_CACHE_DIR'):
+        return os.environ['META_WIP_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'meta-wip')
+
+
+def get_data_dir() -> str:
+    """
+    Return the directory for persistent data such as backups.
+
+    Uses $META_WIP_DATA_DIR if set, otherwise $XDG_DATA_HOME/meta-wip
+    (defaulting to ~/.local/share/meta-wip).
+
+    Returns:
+        str: Path to the data directory (not created here)
+    """
+    if os.environ.get('META_WIP_DATA_DIR'):
+        return os.environ['META_WIP_DATA_DIR']
+    base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'meta-wip')
+
+
+def paths_key(paths: list) -> str:
+    """
+    Return a short key identifying a set of input paths.
+
+    Used to keep separate caches for different README trees.
+
+    Args:
+        paths: File and/or directory paths, in any order
+
+    Returns:
+        str: 16 hex digits that depend only on the absolute paths
+    """
+    key = '\0'.join(sorted(os.path.abspath(p) for p in paths))
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def write_atomic(path: str, data) -> None:
+    """
+    Write a file so that readers never see it partly written.
+
+    The data is written to a temporary file next to path, which then
+    replaces path in one rename.
+
+    Args:
+        path: Destination file; its directory is created if needed
+        data: Contents as bytes, or as str to be written as UTF-8
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode()
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _scan_readmes(directory: str, found: list, skip_generated: bool) -> None:
+    """Add the README paths below a directory to found, skipping hidden ones."""
+    # os.scandir directly rather than os.walk: it is called once per query by
+    # 'find', and os.walk's per-directory lists roughly double the time
+    readmes, subdirs = [], []
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if skip_generated and name == GENERATED_MARKER:
+                return
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                if name.endswith(README_SUFFIX):
+                    readmes.append(entry.path)
+            elif not name.startswith('.') and not entry.is_symlink():
+                subdirs.append(entry.path)
+    found.extend(readmes)
+    for subdir in subdirs:
+        _scan_readmes(subdir, found, skip_generated)
+
+
+def find_readmes(paths: list, skip_generated: bool = False) -> list:
+    """
+    Expand a list of files and directories into README file paths.
+
+    Directories are searched recursively for files ending in README.org;
+    hidden directories (such as .git) and symbolic links to directories are
+    skipped. Any other path is passed through unchanged so that missing
+    files are still reported by the parser.
+
+    Args:
+        paths: File and/or directory paths
+        skip_generated: Also skip directories holding a GENERATED_MARKER
+                        file, whose READMEs are output of 'meta-wip index'
+                        rather than projects. Set when scanning for projects,
+                        not when the files themselves matter (e.g. backups)
+
+    Returns:
+        list: README file paths, directory matches in sorted order
+    """
+    readmes = []
+    for path in paths:
+        if not os.path.isdir(path):
+            readmes.append(path)
+            continue
+        found = []
+        _scan_readmes(path, found, skip_generated)
+        readmes.extend(sorted(found))
+    return readmes
@@ -0,0 +1,324 @@
+"""
+What-if simulation of alternative priority weights.
+
+Scores every project under many weight/boost profiles at once so the effect
+of changing the hand-tuned weights in docs/priority/weights.md can be seen
+before committing to them. Each project is encoded once as a row of factor
+scores and interaction-boost flags; each profile is a column of weights and
+boost amounts. The score matrix is the product of the two, and because the
+factor scores take only a handful of values, identical rows are collapsed
+before multiplying.
+
+Profiles are read from a TOML file with one table per profile. Any weight or
+boost left out keeps its default value from project_sorter:
+
+    [accountability-first]
+    weights = { ACCOUNTABILITY = 8, URGENCY = 0 }
+
+    [no-boosts]
+    boosts = { STUCK_ACCOUNTABLE = 0, QUICK_WIN = 0, AVOIDED_ACCOUNTABLE = 0 }
+"""
+
+
+import heapq
+import math
+import tomllib
+from collections import Counter
+from itertools import groupby
+from operator import mul
+from typing import NamedTuple
+
+from meta_wip_automation.project_sorter import (
+    FACTORS,
+    INTERACTION_BOOSTS,
+    PRIORITY_WEIGHTS,
+    calculate_priority,
+    get_factor_scores,
+    get_interaction_flags
+)
+
+BOOSTS = tuple(INTERACTION_BOOSTS)
+
+# Keys allowed in a profile table
+PROFILE_KEYS = ('weights', 'boosts')
+
+# Column order of an encoded project row and of a profile vector
+COLUMNS = FACTORS + BOOSTS
+
+
+class ProfileResult(NamedTuple):
+    """Comparison of one profile's ranking against the current ranking."""
+    name: str
+    spearman: float
+    kendall: float
+    movers: list  # (project index, current rank, simulated rank), 1-based ranks
+
+
+def encode_project(frontmatter: dict, last_completed=None,
+                   recurrence_interval: int = None) -> tuple:
+    """
+    Encode a project as a row of factor scores followed by boost flags.
+
+    Completed projects are encoded as all zeros so that they score 0 under
+    every profile, matching calculate_priority.
+
+    Args:
+        frontmatter: Dictionary of project frontmatter
+        last_completed: Optional datetime of last completion
+        recurrence_interval: Optional interval for recurring tasks
+
+    Returns:
+        tuple: One integer per name in COLUMNS
+    """
+    if frontmatter.get('STATUS') == 'done':
+        return (0,) * len(COLUMNS)
+    scores = get_factor_scores(frontmatter, last_completed, recurrence_interval)
+    flags = get_interaction_flags(scores)
+    return (tuple(scores[factor] for factor in FACTORS) +
+            tuple(int(flags[boost]) for boost in BOOSTS))
+
+
+def build_profile(weights: dict = None, boosts: dict = None) -> tuple:
+    """
+    Build a profile vector, filling unspecified entries with the defaults.
+
+    Args:
+        weights: Optional mapping of factor name to weight
+        boosts: Optional mapping of interaction boost name to bonus points
+
+    Returns:
+        tuple: One number per name in COLUMNS
+
+    Raises:
+        ValueError: If weights or boosts is not a mapping, or a name is not
+                    recognised or its value is not a number.
+    """
+    merged_weights = dict(PRIORITY_WEIGHTS)
+    merged_boosts = dict(INTERACTION_BOOSTS)
+    for overrides, merged, kind in ((weights, merged_weights, 'weight'),
+                                    (boosts, merged_boosts, 'boost')):
+        if overrides is None:
+            continue
+        if not isinstance(overrides, dict):
+            raise ValueError(f"{kind.capitalize()}s must be a table of names and numbers")
+        for name, value in overrides.items():
+            key = name.upper()
+            if key not in merged:
+                raise ValueError(f"Unknown {kind} '{name}'")
+            # bool is a subclass of int, but 'true' is not a weight
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{kind.capitalize()} '{name}' must be a number, "
+                                 f"not {value!r}")
+            merged[key] = value
+    return (tuple(merged_weights[factor] for factor in FACTORS) +
+            tuple(merged_boosts[boost] for boost in BOOSTS))
+
+
+def load_profiles(file_path: str) -> dict:
+    """
+    Load weight profiles from a TOML file.
+
+    Args:
+        file_path: Path to the profiles file
+
+    Returns:
+        dict: Profile name mapped to its profile vector, in file order
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid TOML, or a profile is not a
+                    table, has keys other than weights and boosts, or names
+                    an unknown factor or boost or gives it a non-numeric value.
+    """
+    with open(file_path, 'rb') as file:
+        try:
+            data = tomllib.load(file)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid profiles file {file_path}: {e}") from e
+
+    profiles = {}
+    for name, table in data.items():
+        if not isinstance(table, dict):
+            raise ValueError(f"Profile '{name}' must be a table")
+        unknown = [key for key in table if key not in PROFILE_KEYS]
+        if unknown:
+            raise ValueError(f"Profile '{name}': unknown key '{unknown[0]}'; "
+                             f"expected {' or '.join(PROFILE_KEYS)}")
+        try:
+            profiles[name] = build_profile(table.get('weights'), table.get('boosts'))
+        except ValueError as e:
+            raise ValueError(f"Profile '{name}': {e}") from e
+    return profiles
+
+
+def score_matrix(rows: list, profiles: list) -> list:
+    """
+    Multiply the project rows by the profile vectors.
+
+    Args:
+        rows: Encoded projects as returned by encode_project
+        profiles: Profile vectors as returned by build_profile
+
+    Returns:
+        list: One list of project scores per profile
+    """
+    # Collapse duplicate rows; most projects share a factor combination
+    unique_rows = {}
+    row_index = [unique_rows.setdefault(row, len(unique_rows)) for row in rows]
+    distinct = list(unique_rows)
+
+    matrix = []
+    for profile in profiles:
+        distinct_scores = [sum(map(mul, row, profile)) for row in distinct]
+        matrix.append([distinct_scores[i] for i in row_index])
+    return matrix
+
+
+def rank_positions(scores: list) -> list:
+    """
+    Return the 1-based position of each project in descending score order.
+
+    Ties keep their input order, as in sort_projects.
+
+    Args:
+        scores: Project scores
+
+    Returns:
+        list: Position of each project
+    """
+    order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    positions = [0] * len(scores)
+    for position, index in enumerate(order, 1):
+        positions[index] = position
+    return positions
+
+
+def _average_ranks(counts: dict) -> dict:
+    """Map each distinct value to its mean 1-based ascending rank."""
+    ranks = {}
+    below = 0
+    for value in sorted(counts):
+        ranks[value] = below + (counts[value] + 1) / 2
+        below += counts[value]
+    return ranks
+
+
+def _tied_pairs(counts) -> int:
+    """Count the pairs formed within each group of equal values."""
+    return sum(c * (c - 1) // 2 for c in counts)
+
+
+def spearman_correlation(x: list, y: list) -> float:
+    """
+    Spearman rank correlation of two score lists.
+
+    Works on the counts of distinct (x, y) pairs, so the cost after a single
+    counting pass depends on the number of distinct scores, not projects.
+
+    Args:
+        x: First list of scores
+        y: Second list of scores, same length as x
+
+    Returns:
+        float: Correlation in [-1, 1], or NaN if either list is constant
+    """
+    n = len(x)
+    if n < 2:
+        return math.nan
+    pairs = Counter(zip(x, y))
+    x_ranks = _average_ranks(Counter(x))
+    y_ranks = _average_ranks(Counter(y))
+    mean = (n + 1) / 2  # Mean rank is the same with or without ties
+    cov = sum(c * (x_ranks[a] - mean) * (y_ranks[b] - mean)
+              for (a, b), c in pairs.items())
+    var_x = sum(c * (x_ranks[a] - mean) ** 2 for (a, _), c in pairs.items())
+    var_y = sum(c * (y_ranks[b] - mean) ** 2 for (_, b), c in pairs.items())
+    if var_x == 0 or var_y == 0:
+        return math.nan
+    return cov / math.sqrt(var_x * var_y)
+
+
+def kendall_tau(x: list, y: list) -> float:
+    """
+    Kendall tau-b rank correlation of two score lists.
+
+    Discordant pairs are counted with a Fenwick tree over the distinct y
+    values, visiting each distinct (x, y) pair once in x order, so hundreds
+    of profiles over thousands of projects stay cheap.
+
+    Args:
+        x: First list of scores
+        y: Second list of scores, same length as x
+
+    Returns:
+        float: Correlation in [-1, 1], or NaN if either list is constant
+    """
+    n = len(x)
+    if n < 2:
+        return math.nan
+    pairs = Counter(zip(x, y))
+    x_counts = Counter(x)
+    y_counts = Counter(y)
+    y_index = {value: i + 1 for i, value in enumerate(sorted(y_counts))}
+    tree = [0] * (len(y_index) + 1)
+
+    discordant = 0
+    inserted = 0
+    for _, group in groupby(sorted(pairs.items()), key=lambda item: item[0][0]):
+        group = list(group)
+        # Earlier groups have strictly smaller x; count those with larger y
+        for (_, b), c in group:
+            i = y_index[b]
+            at_most = 0
+            while i:
+                at_most += tree[i]
+                i -= i & -i
+            discordant += c * (inserted - at_most)
+        for (_, b), c in group:
+            i = y_index[b]
+            while i < len(tree):
+                tree[i] += c
+                i += i & -i
+            inserted += c
+
+    total_pairs = n * (n - 1) // 2
+    x_ties = _tied_pairs(x_counts.values())
+    y_ties = _tied_pairs(y_counts.values())
+    joint_ties = _tied_pairs(pairs.values())
+    denominator = math.sqrt((total_pairs - x_ties) * (total_pairs - y_ties))
+    if denominator == 0:
+        return math.nan
+    return (total_pairs - x_ties - y_ties + joint_ties - 2 * discordant) / denominator
+
+
+def simulate(projects: list, profiles: dict, movers: int = 5) -> list:
+    """
+    Compare the ranking under each profile against the current ranking.
+
+    Args:
+        projects: List of tuples (frontmatter, last_completed, recurrence_interval)
+        profiles: Profile name mapped to profile vector, as from load_profiles
+        movers: Number of biggest rank changes to report per profile
+
+    Returns:
+        list: One ProfileResult per profile, in input order
+    """
+    baseline = [calculate_priority(*project) for project in projects]
+    baseline_positions = rank_positions(baseline)
+    rows = [encode_project(*project) for project in projects]
+
+    results = []
+    for name, scores in zip(profiles, score_matrix(rows, list(profiles.values()))):
+        positions = rank_positions(scores)
+        changes = heapq.nlargest(
+            movers,
+            (i for i in range(len(projects)) if positions[i] != baseline_positions[i]),
+            key=lambda i: abs(positions[i] - baseline_positions[i])
+        )
+        results.append(ProfileResult(
+            name,
+            spearman_correlation(baseline, scores),
+            kendall_tau(baseline, scores),
+            [(i, baseline_positions[i], positions[i]) for i in changes]
+        ))
+    return results
@@ -0,0 +1,32 @@
+"""Builders for the projects and README files used across the test suite."""
+
+import os
+
+
+def project(project_id, **fields):
+    """Return a (frontmatter, last_completed, recurrence_interval) tuple."""
+    frontmatter = {'title': f'Project {project_id}', 'PROJECT_ID': project_id}
+    frontmatter.update(fields)
+    return (frontmatter, None, None)
+
+
+def write_file(path, content):
+    """Write content to path, creating its directory, and return the path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+def write_readme(directory, project_id, title=None, body='', **fields):
+    """
+    Write '<project_id>-README.org' into directory.
+
+    The frontmatter holds the title ('Project <project_id>' by default), the
+    PROJECT_ID and any other fields given as keywords, followed by body.
+    """
+    lines = [f"#+title: {title or f'Project {project_id}'}",
+             f"#+PROJECT_ID: {project_id}"]
+    lines.extend(f"#+{field}: {value}" for field, value in fields.items())
+    return write_file(os.path.join(directory, f'{project_id}-README.org'),
+                      '\n'.join(lines) + '\n' + body)
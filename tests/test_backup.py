@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import os
+import pytest
+from meta_wip_automation.backup import (
+    create_snapshot,
+    list_snapshots,
+    restore_snapshot,
+    verify_store
+)
+from tests.helpers import write_file
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'SYS.02'
+    write_file(os.path.join(root, 'SYS.02.00/SYS.02.01-README.org'), "#+title: One\n")
+    write_file(os.path.join(root, 'SYS.02.00/SYS.02.02-README.org'), "#+title: Two\n")
+    write_file(os.path.join(root, 'SYS.02.02/SYS.02.02-README.org'), "#+title: Two\n")
+    write_file(os.path.join(root, 'SYS.02.02/notes.org'), "not a README\n")
+    return str(root), str(tmp_path / 'store')
+
+
+def count_objects(store):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store, 'objects')))
+
+
+def test_snapshot_deduplicates_contents(tree):
+    """
+    Test that a snapshot records every README and stores each content once.
+
+    This test verifies that:
+        1. Only README files are included in the manifest.
+        2. Identical contents share one stored object.
+    """
+    root, store = tree
+    manifest, created = create_snapshot(root, store)
+    assert created
+    assert sorted(manifest['files']) == [
+        'SYS.02.00/SYS.02.01-README.org',
+        'SYS.02.00/SYS.02.02-README.org',
+        'SYS.02.02/SYS.02.02-README.org'
+    ]
+    assert count_objects(store) == 2
+
+
+def test_unchanged_tree_creates_no_snapshot(tree):
+    """
+    Test that snapshots are incremental.
+
+    This test verifies that:
+        1. Re-running on an unchanged tree writes nothing new.
+        2. Changing one file stores only that file's new contents.
+    """
+    root, store = tree
+    first, _ = create_snapshot(root, store)
+    again, created = create_snapshot(root, store)
+    assert not created
+    assert again['id'] == first['id']
+
+    write_file(os.path.join(root, 'SYS.02.00/SYS.02.01-README.org'), "#+title: One (edited)\n")
+    second, created = create_snapshot(root, store)
+    assert created
+    assert count_objects(store) == 3
+    assert len(list_snapshots(store)) == 2
+    assert (second['files']['SYS.02.02/SYS.02.02-README.org'] ==
+            first['files']['SYS.02.02/SYS.02.02-README.org'])
+
+
+def test_previous_snapshot_found_without_reading_history(tree, tmp_path):
+    """
+    Test that a snapshot only reads the previous manifest of its own root.
+
+    This test verifies that:
+        1. Manifests of other snapshots are not opened (an unreadable one
+           does not matter).
+        2. Without a .latest pointer, the newest manifest of the root is found
+           and the pointer is written again.
+    """
+    root, store = tree
+    first, _ = create_snapshot(root, store)
+    other = tmp_path / 'other'
+    write_file(os.path.join(other, 'WRK.01.01/WRK.01.01-README.org'), "#+title: Work\n")
+    create_snapshot(str(other), store)
+
+    snapshots_dir = os.path.join(store, 'snapshots')
+    with open(os.path.join(snapshots_dir, '00000000T000000000000Z.json'), 'w') as f:
+        f.write("not json")
+    again, created = create_snapshot(root, store)
+    assert not created
+    assert again['id'] == first['id']
+
+    pointers = [name for name in os.listdir(snapshots_dir) if name.endswith('.latest')]
+    assert len(pointers) == 2
+    for name in pointers:
+        os.unlink(os.path.join(snapshots_dir, name))
+    again, created = create_snapshot(str(other), store)
+    assert not created
+    assert again['root'] == str(other)
+    assert len([name for name in os.listdir(snapshots_dir) if name.endswith('.latest')]) == 1
+
+
+def test_restore_single_project_and_full_tree(tree, tmp_path):
+    """
+    Test restoring one project or the whole tree from a snapshot.
+
+    This test verifies that:
+        1. Restoring a project only writes that project's READMEs.
+        2. A full restore recreates every README with its original content.
+    """
+    root, store = tree
+    manifest, _ = create_snapshot(root, store)
+
+    project_dest = tmp_path / 'project'
+    restored = restore_snapshot(store, manifest['id'], str(project_dest), 'SYS.02.01')
+    assert restored == ['SYS.02.00/SYS.02.01-README.org']
+
+    full_dest = tmp_path / 'full'
+    restored = restore_snapshot(store, 'latest', str(full_dest))
+    assert len(restored) == 3
+    assert (full_dest / 'SYS.02.02' / 'SYS.02.02-README.org').read_text() == "#+title: Two\n"
+
+    with pytest.raises(ValueError):
+        restore_snapshot(store, 'latest', str(full_dest), 'WRK.01.01')
+
+
+def test_verify_detects_corruption(tree):
+    """
+    Test that verification reports missing and corrupt objects.
+    """
+    root, store = tree
+    manifest, _ = create_snapshot(root, store)
+    assert verify_store(store) == []
+
+    digests = sorted({entry['hash'] for entry in manifest['files'].values()})
+    corrupt_path = os.path.join(store, 'objects', digests[0][:2], digests[0][2:])
+    with open(corrupt_path, 'w') as f:
+        f.write("tampered")
+    os.unlink(os.path.join(store, 'objects', digests[1][:2], digests[1][2:]))
+
+    assert verify_store(store, workers=2) == [(digests[0], 'corrupt'),
+                                              (digests[1], 'missing')]
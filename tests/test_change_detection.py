@@ -0,0 +1,186 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation import change_detection
+from meta_wip_automation.change_detection import (
+    GIT,
+    STAT,
+    blob_hash,
+    detect_changes,
+    find_git_dir,
+    read_git_index,
+    refresh_index
+)
+from meta_wip_automation.main import main
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def git(cwd, *args):
+    subprocess.run(['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com',
+                    *args], cwd=cwd, check=True, capture_output=True)
+
+
+@unittest.skipUnless(shutil.which('git'), "git is not installed")
+class TestGitIndex(unittest.TestCase):
+    """Test suite for reading the git index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.repo = self.tmpdir.name
+        git(self.repo, 'init', '-q')
+        write(os.path.join(self.repo, 'SYS.02.01', 'SYS.02.01-README.org'),
+              "#+title: One\n#+STATUS: active\n")
+        write(os.path.join(self.repo, 'SYS.02.02', 'SYS.02.02-README.org'),
+              "#+title: Two\n#+STATUS: stuck\n")
+        write(os.path.join(self.repo, 'notes.txt'), "not a README\n")
+        git(self.repo, 'add', '.')
+        git(self.repo, 'commit', '-q', '-m', 'Initial')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_index_versions(self):
+        """Test that versions 2, 3 and 4 give the blob hashes git computes."""
+        readme = 'SYS.02.02/SYS.02.02-README.org'
+        expected = blob_hash(os.path.join(self.repo, readme))
+        for version in ('2', '3', '4'):
+            git(self.repo, 'update-index', '--index-version', version)
+            if version == '3':
+                # Intent-to-add entries use the extended flags of version 3
+                write(os.path.join(self.repo, 'new.txt'), "new\n")
+                git(self.repo, 'add', '-N', 'new.txt')
+            entries = read_git_index(os.path.join(self.repo, '.git', 'index'))
+            self.assertIn('notes.txt', entries)
+            self.assertEqual(entries[readme].blob, expected)
+            self.assertEqual(entries[readme].size, os.path.getsize(os.path.join(self.repo, readme)))
+
+    def test_invalid_index(self):
+        """Test that files that are not a git index are rejected."""
+        path = os.path.join(self.repo, 'bogus')
+        with open(path, 'wb') as f:
+            f.write(b'DIRC\x00\x00\x00\x09\x00\x00\x00\x00')
+        with self.assertRaises(ValueError):
+            read_git_index(path)
+        with open(path, 'wb') as f:
+            f.write(b'DIRC\x00\x00\x00\x02\x00\x00\x00\x05')
+        with self.assertRaises(ValueError):
+            read_git_index(path)
+
+    def test_find_git_dir(self):
+        """Test that the working tree is found from a subdirectory."""
+        top, git_dir = find_git_dir(os.path.join(self.repo, 'SYS.02.01'))
+        self.assertEqual(top, os.path.abspath(self.repo))
+        self.assertEqual(git_dir, os.path.join(top, '.git'))
+
+    def test_detect_changes_with_git(self):
+        """Test added, modified and deleted READMEs in a git working tree."""
+        first = detect_changes(self.repo)
+        self.assertEqual(first.source, GIT)
+        self.assertEqual(len(first.added), 2)
+        self.assertTrue(all(state.blob for state in first.states.values()))
+
+        one = os.path.join(self.repo, 'SYS.02.01', 'SYS.02.01-README.org')
+        two = os.path.join(self.repo, 'SYS.02.02', 'SYS.02.02-README.org')
+        three = os.path.join(self.repo, 'SYS.02.03', 'SYS.02.03-README.org')
+        write(one, "#+title: One\n#+STATUS: waiting\n")
+        os.remove(two)
+        write(three, "#+title: Three\n")
+        second = detect_changes(self.repo, first.states)
+        self.assertEqual(second.added, [three])
+        self.assertEqual(second.modified, [one])
+        self.assertEqual(second.deleted, [two])
+        self.assertIsNone(second.states[three].blob)
+
+    def test_rewritten_readme_with_same_content_is_unchanged(self):
+        """Test that a README rewritten with its old content is not reported."""
+        first = detect_changes(self.repo)
+        path = os.path.join(self.repo, 'SYS.02.01', 'SYS.02.01-README.org')
+        with open(path) as f:
+            content = f.read()
+        write(path, content)
+        os.utime(path, ns=(first.states[path].mtime_ns + 10**9,) * 2)
+        with patch.object(change_detection, 'blob_hash',
+                          wraps=change_detection.blob_hash) as hasher:
+            second = detect_changes(self.repo, first.states)
+            self.assertEqual((second.added, second.modified, second.deleted), ([], [], []))
+            self.assertEqual(hasher.call_count, 1)
+            # The new stat data is remembered, so the file is not hashed again
+            detect_changes(self.repo, second.states)
+            self.assertEqual(hasher.call_count, 1)
+
+
+class TestStatScan(unittest.TestCase):
+    """Test suite for change detection outside git."""
+
+    def test_stat_scan(self):
+        """Test the fallback for trees that are not in a git working tree."""
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'A', 'A-README.org')
+            write(path, "#+title: A\n")
+            first = detect_changes(root, use_git=False)
+            self.assertEqual((first.source, first.added), (STAT, [path]))
+            self.assertEqual(detect_changes(root, first.states, use_git=False).modified, [])
+
+            os.utime(path, ns=(1, 1))
+            second = detect_changes(root, first.states, use_git=False)
+            self.assertEqual(second.modified, [path])
+            self.assertIsNone(second.states[path].blob)
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_missing_root_is_an_error(self, mock_stderr):
+        """Test that a root that does not exist is not taken for an empty tree."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            missing = os.path.join(tmpdir, 'missing')
+            with self.assertRaisesRegex(ValueError, "Not a directory or file"):
+                detect_changes(missing)
+
+            with patch.dict(os.environ, {'META_WIP_CACHE_DIR': os.path.join(tmpdir, 'cache')}):
+                for argv in (['rank', tmpdir, missing], ['find', 'query', missing]):
+                    with self.assertRaises(SystemExit) as cm:
+                        sys.argv = ['main.py', *argv]
+                        main()
+                    self.assertEqual(cm.exception.code, 1)
+        self.assertIn(f"Not a directory: {missing}", mock_stderr.getvalue())
+        self.assertIn(f"Not a directory or file: {missing}", mock_stderr.getvalue())
+
+    def test_refresh_index(self):
+        """Test the shared update loop: failures, kept states and removals."""
+        with tempfile.TemporaryDirectory() as root:
+            paths = {name: os.path.join(root, f'{name}-README.org') for name in 'ABC'}
+            for path in paths.values():
+                write(path, "#+title: x\n")
+            indexed = {}
+            failing = {paths['B']: ValueError('bad'), paths['C']: OSError('gone')}
+
+            def load(path):
+                if isinstance(failing.get(path), OSError):
+                    raise failing[path]
+                indexed[path] = True
+                return failing.get(path)
+
+            updated, removed, failures, states = refresh_index(
+                [root], {}, load, lambda path: indexed.pop(path, None), indexed)
+            self.assertEqual((updated, removed), (2, 0))
+            self.assertEqual([(p, phase) for p, phase, _ in failures],
+                             [(paths['B'], 'parse'), (paths['C'], 'read')])
+            self.assertEqual(sorted(states[root]), [paths['A'], paths['B']])
+
+            os.remove(paths['A'])
+            updated, removed, failures, states = refresh_index(
+                [root], states, load, lambda path: indexed.pop(path, None), indexed)
+            self.assertEqual((updated, removed), (0, 1))
+            self.assertEqual(sorted(indexed), [paths['B']])
+
+
+if __name__ == '__main__':
+    unittest.main()
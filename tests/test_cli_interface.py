@@ -142,6 +142,43 @@ class TestCLI(unittest.TestCase):
             finally:
                 os.unlink(f.name)
 
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_due_rejects_days_below_one(self, mock_stderr):
+        """
+        Test that 'due --days' only accepts a range of at least one day.
+        """
+        for days in ('0', '-3'):
+            with self.assertRaises(SystemExit) as cm:
+                sys.argv = ['main.py', 'due', '--days', days, '.']
+                main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("must be at least 1", mock_stderr.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_simulate_with_profiles(self, mock_stdout):
+        """Test the simulate subcommand over a directory of READMEs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for project_id, status, urgency in (('TST.00.01', 'active', 'now'),
+                                                ('TST.00.02', 'stuck', 'later')):
+                with open(os.path.join(tmpdir, f'{project_id}-README.org'), 'w') as f:
+                    f.write(f"#+title: Project {project_id}\n"
+                            f"#+PROJECT_ID: {project_id}\n"
+                            f"#+STATUS: {status}\n"
+                            f"#+URGENCY: {urgency}\n")
+            profiles_path = os.path.join(tmpdir, 'profiles.toml')
+            with open(profiles_path, 'w') as f:
+                f.write('[urgency-first]\nweights = { STATUS = 0, URGENCY = 10 }\n')
+
+            sys.argv = ['main.py', 'simulate', '--profiles', profiles_path, tmpdir]
+            with self.assertRaises(SystemExit) as cm:
+                main()
+
+        self.assertEqual(cm.exception.code, 0)
+        output = mock_stdout.getvalue()
+        self.assertIn('Profile: urgency-first', output)
+        self.assertIn('TST.00.01', output)
+        self.assertIn('2 -> 1', output)
+
 
 if __name__ == '__main__':
     unittest.main()
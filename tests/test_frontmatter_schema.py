@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import pytest
+from meta_wip_automation.frontmatter_schema import (
+    documented_values,
+    normalise_fields,
+    validate_frontmatter
+)
+from meta_wip_automation.project_sorter import (
+    FIELD_SCORES,
+    PRIORITY_WEIGHTS,
+    calculate_priority,
+    get_factor_scores
+)
+from meta_wip_automation.readme_parser import extract_frontmatter, load_project
+
+
+def test_documented_values_match_score_tables():
+    """
+    Test that readme_parser's docstring and the score tables agree.
+
+    This test verifies that every scored field is documented with exactly
+    the values that have scores, so error messages never describe a value
+    that cannot be scored (or omit one that can).
+    """
+    for field, scores in FIELD_SCORES.items():
+        assert set(documented_values()[field]) == set(scores), field
+
+
+def test_valid_frontmatter_is_normalised_and_encoded(tmp_path):
+    """
+    Test that valid frontmatter produces canonical values and integer codes.
+
+    This test verifies that:
+        1. Case, whitespace and separators in values are normalised.
+        2. Codes match the score tables, with defaults for missing fields.
+        3. load_project returns the same canonical values, so the scorer
+           uses the same codes as the validator.
+    """
+    content = """
+    #+title: Sample Project
+    #+PROJECT_ID: SYS.00.00
+    #+STATUS:  Stuck
+    #+ACCOUNTABILITY: off_radar
+    #+URGENCY: NOW
+    #+TAGS: sample, test
+    * SYS.00.00 Sample Project
+    #+STATUS: not frontmatter
+    """
+    result = validate_frontmatter(content)
+    assert result.errors == []
+    assert result.frontmatter['STATUS'] == 'stuck'
+    assert result.frontmatter['ACCOUNTABILITY'] == 'off-radar'
+    assert result.frontmatter['URGENCY'] == 'now'
+    assert result.frontmatter['title'] == 'Sample Project'
+    assert result.frontmatter['TAGS'] == 'sample, test'
+    assert result.codes == {
+        'ACCOUNTABILITY': 0, 'STATUS': 3, 'TIME_DISTORTION': 1,
+        'EFFORT': 1, 'INTEREST': 2, 'URGENCY': 3
+    }
+
+    readme = tmp_path / 'SYS.00.00-README.org'
+    readme.write_text(content)
+    project = load_project(str(readme))
+    assert project[0] == result.frontmatter
+    scores = get_factor_scores(*project)
+    assert {field: scores[field] for field in FIELD_SCORES} == result.codes
+    assert calculate_priority(*project) == sum(PRIORITY_WEIGHTS[field] * code
+                                               for field, code in result.codes.items())
+
+
+def test_empty_values_score_as_default(tmp_path):
+    """
+    Test that an empty scored field gets its default when loaded.
+    """
+    content = "#+title: Empty\n#+STATUS:\n#+URGENCY: now\n"
+    result = validate_frontmatter(content)
+    assert result.errors == []
+    assert result.codes['STATUS'] == FIELD_SCORES['STATUS']['active']
+
+    readme = tmp_path / 'README.org'
+    readme.write_text(content)
+    assert get_factor_scores(*load_project(str(readme)))['STATUS'] == result.codes['STATUS']
+
+
+def test_invalid_frontmatter_is_not_scored(tmp_path):
+    """
+    Test that loading rejects what the validator rejects.
+
+    This test verifies that:
+        1. load_project raises the validator's errors instead of scoring a
+           typo as 0.
+        2. extract_frontmatter names the line without a ':' separator.
+        3. Drawer fields are normalised, and rejected, the same way.
+    """
+    readme = tmp_path / 'README.org'
+    readme.write_text("#+title: Typo\n#+STATUS: stcuk\n")
+    with pytest.raises(ValueError, match="line 2: STATUS: unknown value 'stcuk'"):
+        load_project(str(readme))
+
+    with pytest.raises(ValueError, match="Missing ':' after keyword: #\\+TAGS"):
+        extract_frontmatter("#+title: Tags\n#+TAGS\n")
+
+    assert normalise_fields({'STATUS': 'Waiting', 'ACCOUNTABILITY': 'Off  Radar',
+                             'URGENCY': '', 'title': 'Sub'}) == {
+        'STATUS': 'waiting', 'ACCOUNTABILITY': 'off-radar', 'title': 'Sub'}
+    with pytest.raises(ValueError, match="Did you mean 'now'"):
+        normalise_fields({'URGENCY': 'nwo'})
+
+
+def test_other_org_keywords_may_repeat(tmp_path):
+    """
+    Test that keywords outside the schema are read as org reads them.
+    """
+    readme = tmp_path / 'README.org'
+    readme.write_text("#+title: Org\n#+OPTIONS: toc:nil\n#+OPTIONS: num:nil\n"
+                      "#+STARTUP overview\n#+STATUS: stuck\n")
+    frontmatter, _, _ = load_project(str(readme))
+    assert frontmatter['OPTIONS'] == 'num:nil'
+    assert frontmatter['STATUS'] == 'stuck'
+
+
+def test_typos_are_reported_with_suggestion():
+    """
+    Test that an unknown value is reported instead of silently scored as 0.
+    """
+    result = validate_frontmatter("#+title: Typo\n#+STATUS: stcuk\n")
+    [error] = result.errors
+    assert (error.line, error.field, error.value) == (2, 'STATUS', 'stcuk')
+    assert "Did you mean 'stuck'?" in error.message
+    assert 'STATUS' not in result.frontmatter
+
+
+def test_malformed_lines_and_fields():
+    """
+    Test per-field error reporting for malformed frontmatter.
+
+    This test verifies that:
+        1. A schema keyword without ':' is an error rather than an exception.
+        2. Duplicate fields, bad intervals and bad dates are reported.
+        3. A lone recurrence field and a missing title are reported.
+    """
+    content = """#+URGENCY now
+#+STATUS: active
+#+STATUS: done
+#+RECURRENCE_INTERVAL: monthly
+#+LAST_COMPLETED: 2024-02-30
+"""
+    result = validate_frontmatter(content)
+    found = [(e.line, e.field) for e in result.errors]
+    assert found == [
+        (1, 'URGENCY'),
+        (3, 'STATUS'),
+        (4, 'RECURRENCE_INTERVAL'),
+        (5, 'LAST_COMPLETED'),
+        (0, 'title')
+    ]
+    assert result.frontmatter['STATUS'] == 'active'
+
+    lone = validate_frontmatter("#+title: Lone\n#+LAST_COMPLETED: 2024-02-01\n")
+    assert [(e.field, e.message) for e in lone.errors] == [
+        ('RECURRENCE_INTERVAL', 'required when LAST_COMPLETED is set')]
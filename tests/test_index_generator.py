@@ -0,0 +1,230 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation.backup import create_snapshot
+from meta_wip_automation.index_generator import (
+    TOP_SECTION,
+    build_sections,
+    copy_if_changed,
+    copy_names,
+    generate_index,
+    write_if_changed
+)
+from meta_wip_automation.main import main
+from meta_wip_automation.sharding import project_record
+from meta_wip_automation.utils import find_readmes
+from tests.helpers import project, write_file, write_readme
+
+
+class TestIndexGenerator(unittest.TestCase):
+    """Test suite for generating the index README."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base = self.tmpdir.name
+        self.index_dir = os.path.join(self.base, 'SYS.02.00')
+        self.cache_dir = os.path.join(self.base, 'cache')
+        self.projects = [
+            project('SYS.02.01', STATUS='stuck', ACCOUNTABILITY='imminent'),
+            project('SYS.02.02', STATUS='active', URGENCY='now'),
+            project('SYS.02.03', STATUS='done')
+        ]
+        self.paths = []
+        for p in self.projects:
+            project_dir = os.path.join(self.base, p[0]['PROJECT_ID'])
+            os.makedirs(project_dir)
+            self.paths.append(os.path.join(project_dir, f"{p[0]['PROJECT_ID']}-README.org"))
+            with open(self.paths[-1], 'w') as f:
+                f.write(f"#+title: {p[0]['title']}\n")
+        self.records = {path: project_record(*p) for p, path in zip(self.projects, self.paths)}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_sections(self):
+        """Test the top section and per-status sections in ranked order."""
+        links = copy_names(self.records)
+        sections = build_sections(self.records, links, top=5)
+        self.assertEqual(list(sections), [TOP_SECTION, 'Stuck', 'Waiting', 'Active', 'Done'])
+        self.assertEqual([r['frontmatter']['PROJECT_ID'] for _, r in sections[TOP_SECTION]],
+                         ['SYS.02.01', 'SYS.02.02'])
+        self.assertEqual([r['frontmatter']['PROJECT_ID'] for _, r in sections['Done']],
+                         ['SYS.02.03'])
+        self.assertEqual(sections['Active'][0][0], 'SYS.02.02-README.org')
+
+        links = {path: os.path.relpath(path, self.index_dir) for path in self.records}
+        linked = build_sections(self.records, links)
+        self.assertEqual(linked['Active'][0][0], os.path.join('..', 'SYS.02.02',
+                                                             'SYS.02.02-README.org'))
+
+    def test_unchanged_ranking_rewrites_nothing(self):
+        """Test that a second run with the same ranking renders and writes nothing."""
+        first = generate_index(self.records, self.index_dir)
+        self.assertTrue(first.written)
+        self.assertEqual(len(first.rendered), 5)
+        self.assertEqual(len(first.copied), 3)
+        with open(first.index_path) as f:
+            content = f.read()
+        self.assertIn('#+PROJECT_ID: SYS.02.00', content)
+        self.assertIn('1. [[file:SYS.02.01-README.org][Project SYS.02.01]] (SYS.02.01)', content)
+
+        mtimes = {name: os.stat(os.path.join(self.index_dir, name)).st_mtime_ns
+                  for name in os.listdir(self.index_dir)}
+        # A touched README has a new file state but the same record values
+        self.records[self.paths[0]]['state'] = [1, 2, None]
+        second = generate_index(self.records, self.index_dir)
+        self.assertFalse(second.written)
+        self.assertEqual(second.rendered, [])
+        self.assertEqual(len(second.reused), 5)
+        self.assertEqual(second.copied, [])
+        self.assertEqual({name: os.stat(os.path.join(self.index_dir, name)).st_mtime_ns
+                          for name in os.listdir(self.index_dir)}, mtimes)
+
+    def test_changes_render_only_affected_sections(self):
+        """Test that a change re-renders only the sections showing that project."""
+        generate_index(self.records, self.index_dir)
+        self.projects[0][0]['STATUS'] = 'waiting'
+        self.records[self.paths[0]] = project_record(*self.projects[0])
+        with open(self.paths[2], 'a') as f:
+            f.write("#+STATUS: done\n")
+        result = generate_index(self.records, self.index_dir)
+        self.assertTrue(result.written)
+        self.assertEqual(result.rendered, [TOP_SECTION, 'Stuck', 'Waiting'])
+        self.assertEqual(result.reused, ['Active', 'Done'])
+        with open(result.index_path) as f:
+            self.assertIn('* Waiting\n1. [[file:SYS.02.01-README.org]', f.read())
+        self.assertEqual(result.copied, [os.path.join(self.index_dir, 'SYS.02.03-README.org')])
+
+    def test_copies_are_unique_and_pruned(self):
+        """Test that copies of same-named READMEs coexist and stale copies go."""
+        other = write_readme(os.path.join(self.base, 'elsewhere'), 'SYS.02.02',
+                             title='Same name')
+        self.records[other] = project_record(*project('SYS.02.02', title='Same name'))
+        names = copy_names(self.records, {'SYS.02.01-README.org'})
+        self.assertEqual(len(set(names.values())), 4)
+        self.assertEqual(names, copy_names(dict(reversed(self.records.items())),
+                                           {'SYS.02.01-README.org'}))
+        self.assertNotEqual(names[self.paths[0]], 'SYS.02.01-README.org')
+        self.assertEqual(names[self.paths[2]], 'SYS.02.03-README.org')
+
+        first = generate_index(self.records, self.index_dir)
+        self.assertEqual(len(first.copied), 4)
+        with open(os.path.join(self.index_dir, names[other])) as f:
+            self.assertIn('Same name', f.read())
+        self.assertEqual(generate_index(self.records, self.index_dir).copied, [])
+
+        # A file the generator did not write is left alone
+        kept = write_readme(self.index_dir, 'NOTES')
+        del self.records[other]
+        del self.records[self.paths[2]]
+        result = generate_index(self.records, self.index_dir)
+        # Without the duplicate, SYS.02.02 gets its plain name back
+        self.assertEqual(sorted(result.removed),
+                         sorted(os.path.join(self.index_dir, name) for name in
+                                (names[other], names[self.paths[1]], 'SYS.02.03-README.org')))
+        self.assertEqual(result.copied, [os.path.join(self.index_dir, 'SYS.02.02-README.org')])
+        self.assertTrue(os.path.exists(kept))
+        self.assertEqual(sorted(os.listdir(self.index_dir)),
+                         ['.meta-wip-generated', 'NOTES-README.org', 'SYS.02.00-README.org',
+                          'SYS.02.01-README.org', 'SYS.02.02-README.org'])
+
+        result = generate_index(self.records, self.index_dir, copies=False)
+        self.assertEqual(len(result.removed), 2)
+        self.assertTrue(os.path.exists(kept))
+
+    def test_write_and_copy_if_changed(self):
+        """Test that identical bytes are never rewritten."""
+        path = os.path.join(self.base, 'out.org')
+        self.assertTrue(write_if_changed(path, b'one'))
+        self.assertFalse(write_if_changed(path, b'one'))
+        self.assertTrue(write_if_changed(path, b'two'))
+        dest = os.path.join(self.base, 'copy.org')
+        self.assertTrue(copy_if_changed(path, dest))
+        self.assertFalse(copy_if_changed(path, dest))
+        with open(dest, 'wb') as f:
+            f.write(b'owt')
+        self.assertTrue(copy_if_changed(path, dest))
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), b'two')
+        self.assertEqual([n for n in os.listdir(self.base) if '.tmp' in n], [])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_index_cli(self, mock_stdout):
+        """Test the index subcommand, which only parses changed READMEs."""
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': self.cache_dir}):
+            for append in ('', '', '#+STATUS: stuck\n'):
+                with open(self.paths[1], 'a') as f:
+                    f.write(append)
+                sys.argv = ['main.py', 'index', '--index-dir', self.index_dir, self.base]
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 0)
+
+        output = mock_stdout.getvalue()
+        self.assertIn('SYS.02.00-README.org: written (5 sections rendered, 0 reused; '
+                      '3 of 3 READMEs parsed)', output)
+        self.assertIn('Copied 3 of 3 project READMEs', output)
+        self.assertIn('SYS.02.00-README.org: unchanged (0 sections rendered, 5 reused; '
+                      '0 of 3 READMEs parsed)', output)
+        self.assertIn('Copied 0 of 3 project READMEs', output)
+        self.assertIn('SYS.02.00-README.org: written (3 sections rendered, 2 reused; '
+                      '1 of 3 READMEs parsed)', output)
+        self.assertIn('Copied 1 of 3 project READMEs', output)
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_index_cli_counts_only_project_readmes(self, mock_stdout, mock_stderr):
+        """Test that index READMEs and READMEs that fail are not counted as parsed."""
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': self.cache_dir}):
+            sys.argv = ['main.py', 'index', '--index-dir', self.index_dir, self.base]
+            with self.assertRaises(SystemExit):
+                main()
+            # Without the marker, the index directory's READMEs are parsed too
+            os.remove(os.path.join(self.index_dir, '.meta-wip-generated'))
+            write_file(os.path.join(self.base, 'broken', 'README.org'), "#+STATUS: active\n")
+            mock_stdout.seek(0)
+            mock_stdout.truncate()
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+
+        self.assertIn('SYS.02.00-README.org: unchanged (5 sections rendered, 0 reused; '
+                      '0 of 3 READMEs parsed)', mock_stdout.getvalue())
+        self.assertIn('README.org', mock_stderr.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_sort_after_index_skips_generated_files(self, mock_stdout):
+        """Test that the index README and copies are not sorted as projects."""
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': self.cache_dir}):
+            sys.argv = ['main.py', 'index', '--index-dir', self.index_dir, self.base]
+            with self.assertRaises(SystemExit):
+                main()
+            self.assertEqual(len(os.listdir(self.index_dir)), 5)
+            mock_stdout.seek(0)
+            mock_stdout.truncate()
+            sys.argv = ['main.py', '--sort', self.base]
+            main()
+
+        output = mock_stdout.getvalue()
+        self.assertNotIn('Meta WIP Capture', output)
+        for project_id in ('SYS.02.01', 'SYS.02.02', 'SYS.02.03'):
+            self.assertEqual(output.count(f'Project {project_id} '), 1)
+
+
+    def test_only_project_scans_skip_index_dir(self):
+        """Test that backups include the index directory that project scans skip."""
+        generate_index(self.records, self.index_dir)
+        index_readme = os.path.join(self.index_dir, 'SYS.02.00-README.org')
+        self.assertEqual(find_readmes([self.base], skip_generated=True), self.paths)
+        self.assertIn(index_readme, find_readmes([self.base]))
+
+        manifest, _ = create_snapshot(self.base, os.path.join(self.base, 'store'))
+        self.assertIn('SYS.02.00/SYS.02.00-README.org', manifest['files'])
+        self.assertIn('SYS.02.00/SYS.02.01-README.org', manifest['files'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from io import StringIO
+from meta_wip_automation.logging_config import (
+    LOGGER_NAME,
+    FailureSummary,
+    JsonLinesFormatter,
+    setup_logging,
+    stop_logging
+)
+
+
+class TestLoggingConfig(unittest.TestCase):
+    """Test suite for the structured logging subsystem."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, 'meta-wip.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_records(self):
+        with open(self.log_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_records_are_json_lines_with_context(self):
+        """Test that queued records keep path, phase and exception details."""
+        listener = setup_logging('DEBUG', self.log_file)
+        try:
+            logger = logging.getLogger(f'{LOGGER_NAME}.tests')
+            logger.debug("Parsed %s", 'a.org', extra={'path': 'a.org', 'phase': 'parse'})
+            try:
+                raise ValueError("bad STATUS")
+            except ValueError:
+                logger.exception("Failed", extra={'path': 'b.org', 'phase': 'score'})
+        finally:
+            stop_logging(listener)
+
+        parsed, failed = self.read_records()
+        self.assertEqual(parsed['message'], 'Parsed a.org')
+        self.assertEqual(parsed['level'], 'DEBUG')
+        self.assertEqual(parsed['path'], 'a.org')
+        self.assertNotIn('exc_type', parsed)
+        self.assertEqual(failed['phase'], 'score')
+        self.assertEqual(failed['exc_type'], 'ValueError')
+        self.assertEqual(failed['exc_message'], 'bad STATUS')
+
+    def test_level_filtering_and_cleanup(self):
+        """Test that records below the level are dropped and handlers removed."""
+        logger = logging.getLogger(LOGGER_NAME)
+        handlers_before = list(logger.handlers)
+        listener = setup_logging('WARNING', self.log_file)
+        try:
+            self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+            logger.info("not recorded")
+            logger.warning("recorded")
+        finally:
+            stop_logging(listener)
+
+        self.assertEqual([r['message'] for r in self.read_records()], ['recorded'])
+        self.assertEqual(logger.handlers, handlers_before)
+
+    def test_formatter_handles_direct_exc_info(self):
+        """Test the formatter when used without the queue handler."""
+        try:
+            raise KeyError('TAGS')
+        except KeyError as e:
+            record = logging.LogRecord('x', logging.ERROR, __file__, 1, "boom", None,
+                                       (type(e), e, e.__traceback__))
+        entry = json.loads(JsonLinesFormatter().format(record))
+        self.assertEqual(entry['exc_type'], 'KeyError')
+
+    def test_failure_summary_report(self):
+        """Test that failures are reported together with their cause."""
+        failures = FailureSummary()
+        stream = StringIO()
+        failures.report(stream)
+        self.assertEqual(stream.getvalue(), '')
+
+        failures.add('a.org', 'read', FileNotFoundError('README file not found: a.org'))
+        failures.add('b.org', 'parse', ValueError('Invalid or missing frontmatter'))
+        failures.report(stream)
+
+        output = stream.getvalue()
+        self.assertEqual(len(failures), 2)
+        self.assertIn('2 file(s) could not be processed', output)
+        self.assertIn('Error processing a.org (read): FileNotFoundError', output)
+        self.assertIn('ValueError: Invalid or missing frontmatter', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation.main import main
+from meta_wip_automation.org_tokenizer import (
+    Heading,
+    Keyword,
+    Property,
+    iter_subtasks,
+    load_subtasks,
+    parse_todo_keywords,
+    tokenize
+)
+from meta_wip_automation.project_sorter import sort_projects
+
+README = """\
+#+title: Home Server
+#+PROJECT_ID: SYS.05.01
+#+STATUS: active
+#+EFFORT: push
+#+URGENCY: later
+#+TODO: TODO WAITING(w) | DONE(d) CANCELLED
+
+* SYS.05.01 Home Server
+:PROPERTIES:
+:INTEREST: engaged
+:END:
+** TODO [#A] Replace the failing disk :hardware:urgent:
+SCHEDULED: <2024-10-25 Fri>
+:PROPERTIES:
+:effort: resist
+:URGENCY: now
+:END:
+The old disk reports reallocated sectors.
+#+begin_src sh
+* not a heading
+#+end_src
+*** WAITING Order a new disk
+** CANCELLED Move to the cloud
+** Notes
+:PROPERTIES:
+:URGENCY: soon
+:END:
+*** TODO Write notes
+:PROPERTIES:
+:RECURRENCE_INTERVAL: 7
+:LAST_COMPLETED: 2024-10-01
+:END:
+*bold* is not a heading, and :PROPERTIES: here is not a drawer
+"""
+
+
+class TestOrgTokenizer(unittest.TestCase):
+    """Test suite for the streaming org tokenizer and subtask extraction."""
+
+    def test_parse_todo_keywords(self):
+        """Test TODO keyword sets with and without a '|' separator."""
+        self.assertEqual(parse_todo_keywords('TODO NEXT(n) | DONE(d!) CANCELLED'),
+                         (('TODO', 'NEXT'), ('DONE', 'CANCELLED')))
+        self.assertEqual(parse_todo_keywords('TODO FEEDBACK DONE'),
+                         (('TODO', 'FEEDBACK'), ('DONE',)))
+
+    def test_tokens(self):
+        """Test headings, keywords and drawers, skipping blocks and body text."""
+        tokens = list(tokenize(StringIO(README)))
+        self.assertEqual(tokens[5], Keyword(6, 'TODO', 'TODO WAITING(w) | DONE(d) CANCELLED'))
+        headings = [t for t in tokens if isinstance(t, Heading)]
+        self.assertEqual([h.title for h in headings],
+                         ['SYS.05.01 Home Server', 'Replace the failing disk',
+                          'Order a new disk', 'Move to the cloud', 'Notes', 'Write notes'])
+        self.assertEqual(headings[1], Heading(12, 2, 'TODO', False, 'A',
+                                              'Replace the failing disk', ['hardware', 'urgent']))
+        self.assertEqual([h.keyword for h in headings],
+                         [None, 'TODO', 'WAITING', 'CANCELLED', None, 'TODO'])
+        self.assertTrue(headings[3].done)
+        self.assertIn(Property(15, 'effort', 'resist'), tokens)
+        self.assertEqual(len([t for t in tokens if isinstance(t, Property)]), 6)
+
+    def test_default_keywords(self):
+        """Test that only TODO and DONE are keywords without a #+TODO: line."""
+        headings = [t for t in tokenize(["* TODO One\n", "* WAITING Two\n", "* DONE Three\n"])]
+        self.assertEqual([h.keyword for h in headings], ['TODO', None, 'DONE'])
+
+    def test_subtask_fields_override_frontmatter(self):
+        """Test property inheritance and keyword-derived status."""
+        subtasks = {s.title: s for s in iter_subtasks(StringIO(README))}
+        self.assertEqual(list(subtasks), ['Replace the failing disk', 'Order a new disk',
+                                          'Move to the cloud', 'Write notes'])
+
+        disk = subtasks['Replace the failing disk'].fields
+        self.assertEqual((disk['EFFORT'], disk['URGENCY'], disk['INTEREST']),
+                         ('resist', 'now', 'engaged'))
+        self.assertEqual((disk['PROJECT_ID'], disk['STATUS']), ('SYS.05.01', 'active'))
+
+        order = subtasks['Order a new disk'].fields
+        self.assertEqual((order['STATUS'], order['EFFORT']), ('waiting', 'resist'))
+        self.assertEqual(subtasks['Move to the cloud'].fields['STATUS'], 'done')
+
+        notes = subtasks['Write notes'].fields
+        self.assertEqual((notes['URGENCY'], notes['EFFORT']), ('soon', 'push'))
+
+    def test_lower_case_keywords(self):
+        """Test that lower-case file keywords score like upper-case ones."""
+        content = ("#+title: Lower\n#+status: stuck\n#+accountability: imminent\n"
+                   "* TODO Call back\n")
+        [subtask] = iter_subtasks(StringIO(content))
+        self.assertEqual((subtask.fields['STATUS'], subtask.fields['ACCOUNTABILITY']),
+                         ('stuck', 'imminent'))
+
+        projects = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'README.org')
+            for text in (content, content.upper()):
+                with open(path, 'w') as f:
+                    f.write(text)
+                [(_, (fields, _, _))] = load_subtasks(path)
+                projects.append((fields['STATUS'], fields['ACCOUNTABILITY']))
+        self.assertEqual(projects, [('stuck', 'imminent')] * 2)
+
+    def test_load_subtasks_for_scoring(self):
+        """Test that subtasks become project tuples the sorter can rank."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'SYS.05.01-README.org')
+            with open(path, 'w') as f:
+                f.write(README)
+            subtasks = load_subtasks(path)
+            self.assertEqual(len(subtasks), 3)
+            self.assertEqual(len(load_subtasks(path, include_done=True)), 4)
+
+            projects = [project for _, project in subtasks]
+            self.assertEqual(projects[2][2], 7)
+            self.assertEqual(projects[2][1].day, 1)
+            # Overdue recurrence lifts the notes above the disk replacement
+            ranked = [project[0]['title'] for project in sort_projects(projects)]
+            self.assertEqual(ranked, ['Order a new disk', 'Write notes',
+                                      'Replace the failing disk'])
+
+            with open(path, 'a') as f:
+                f.write("* TODO Broken\n:PROPERTIES:\n:RECURRENCE_INTERVAL: weekly\n"
+                        ":LAST_COMPLETED: 2024-10-01\n:END:\n")
+            with self.assertRaisesRegex(ValueError, 'line 34'):
+                load_subtasks(path)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_subtasks_cli(self, mock_stdout):
+        """Test the subtasks subcommand."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'SYS.05.01-README.org')
+            with open(path, 'w') as f:
+                f.write(README)
+            sys.argv = ['main.py', 'subtasks', tmpdir, '--top', '2']
+            with self.assertRaises(SystemExit) as cm:
+                main()
+
+        self.assertEqual(cm.exception.code, 0)
+        output = mock_stdout.getvalue()
+        self.assertIn('Subtasks in priority order:', output)
+        self.assertIn('1. WAITING Order a new disk (SYS.05.01)', output)
+        self.assertIn('2. TODO Write notes (SYS.05.01)', output)
+        self.assertIn(f'{path}:28', output)
+        self.assertNotIn('3. ', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -208,6 +208,10 @@ class TestProjectSorter(unittest.TestCase):
         assert sorted_projects[0] == project1 # Higher priority should be first
         assert sorted_projects[1] == project2
 
+    def test_sort_projects_with_known_scores(self):
+        """Test sorting by given scores, keeping the input order of ties."""
+        assert sort_projects(['a', 'b', 'c', 'd'], [1, 3, 1, 3]) == ['b', 'd', 'a', 'c']
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation import sharding
+from meta_wip_automation.main import main
+from meta_wip_automation.rank_diff import (
+    ENTERED,
+    LEFT,
+    MOVED,
+    SCORE,
+    build_ranking,
+    describe_cause,
+    diff_rankings,
+    load_ranking,
+    save_ranking
+)
+from meta_wip_automation.sharding import project_record
+from tests.helpers import project
+
+
+def records(projects, paths):
+    return {path: project_record(*p) for p, path in zip(projects, paths)}
+
+
+class TestRankDiff(unittest.TestCase):
+    """Test suite for diffing rankings between runs."""
+
+    def setUp(self):
+        self.projects = [
+            project('A', STATUS='stuck', ACCOUNTABILITY='imminent'),
+            project('B', STATUS='waiting', ACCOUNTABILITY='looming'),
+            project('C', STATUS='active', URGENCY='now'),
+            project('D', STATUS='active'),
+            project('E', STATUS='active', URGENCY='ignore')
+        ]
+        self.paths = [f'{p[0]["PROJECT_ID"]}-README.org' for p in self.projects]
+
+    def test_unchanged_ranking_has_no_changes(self):
+        """Test that identical rankings produce an empty diff."""
+        ranking = build_ranking(records(self.projects, self.paths))
+        self.assertEqual(ranking.ids, ['A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(diff_rankings(ranking, ranking, top=2, moved=1), [])
+
+    def test_changes_are_classified_and_attributed(self):
+        """Test entered/left/moved/score detection and factor attribution."""
+        old = build_ranking(records(self.projects, self.paths))
+        self.projects[4] = project('E', STATUS='stuck', ACCOUNTABILITY='imminent',
+                                   URGENCY='now')
+        new = build_ranking(records(self.projects, self.paths))
+        self.assertEqual(new.ids, ['E', 'A', 'B', 'C', 'D'])
+
+        changes = {c.project_id: c for c in diff_rankings(old, new, top=2, moved=2)}
+        self.assertEqual(sorted(changes), ['B', 'E'])
+        self.assertEqual(changes['E'].kinds, [ENTERED, MOVED, SCORE])
+        self.assertEqual((changes['E'].old_rank, changes['E'].new_rank), (5, 1))
+        self.assertEqual(changes['B'].kinds, [LEFT])
+
+        causes = [describe_cause(*cause) for cause in changes['E'].causes]
+        self.assertEqual(causes, [
+            'ACCOUNTABILITY off-radar -> imminent (+15)',
+            'STATUS active -> stuck (+8)',
+            'URGENCY ignore -> now (+3)',
+            'STUCK_ACCOUNTABLE boost on (+5)'
+        ])
+
+    def test_new_and_removed_projects(self):
+        """Test projects that appear in or disappear from the ranking."""
+        old = build_ranking(records(self.projects, self.paths))
+        new = build_ranking(records(self.projects[1:] + [project('F', STATUS='stuck',
+                                                                 ACCOUNTABILITY='imminent')],
+                                    self.paths[1:] + ['F-README.org']))
+        changes = {c.project_id: c for c in diff_rankings(old, new, top=2, moved=5)}
+        self.assertEqual(changes['F'].old_rank, None)
+        self.assertEqual(changes['F'].kinds, [ENTERED])
+        self.assertEqual(changes['A'].new_rank, None)
+        self.assertEqual(changes['A'].kinds, [LEFT])
+
+    def test_duplicate_project_ids_are_joined_by_path(self):
+        """Test that READMEs sharing a PROJECT_ID are diffed separately."""
+        projects = [project('A', STATUS='stuck', ACCOUNTABILITY='imminent'),
+                    project('A', STATUS='active')]
+        paths = ['one/A-README.org', 'two/A-README.org']
+        old = build_ranking(records(projects, paths))
+        self.assertEqual(old.paths, paths)
+
+        projects[1] = project('A', STATUS='stuck', ACCOUNTABILITY='imminent',
+                              URGENCY='now')
+        new = build_ranking(records(projects, paths))
+        self.assertEqual(new.paths, ['two/A-README.org', 'one/A-README.org'])
+
+        changes = {c.path: c for c in diff_rankings(old, new, top=1, moved=5)}
+        self.assertEqual(sorted(changes), paths)
+        self.assertEqual(changes['two/A-README.org'].kinds, [ENTERED, SCORE])
+        self.assertEqual((changes['two/A-README.org'].old_rank,
+                          changes['two/A-README.org'].new_rank), (2, 1))
+        self.assertEqual(changes['one/A-README.org'].kinds, [LEFT])
+        self.assertEqual(changes['one/A-README.org'].old_score,
+                         changes['one/A-README.org'].new_score)
+
+    def test_save_and_load_round_trip(self):
+        """Test that a saved ranking loads back unchanged."""
+        ranking = build_ranking(records(self.projects, self.paths))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'rankings', 'last.json')
+            self.assertIsNone(load_ranking(path))
+            save_ranking(path, ranking)
+            self.assertEqual(load_ranking(path), ranking)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_sort_diff_cli(self, mock_stdout):
+        """Test that --sort --diff reports changes, re-reading only changed READMEs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            readme = os.path.join(tmpdir, 'TST.00.01-README.org')
+            with open(readme, 'w') as f:
+                f.write("#+title: Project One\n#+PROJECT_ID: TST.00.01\n#+STATUS: active\n")
+            with open(os.path.join(tmpdir, 'TST.00.02-README.org'), 'w') as f:
+                f.write("#+title: Project Two\n#+PROJECT_ID: TST.00.02\n#+STATUS: done\n")
+            with patch.dict(os.environ, {'META_WIP_CACHE_DIR': os.path.join(tmpdir, 'cache')}):
+                sys.argv = ['main.py', '--sort', tmpdir, '--diff']
+                main()
+                self.assertIn('No previous ranking', mock_stdout.getvalue())
+
+                with open(readme, 'a') as f:
+                    f.write("#+URGENCY: now\n")
+                mock_stdout.seek(0)
+                mock_stdout.truncate()
+                with patch.object(sharding, 'load_project',
+                                  wraps=sharding.load_project) as loader:
+                    main()
+                self.assertEqual([c.args[0] for c in loader.call_args_list], [readme])
+
+        output = mock_stdout.getvalue()
+        self.assertIn('Project One (TST.00.01): #1 -> #1, score 15 -> 17', output)
+        self.assertIn('URGENCY later -> now (+2)', output)
+        self.assertNotIn('Projects in priority order', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from meta_wip_automation import project_sorter
+from meta_wip_automation.project_sorter import get_recurrence_score
+from meta_wip_automation.recurrence_forecast import (
+    DUE,
+    DUE_SOON,
+    build_forecast,
+    cycle_offsets
+)
+
+START = date(2024, 3, 4)  # A Monday
+
+
+def recurring(project_id, last_completed, interval, status='active'):
+    return ({'title': f'Project {project_id}', 'PROJECT_ID': project_id, 'STATUS': status},
+            datetime.combine(last_completed, datetime.min.time()), interval)
+
+
+def score_on(day, last_completed, interval):
+    """get_recurrence_score as it would be computed at noon on day."""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.combine(day, datetime.min.time()) + timedelta(hours=12)
+    with patch.object(project_sorter, 'datetime', FrozenDatetime):
+        return get_recurrence_score(last_completed, interval)
+
+
+class TestRecurrenceForecast(unittest.TestCase):
+    """Test suite for the recurrence forecast index."""
+
+    def setUp(self):
+        self.projects = [
+            recurring('WVN.41.10', START - timedelta(days=20), 30),  # due-soon in 3 days
+            recurring('SYS.03.01', START - timedelta(days=3), 7),    # due-soon in 3 days
+            recurring('SYS.03.02', START - timedelta(days=40), 30),  # already overdue
+            recurring('SYS.03.03', START - timedelta(days=1), 7, status='done'),
+            ({'title': 'One-off', 'PROJECT_ID': 'WVN.62.08'}, None, None)
+        ]
+
+    def test_events_match_recurrence_score_transitions(self):
+        """Test that each forecast event is the day the recurrence score changes."""
+        for interval in (1, 2, 7, 10, 30):
+            last = START - timedelta(days=2)
+            forecast = build_forecast([recurring('X', last, interval)], START, 40)
+            expected = {2: DUE_SOON, 3: DUE}
+            completed = datetime.combine(last, datetime.min.time())
+            for event in forecast.between(START, START + timedelta(days=39)):
+                if event.projected:
+                    continue
+                before = score_on(event.date - timedelta(days=1), completed, interval)
+                after = score_on(event.date, completed, interval)
+                self.assertLess(before, after)
+                self.assertEqual(expected[after], event.kind)
+
+    def test_week_query(self):
+        """Test listing everything that crosses a threshold this week."""
+        forecast = build_forecast(self.projects, START, 7)
+        events = forecast.between(START, START + timedelta(days=6))
+        self.assertEqual(
+            [(e.date - START).days for e in events], [3, 3, 4])
+        self.assertEqual([(e.kind, e.project_id) for e in events],
+                         [(DUE_SOON, 'SYS.03.01'), (DUE_SOON, 'WVN.41.10'),
+                          (DUE, 'SYS.03.01')])
+        self.assertEqual([p.project_id for p in forecast.overdue], ['SYS.03.02'])
+
+    def test_single_day_query_by_kind(self):
+        """Test the 'what becomes due soon on Thursday' style of query."""
+        forecast = build_forecast(self.projects, START, 7)
+        thursday = START + timedelta(days=3)
+        self.assertEqual([e.project_id for e in forecast.on(thursday, DUE_SOON)],
+                         ['SYS.03.01', 'WVN.41.10'])
+        self.assertEqual(forecast.on(thursday, DUE), [])
+
+    def test_later_cycles_are_projected(self):
+        """Test that cycles after the next one are marked as projected."""
+        forecast = build_forecast(self.projects, START, 21)
+        weekly = [e for e in forecast.between(START, forecast.end)
+                  if e.project_id == 'SYS.03.01' and e.kind == DUE]
+        self.assertEqual([(e.date - START).days for e in weekly], [4, 11, 18])
+        self.assertEqual([e.projected for e in weekly], [False, True, True])
+
+    def test_cycle_offsets(self):
+        """Test threshold offsets, including intervals too short for due-soon."""
+        self.assertEqual(cycle_offsets(30), [(23, DUE_SOON), (30, DUE)])
+        self.assertEqual(cycle_offsets(1), [(1, DUE)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation.main import main
+from meta_wip_automation.search_index import SearchIndex, trigrams
+from tests.helpers import write_readme
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test suite for the trigram search index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        write_readme(self.dir, 'SYS.02.02', 'Automate Meta WIP Category',
+                     STATUS='active', TAGS='python cli')
+        write_readme(self.dir, 'SYS.03.01', 'Weekly System Backup',
+                     STATUS='stuck', ACCOUNTABILITY='imminent')
+        write_readme(self.dir, 'WVN.62.08', 'Analytics Dashboard',
+                     STATUS='active', TAGS='backup metrics')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_trigrams_are_padded(self):
+        """Test that word starts and ends produce their own trigrams."""
+        self.assertEqual(trigrams('WIP'), {'  w', ' wi', 'wip', 'ip '})
+        self.assertEqual(trigrams('--'), set())
+
+    def test_fuzzy_search(self):
+        """Test that a misspelt query still finds the right project first."""
+        index = SearchIndex()
+        updated, removed, failures = index.update([self.dir])
+        self.assertEqual((updated, removed, failures), (3, 0, []))
+
+        hits = index.search('autmate wip')
+        self.assertEqual(hits[0].project_id, 'SYS.02.02')
+        self.assertEqual(hits[0].title, 'Automate Meta WIP Category')
+        self.assertEqual(index.search('sys.03')[0].project_id, 'SYS.03.01')
+        self.assertEqual(index.search('zzzz'), [])
+
+    def test_by_priority(self):
+        """Test that matches can be ordered by priority instead of similarity."""
+        index = SearchIndex()
+        index.update([self.dir])
+        by_similarity = [hit.project_id for hit in index.search('backup')]
+        by_priority = [hit.project_id for hit in index.search('backup', by_priority=True)]
+        self.assertEqual(sorted(by_similarity), ['SYS.03.01', 'WVN.62.08'])
+        self.assertEqual(by_priority, ['SYS.03.01', 'WVN.62.08'])
+        hits = index.search('backup', by_priority=True)
+        self.assertGreater(hits[0].priority, hits[1].priority)
+
+    def test_incremental_update(self):
+        """Test that only changed READMEs are re-read and removed ones dropped."""
+        index = SearchIndex()
+        index.update([self.dir])
+        self.assertEqual(index.update([self.dir]), (0, 0, []))
+
+        path = write_readme(self.dir, 'WVN.62.08', 'Sales Dashboard')
+        os.utime(path, ns=(1, 1))
+        os.remove(os.path.join(self.dir, 'SYS.03.01-README.org'))
+        self.assertEqual(index.update([self.dir]), (1, 1, []))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search('analytics'), [])
+        self.assertEqual(index.search('sales')[0].project_id, 'WVN.62.08')
+        self.assertNotIn(' we', index.postings)
+
+        # Numbers of removed documents are reused
+        write_readme(self.dir, 'HOM.01.01', 'Garden Plan')
+        index.update([self.dir])
+        self.assertEqual(len(index.paths), 3)
+
+    def test_save_and_load(self):
+        """Test that a saved index loads back with the same results."""
+        index = SearchIndex()
+        index.update([self.dir])
+        path = os.path.join(self.dir, 'cache', 'index.json')
+        index.save(path)
+
+        loaded = SearchIndex.load(path)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.search('dashbord'), index.search('dashbord'))
+        self.assertEqual(loaded.update([self.dir]), (0, 0, []))
+        self.assertEqual(len(SearchIndex.load(os.path.join(self.dir, 'missing.json'))), 0)
+
+    def test_saved_postings_are_read_when_needed(self):
+        """
+        Test that a loaded index reads postings lazily and saves them intact.
+
+        This test verifies that:
+            1. Loading reads no postings, and a search only those it needs.
+            2. Saving after an update keeps the postings that were never read.
+        """
+        index = SearchIndex()
+        index.update([self.dir])
+        path = os.path.join(self.dir, 'cache', 'index.json')
+        index.save(path)
+
+        loaded = SearchIndex.load(path)
+        self.assertEqual(loaded.postings, {})
+        self.assertEqual(loaded.search('backup'), index.search('backup'))
+        self.assertEqual(loaded.postings, {})
+
+        write_readme(self.dir, 'HOM.01.01', 'Garden Plan')
+        self.assertEqual(loaded.update([self.dir]), (1, 0, []))
+        self.assertEqual(set(loaded.postings), trigrams('Garden Plan HOM.01.01'))
+        loaded.save(path)
+        loaded.save(path)
+
+        reloaded = SearchIndex.load(path)
+        self.assertEqual(reloaded.search('dashbord'), index.search('dashbord'))
+        self.assertEqual(reloaded.search('garden')[0].project_id, 'HOM.01.01')
+        self.assertEqual(reloaded.update([self.dir]), (0, 0, []))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_cli(self, mock_stdout):
+        """Test the find subcommand."""
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': os.path.join(self.dir, 'cache')}):
+            sys.argv = ['main.py', 'find', 'autmate wip', self.dir]
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+            self.assertTrue(os.path.isdir(os.path.join(self.dir, 'cache', 'search')))
+
+            sys.argv = ['main.py', 'find', 'zzzz', self.dir]
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 1)
+
+            # --no-refresh searches the saved index as it is
+            write_readme(self.dir, 'HOM.01.01', 'Garden Plan')
+            sys.argv = ['main.py', 'find', 'garden', self.dir, '--no-refresh']
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 1)
+            sys.argv = ['main.py', 'find', 'garden', self.dir]
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+
+        output = mock_stdout.getvalue()
+        self.assertIn('1. Automate Meta WIP Category (SYS.02.02)', output)
+        self.assertIn("No projects match 'zzzz'", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
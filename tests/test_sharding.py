@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation import sharding
+from meta_wip_automation.main import main
+from meta_wip_automation.sharding import (
+    RankedEntry,
+    load_roots,
+    merge_rankings,
+    parse_root_spec,
+    rank_shards
+)
+from tests.helpers import write_readme
+
+
+class TestSharding(unittest.TestCase):
+    """Test suite for ranking across multiple roots."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        base = self.tmpdir.name
+        self.cache_dir = os.path.join(base, 'cache')
+        self.roots = {
+            'SYS.02': os.path.join(base, 'SYS.02'),
+            'WRK.01': os.path.join(base, 'WRK.01')
+        }
+        write_readme(self.roots['SYS.02'], 'SYS.02.01', STATUS='stuck', ACCOUNTABILITY='imminent')
+        write_readme(self.roots['SYS.02'], 'SYS.02.02', ACCOUNTABILITY='distant')
+        write_readme(self.roots['WRK.01'], 'WRK.01.01', STATUS='waiting', ACCOUNTABILITY='looming')
+        write_readme(self.roots['WRK.01'], 'WRK.01.02', STATUS='done', ACCOUNTABILITY='distant')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_global_ranking_merges_shards(self):
+        """Test that the merged ranking interleaves shards by score."""
+        results = rank_shards(self.roots, self.cache_dir, workers=1)
+        top = merge_rankings([r.entries for r in results.values()], top=3)
+        self.assertEqual([e.project_id for e in top], ['SYS.02.01', 'WRK.01.01', 'SYS.02.02'])
+        self.assertEqual([e.shard for e in top], ['SYS.02', 'WRK.01', 'SYS.02'])
+        self.assertEqual(top, sorted(top, key=lambda e: e.score, reverse=True))
+
+    def test_parallel_ranking_matches_serial(self):
+        """Test that ranking shards in worker processes gives the same result."""
+        serial = rank_shards(self.roots, os.path.join(self.cache_dir, 'serial'), workers=1)
+        parallel = rank_shards(self.roots, os.path.join(self.cache_dir, 'parallel'), workers=2)
+        for name in self.roots:
+            self.assertEqual(serial[name].entries, parallel[name].entries)
+
+    def test_unchanged_shard_reuses_cached_ranking(self):
+        """Test that only the shard whose files changed is re-scored."""
+        first = rank_shards(self.roots, self.cache_dir, workers=1)
+        self.assertFalse(any(r.reused for r in first.values()))
+
+        write_readme(self.roots['WRK.01'], 'WRK.01.03', URGENCY='now', ACCOUNTABILITY='distant')
+        second = rank_shards(self.roots, self.cache_dir, workers=1)
+        self.assertTrue(second['SYS.02'].reused)
+        self.assertFalse(second['WRK.01'].reused)
+        self.assertEqual(second['SYS.02'].parsed, [])
+        self.assertEqual([os.path.basename(p) for p in second['WRK.01'].parsed],
+                         ['WRK.01.03-README.org'])
+        self.assertEqual(second['SYS.02'].entries, first['SYS.02'].entries)
+        self.assertEqual(len(second['WRK.01'].entries), 3)
+
+    def test_only_changed_readmes_are_reparsed(self):
+        """Test that edits and deletions within a shard update its ranking."""
+        rank_shards(self.roots, self.cache_dir, workers=1)
+        write_readme(self.roots['SYS.02'], 'SYS.02.02', URGENCY='now',
+                     ACCOUNTABILITY='imminent', STATUS='stuck')
+        os.remove(os.path.join(self.roots['WRK.01'], 'WRK.01.01-README.org'))
+        with patch.object(sharding, 'load_project', wraps=sharding.load_project) as loader:
+            results = rank_shards(self.roots, self.cache_dir, workers=1)
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual([e.project_id for e in results['SYS.02'].entries],
+                         ['SYS.02.02', 'SYS.02.01'])
+        self.assertEqual([e.project_id for e in results['WRK.01'].entries], ['WRK.01.02'])
+
+    def test_shard_with_failures_is_not_cached(self):
+        """Test that broken files are reported on every run."""
+        with open(os.path.join(self.roots['SYS.02'], 'SYS.02.03-README.org'), 'w') as f:
+            f.write("no frontmatter here")
+        for _ in range(2):
+            results = rank_shards(self.roots, self.cache_dir, workers=1)
+            self.assertFalse(results['SYS.02'].reused)
+            [(path, phase, error)] = results['SYS.02'].failures
+            self.assertTrue(path.endswith('SYS.02.03-README.org'))
+            self.assertEqual(phase, 'parse')
+
+    def test_merge_rankings_is_lazy_k_way_merge(self):
+        """Test merging sorted lists, including an empty shard."""
+        a = [RankedEntry(9, 'A1', '', '', 'A'), RankedEntry(3, 'A2', '', '', 'A')]
+        b = [RankedEntry(7, 'B1', '', '', 'B'), RankedEntry(5, 'B2', '', '', 'B')]
+        self.assertEqual([e.project_id for e in merge_rankings([a, [], b])],
+                         ['A1', 'B1', 'B2', 'A2'])
+        self.assertEqual(len(merge_rankings([a, b], top=2)), 2)
+
+    def test_root_specs_and_config(self):
+        """Test the NAME=DIR syntax and the [roots] config table."""
+        self.assertEqual(parse_root_spec('HOME=/data/home'), ('HOME', '/data/home'))
+        self.assertEqual(parse_root_spec('/data/WRK.01/'), ('WRK.01', '/data/WRK.01/'))
+
+        config = os.path.join(self.tmpdir.name, 'roots.toml')
+        with open(config, 'w') as f:
+            f.write('[roots]\n"SYS.02" = "/data/SYS.02"\n')
+        self.assertEqual(load_roots(config), {'SYS.02': '/data/SYS.02'})
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_rank_rejects_bad_arguments(self, mock_stderr):
+        """Test that a negative --top and clashing root names are errors."""
+        with self.assertRaises(SystemExit) as cm:
+            sys.argv = ['main.py', 'rank', '--top', '-1', self.roots['SYS.02']]
+            main()
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn("must be at least 1", mock_stderr.getvalue())
+
+        other = os.path.join(self.tmpdir.name, 'other', 'SYS.02')
+        write_readme(other, 'SYS.02.09')
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': self.cache_dir}):
+            with self.assertRaises(SystemExit) as cm:
+                sys.argv = ['main.py', 'rank', self.roots['SYS.02'], other]
+                main()
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("shard name 'SYS.02' is used for both", mock_stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
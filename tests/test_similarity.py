@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from meta_wip_automation.main import main
+from meta_wip_automation.similarity import SimilarityIndex, context_batches, readme_terms
+from tests.helpers import write_readme
+
+PROJECTS = {
+    'SYS.01.01': ('Backup Rotation', 'backup, storage',
+                  'Rotate the backup drives and check restic snapshots for the home server.'),
+    'SYS.01.02': ('Offsite Backups', 'backup, storage',
+                  'Upload restic snapshots to offsite storage and test restoring them.'),
+    'WVN.10.01': ('Sales Dashboard', 'analytics',
+                  'Build the sales dashboard with charts of weekly revenue metrics.'),
+    'WVN.10.02': ('Metrics Pipeline', 'analytics',
+                  'Collect revenue metrics nightly and feed the dashboard charts.'),
+    'HOM.05.01': ('Garden Plan', 'garden',
+                  'Plant tomatoes and herbs along the fence before spring.')
+}
+
+
+class TestSimilarity(unittest.TestCase):
+    """Test suite for the project similarity index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.paths = {project_id: write_readme(self.dir, project_id, title,
+                                               f"\n* {title}\n{body}\n", TAGS=tags)
+                      for project_id, (title, tags, body) in PROJECTS.items()}
+        self.index = SimilarityIndex()
+        self.assertEqual(self.index.update([self.dir]), (5, 0, []))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_readme_terms(self):
+        """Test that keyword lines and stopwords are skipped and tags kept whole."""
+        terms = readme_terms("#+title: Ignored Words\n* Heading\nThe backup and the backup\n",
+                             tags='Home Lab, backup')
+        self.assertEqual(terms, {'tag:home_lab': 3, 'tag:backup': 3, 'backup': 2, 'heading': 1})
+        self.assertEqual(len(readme_terms(' '.join(f'word{i}' for i in range(500)),
+                                          max_terms=10)), 10)
+
+    def test_neighbours(self):
+        """Test that the nearest neighbours share an area."""
+        neighbours = self.index.neighbours(self.paths['SYS.01.01'], k=3)
+        self.assertEqual(neighbours[0].project_id, 'SYS.01.02')
+        self.assertIn('tag:backup', neighbours[0].shared)
+        self.assertNotIn('HOM.05.01', [n.project_id for n in neighbours])
+        self.assertEqual(self.index.neighbours(self.paths['HOM.05.01']), [])
+        self.assertEqual(self.index.find('wvn.10.01'), self.paths['WVN.10.01'])
+        self.assertIsNone(self.index.find('NOPE'))
+
+    def test_clusters_and_batches(self):
+        """Test threshold clustering and batching of related projects."""
+        clusters = self.index.clusters(threshold=0.2)
+        self.assertEqual(clusters, [sorted([self.paths['SYS.01.01'], self.paths['SYS.01.02']]),
+                                    sorted([self.paths['WVN.10.01'], self.paths['WVN.10.02']])])
+        self.assertIn('tag:analytics', self.index.common_terms(clusters[1]))
+        self.assertEqual(self.index.clusters(threshold=1.1), [])
+
+        order = [self.paths[p] for p in ('WVN.10.01', 'HOM.05.01', 'SYS.01.02',
+                                         'SYS.01.01', 'WVN.10.02')]
+        batches = context_batches(self.index, order, batch_size=2)
+        self.assertEqual(batches, [[order[0], order[4]], [order[2], order[3]], [order[1]]])
+
+    def test_incremental_update(self):
+        """Test that edits and deletions are picked up and the index saved."""
+        write_readme(self.dir, 'HOM.05.01', 'Garden Backup',
+                     "\n* Garden Backup\nMove garden photos to backup storage with restic snapshots.\n",
+                     TAGS='backup, storage')
+        os.remove(self.paths['SYS.01.01'])
+        self.assertEqual(self.index.update([self.dir]), (1, 1, []))
+        self.assertEqual(self.index.neighbours(self.paths['HOM.05.01'], k=1)[0].project_id,
+                         'SYS.01.02')
+
+        path = os.path.join(self.dir, 'cache', 'similarity.json')
+        self.index.save(path)
+        loaded = SimilarityIndex.load(path)
+        self.assertEqual(loaded.update([self.dir]), (0, 0, []))
+        self.assertEqual(loaded.neighbours(self.paths['SYS.01.02']),
+                         self.index.neighbours(self.paths['SYS.01.02']))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_similar_and_clusters_cli(self, mock_stdout):
+        """Test the similar and clusters subcommands."""
+        with patch.dict(os.environ, {'META_WIP_CACHE_DIR': os.path.join(self.dir, 'cache')}):
+            sys.argv = ['main.py', 'similar', 'SYS.01.01', self.dir, '--limit', '1']
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+            sys.argv = ['main.py', 'clusters', self.dir, '--threshold', '0.2']
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+
+        output = mock_stdout.getvalue()
+        self.assertIn('Projects similar to Backup Rotation (SYS.01.01):', output)
+        self.assertIn('1. Offsite Backups (SYS.01.02)  similarity', output)
+        self.assertNotIn('2. ', output.split('Cluster 1')[0])
+        self.assertIn('Cluster 2 (2 projects): tag:analytics', output)
+        self.assertIn('   Sales Dashboard (WVN.10.01)', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
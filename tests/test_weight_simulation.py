@@ -0,0 +1,158 @@
+import itertools
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from meta_wip_automation.project_sorter import (
+    calculate_priority,
+    ACCOUNTABILITY_SCORES,
+    STATUS_SCORES,
+    TIME_DISTORTION_SCORES,
+    EFFORT_SCORES,
+    INTEREST_SCORES,
+    URGENCY_SCORES
+)
+from meta_wip_automation.weight_simulation import (
+    build_profile,
+    encode_project,
+    kendall_tau,
+    load_profiles,
+    score_matrix,
+    simulate,
+    spearman_correlation
+)
+
+
+def naive_kendall_tau(x, y):
+    """Reference O(n^2) tau-b used to check the fast implementation."""
+    concordant = discordant = x_ties = y_ties = 0
+    for i, j in itertools.combinations(range(len(x)), 2):
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        if dx == 0 and dy == 0:
+            continue
+        if dx == 0:
+            x_ties += 1
+        elif dy == 0:
+            y_ties += 1
+        elif (dx > 0) == (dy > 0):
+            concordant += 1
+        else:
+            discordant += 1
+    return (concordant - discordant) / (
+        ((concordant + discordant + x_ties) * (concordant + discordant + y_ties)) ** 0.5)
+
+
+class TestWeightSimulation(unittest.TestCase):
+    """Test suite for the weight what-if simulation."""
+
+    def setUp(self):
+        fields = (
+            ('ACCOUNTABILITY', ACCOUNTABILITY_SCORES),
+            ('STATUS', STATUS_SCORES),
+            ('TIME_DISTORTION', TIME_DISTORTION_SCORES),
+            ('EFFORT', EFFORT_SCORES),
+            ('INTEREST', INTEREST_SCORES),
+            ('URGENCY', URGENCY_SCORES)
+        )
+        rng = random.Random(26)
+        now = datetime.now()
+        self.projects = []
+        for i in range(200):
+            frontmatter = {key: rng.choice(list(scores)) for key, scores in fields}
+            frontmatter['title'] = f'Project {i}'
+            if i % 5 == 0:
+                self.projects.append((frontmatter, now - timedelta(days=rng.randint(0, 40)), 30))
+            else:
+                self.projects.append((frontmatter, None, None))
+
+    def test_default_profile_matches_calculate_priority(self):
+        """Test that the default profile reproduces calculate_priority exactly."""
+        rows = [encode_project(*project) for project in self.projects]
+        [scores] = score_matrix(rows, [build_profile()])
+        expected = [calculate_priority(*project) for project in self.projects]
+        self.assertEqual(scores, expected)
+
+    def test_profile_overrides(self):
+        """Test that profile entries override only the named weights."""
+        project = ({'ACCOUNTABILITY': 'imminent', 'STATUS': 'stuck'}, None, None)
+        row = encode_project(*project)
+        baseline = calculate_priority(*project)
+        [[no_boost]] = score_matrix([row], [build_profile(boosts={'stuck_accountable': 0})])
+        [[heavier]] = score_matrix([row], [build_profile(weights={'ACCOUNTABILITY': 6})])
+        self.assertEqual(no_boost, baseline - 5)
+        self.assertEqual(heavier, baseline + 3)
+
+        with self.assertRaises(ValueError):
+            build_profile(weights={'MOOD': 1})
+
+    def test_kendall_tau_matches_reference(self):
+        """Test the O(n log n) tau-b against a direct pairwise count."""
+        rng = random.Random(7)
+        for _ in range(20):
+            x = [rng.randint(0, 5) for _ in range(60)]
+            y = [rng.randint(0, 5) for _ in range(60)]
+            self.assertAlmostEqual(kendall_tau(x, y), naive_kendall_tau(x, y))
+
+    def test_correlations_of_identical_and_reversed_rankings(self):
+        """Test correlation bounds for identical and reversed orderings."""
+        scores = [1, 2, 3, 4, 5]
+        self.assertAlmostEqual(spearman_correlation(scores, scores), 1.0)
+        self.assertAlmostEqual(kendall_tau(scores, scores), 1.0)
+        self.assertAlmostEqual(spearman_correlation(scores, scores[::-1]), -1.0)
+        self.assertAlmostEqual(kendall_tau(scores, scores[::-1]), -1.0)
+
+    def test_simulate_reports_movers(self):
+        """Test that a reweighted profile reports rank changes and correlations."""
+        profiles = {
+            'default': build_profile(),
+            'urgency-only': build_profile(
+                weights={'ACCOUNTABILITY': 0, 'STATUS': 0, 'TIME_DISTORTION': 0,
+                         'EFFORT': 0, 'INTEREST': 0, 'RECURRENCE': 0},
+                boosts={'STUCK_ACCOUNTABLE': 0, 'QUICK_WIN': 0, 'AVOIDED_ACCOUNTABLE': 0})
+        }
+        default, urgency = simulate(self.projects, profiles, movers=3)
+
+        self.assertAlmostEqual(default.spearman, 1.0)
+        self.assertAlmostEqual(default.kendall, 1.0)
+        self.assertEqual(default.movers, [])
+
+        self.assertLess(urgency.spearman, 1.0)
+        self.assertEqual(len(urgency.movers), 3)
+        moves = [abs(old - new) for _, old, new in urgency.movers]
+        self.assertEqual(moves, sorted(moves, reverse=True))
+
+    def test_load_profiles(self):
+        """Test loading profiles from TOML in file order."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
+            f.write('[baseline]\n\n'
+                    '[heavy]\nweights = { URGENCY = 4 }\n')
+        try:
+            profiles = load_profiles(f.name)
+            self.assertEqual(list(profiles), ['baseline', 'heavy'])
+            self.assertEqual(profiles['baseline'], build_profile())
+            self.assertEqual(profiles['heavy'], build_profile(weights={'URGENCY': 4}))
+        finally:
+            os.unlink(f.name)
+
+    def test_load_profiles_rejects_bad_values(self):
+        """Test that malformed profiles raise ValueError naming the profile."""
+        cases = {
+            'weights = { URGENCY = "x" }': "Weight 'URGENCY' must be a number",
+            'weights = 3': "Weights must be a table",
+            'boosts = { QUICK_WIN = true }': "Boost 'QUICK_WIN' must be a number",
+            'weight = { URGENCY = 4 }': "unknown key 'weight'",
+        }
+        for body, message in cases.items():
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
+                f.write(f'[broken]\n{body}\n')
+            try:
+                with self.assertRaisesRegex(ValueError, f"Profile 'broken': {message}"):
+                    load_profiles(f.name)
+            finally:
+                os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()